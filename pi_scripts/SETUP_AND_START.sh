@@ -199,8 +199,7 @@ EOFINSTALL
         echo "📋 Attach to logs:"
         echo "   screen -r sensors"
         echo "   screen -r mavproxy"
-        echo "   screen -r cam0"
-        echo "   screen -r cam1"
+        echo "   screen -r cameras"
         echo ""
         echo "💡 Detach: Press Ctrl+A then D"
         echo "🛑 Stop all: ./stop_all_services.sh"
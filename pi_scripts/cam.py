@@ -1,28 +1,13 @@
-from flask import Flask, Response
-from picamera2 import Picamera2
-import cv2
-
-app = Flask(__name__)
-
-# Initialize and configure the camera
-camera = Picamera2()
-camera.configure(camera.create_preview_configuration(
-    main={"format": 'XRGB8888', "size": (1920, 1080)}
-))
-camera.start()
-
-def generate_frames():
-    while True:
-        frame = camera.capture_array()
-        ret, buffer = cv2.imencode('.jpg', frame)
-        frame = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-
-@app.route('/video_feed')
-def video_feed():
-    return Response(generate_frames(),
-                    mimetype='multipart/x-mixed-replace; boundary=frame')
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8080)
+"""
+Minimal camera stream: camera 0 as MJPEG on port 8080
+Runs the same asyncio server as pi_camera_server.py (no Flask)
+"""
+
+from pi_camera_server import CameraServer
+
+if __name__ == "__main__":
+    server = CameraServer(camera_id=0, width=1920, height=1080, port=8080)
+    try:
+        server.start()
+    except KeyboardInterrupt:
+        server.stop()
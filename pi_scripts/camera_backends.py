@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Camera Backends for the Pi camera server
+Picamera2 (hardware JPEG encoder or software fallback) and a synthetic test pattern
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+BACKENDS = ("auto", "mjpeg", "jpeg", "software", "test")
+
+
+class CameraBackend:
+    """
+    Source of frames for CameraServer.
+
+    A backend has a "main" stream (width x height, pixel_format) and may
+    have a "lores" one: a smaller copy of the same frames. streams maps
+    each name to (width, height, pixel_format), where pixel_format is "BGR"
+    (3 or 4 channel, OpenCV order) or "I420" (planar YUV420, height * 3/2
+    rows).
+
+    capture_arrays() returns the next frame of the requested streams for
+    the software encode path. Backends that can produce JPEGs themselves
+    report it through can_encode() and deliver them with start_encoding().
+    """
+
+    name = "base"
+    width = 0
+    height = 0
+    pixel_format = "BGR"
+    streams = {}
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def capture_arrays(self, names):
+        """
+        Capture one frame of the named streams (same sensor frame)
+        Returns:
+            dict of stream name -> array
+        """
+        raise NotImplementedError
+
+    def can_encode(self, width, height):
+        """True if start_encoding() can produce frames of this size directly"""
+        return False
+
+    def start_encoding(self, quality, callback):
+        """
+        Start producing JPEGs; callback(jpeg_buffer, capture_time) is called
+        from the encoder's thread for every frame. Only one encoding runs at
+        a time.
+        """
+        raise NotImplementedError
+
+    def stop_encoding(self):
+        pass
+
+
+def _callback_output(callback):
+    """Picamera2 encoder output that hands every encoded frame to callback"""
+    from picamera2.outputs import Output
+
+    class CallbackOutput(Output):
+        # Later Picamera2 releases pass extra packet/audio arguments
+        def outputframe(self, frame, keyframe=True, timestamp=None, *args, **kwargs):
+            callback(frame, time.time())
+
+    return CallbackOutput()
+
+
+class Picamera2Backend(CameraBackend):
+    """
+    Picamera2 camera.
+
+    encoder="mjpeg" uses the V4L2 hardware JPEG encoder (MJPEGEncoder),
+    "jpeg" the multi-threaded libjpeg encoder (JpegEncoder); both take
+    frames from the ISP buffers directly, with no copy through Python. They
+    serve streams at the configured size; other sizes and
+    encoder=None use capture_array() + the software encoder.
+
+    yuv=True captures YUV420 instead of XRGB8888: 1.5 instead of 4 bytes
+    per pixel, encoded from the planes without an RGB conversion. Widths
+    that are a multiple of 64 avoid row padding.
+
+    lores=(width, height) adds the ISP's second, downscaled output as the
+    "lores" stream (always YUV420; the Pi 4 ISP supports nothing else).
+    """
+
+    def __init__(
+        self, camera_id=0, width=1920, height=1080, encoder="mjpeg", yuv=False, lores=None
+    ):
+        from picamera2 import Picamera2
+
+        self.name = f"picamera2-{encoder or 'software'}" + ("-yuv" if yuv else "")
+        self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.encoder_kind = encoder
+        self.pixel_format = "I420" if yuv else "BGR"
+        self.streams = {"main": (width, height, self.pixel_format)}
+        if lores:
+            self.streams["lores"] = (lores[0], lores[1], "I420")
+        self.picam2 = Picamera2(camera_id)
+        self._encoder = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        main_format = "YUV420" if self.pixel_format == "I420" else "XRGB8888"
+        options = {"main": {"format": main_format, "size": (self.width, self.height)}}
+        if "lores" in self.streams:
+            width, height, _format = self.streams["lores"]
+            options["lores"] = {"format": "YUV420", "size": (width, height)}
+        if self.pixel_format == "I420" or "lores" in self.streams:
+            from libcamera import ColorSpace
+
+            # Full-range YCbCr, which is what JPEG stores
+            options["colour_space"] = ColorSpace.Sycc()
+        config = self.picam2.create_video_configuration(**options)
+        self.picam2.configure(config)
+        self.picam2.start()
+
+    def stop(self):
+        self.stop_encoding()
+        self.picam2.stop()
+
+    def capture_arrays(self, names):
+        request = self.picam2.capture_request()
+        try:
+            return {name: request.make_array(name) for name in names}
+        finally:
+            request.release()
+
+    def can_encode(self, width, height):
+        return self.encoder_kind is not None and (width, height) == (self.width, self.height)
+
+    def start_encoding(self, quality, callback):
+        from picamera2.encoders import JpegEncoder, MJPEGEncoder, Quality
+
+        with self._lock:
+            if self._encoder is not None:
+                raise RuntimeError("encoder already running")
+            output = _callback_output(callback)
+            if self.encoder_kind == "jpeg":
+                self._encoder = JpegEncoder(q=quality)
+                self.picam2.start_encoder(self._encoder, output)
+            else:
+                # The hardware encoder takes a quality preset, not a number
+                presets = [
+                    (40, Quality.VERY_LOW),
+                    (60, Quality.LOW),
+                    (75, Quality.MEDIUM),
+                    (90, Quality.HIGH),
+                ]
+                preset = next((p for limit, p in presets if quality < limit), Quality.VERY_HIGH)
+                self._encoder = MJPEGEncoder()
+                self.picam2.start_encoder(self._encoder, output, quality=preset)
+
+    def stop_encoding(self):
+        with self._lock:
+            if self._encoder is not None:
+                self.picam2.stop_encoder(self._encoder)
+                self._encoder = None
+
+
+class TestPatternBackend(CameraBackend):
+    """
+    Synthetic moving test pattern, for running the server without a camera
+    """
+
+    name = "test"
+
+    def __init__(self, camera_id=0, width=1920, height=1080, fps=30.0, yuv=False, lores=None):
+        self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.pixel_format = "I420" if yuv else "BGR"
+        self.streams = {"main": (width, height, self.pixel_format)}
+        if lores:
+            self.streams["lores"] = (lores[0], lores[1], "I420")
+        self.interval = 1.0 / fps
+        self._next_time = 0.0
+        self._count = 0
+
+        # Colour bars, drawn once
+        colors = [
+            (255, 255, 255), (0, 255, 255), (255, 255, 0), (0, 255, 0),
+            (255, 0, 255), (0, 0, 255), (255, 0, 0), (0, 0, 0),
+        ]
+        self._bars = np.zeros((height, width, 3), dtype=np.uint8)
+        bar_width = max(1, width // len(colors))
+        for i, color in enumerate(colors):
+            self._bars[:, i * bar_width:(i + 1) * bar_width] = color
+
+    def capture_arrays(self, names):
+        """Next frame of each stream, paced to the configured frame rate"""
+        now = time.monotonic()
+        if now < self._next_time:
+            time.sleep(self._next_time - now)
+        self._next_time = max(self._next_time + self.interval, now)
+        self._count += 1
+
+        frame = self._bars.copy()
+        x = (self._count * 8) % self.width
+        cv2.rectangle(frame, (x, 0), (x + 16, self.height), (128, 128, 128), -1)
+        cv2.putText(
+            frame,
+            f"CAM {self.camera_id}  #{self._count}  {time.strftime('%H:%M:%S')}",
+            (20, 60),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.5,
+            (0, 0, 0),
+            3,
+        )
+        arrays = {}
+        for name in names:
+            width, height, pixel_format = self.streams[name]
+            image = frame
+            if (width, height) != (self.width, self.height):
+                image = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            arrays[name] = _bgr_to_i420(image) if pixel_format == "I420" else image
+        return arrays
+
+
+def _bgr_to_i420(frame):
+    """Full-range planar YUV420, like the Pi's Sycc output"""
+    height, width = frame.shape[:2]
+    y, cr, cb = cv2.split(cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb))
+    chroma = (width // 2, height // 2)
+    u = cv2.resize(cb, chroma, interpolation=cv2.INTER_AREA)
+    v = cv2.resize(cr, chroma, interpolation=cv2.INTER_AREA)
+    return np.concatenate([y.ravel(), u.ravel(), v.ravel()]).reshape(-1, width)
+
+
+def create_backend(name, camera_id=0, width=1920, height=1080, yuv=False, lores=None):
+    """
+    Build a backend by name
+    Args:
+        name: "auto" (hardware MJPEG if available, else software), "mjpeg",
+              "jpeg", "software" or "test"
+        yuv: Capture planar YUV420 instead of XRGB8888
+        lores: (width, height) of the low-resolution stream, or None
+    """
+    if name == "test":
+        return TestPatternBackend(camera_id, width, height, yuv=yuv, lores=lores)
+    if name == "auto":
+        try:
+            from picamera2.encoders import MJPEGEncoder  # noqa: F401
+            name = "mjpeg"
+        except ImportError:
+            name = "software"
+    encoder = None if name == "software" else name
+    return Picamera2Backend(camera_id, width, height, encoder=encoder, yuv=yuv, lores=lores)
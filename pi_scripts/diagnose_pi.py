@@ -163,7 +163,7 @@ def check_dependencies():
     """Check Python dependencies"""
     print_header("PYTHON DEPENDENCIES")
     
-    packages = ["pymavlink", "flask", "picamera2", "cv2", "numpy"]
+    packages = ["pymavlink", "picamera2", "cv2", "numpy"]
     
     for pkg in packages:
         try:
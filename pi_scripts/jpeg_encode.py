@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+JPEG (and PNG still) encoding for the Pi camera server
+BGR/XRGB frames through OpenCV, planar YUV420 (I420) frames straight from the planes
+"""
+
+import cv2
+import numpy as np
+
+# Planar encoder, best first: libjpeg-turbo via PyTurboJPEG, then simplejpeg
+# (installed with Picamera2), then an OpenCV colour conversion
+try:
+    from turbojpeg import TJSAMP_420, TurboJPEG
+
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+if _turbojpeg is not None:
+    YUV_ENCODER = "turbojpeg"
+elif simplejpeg is not None:
+    YUV_ENCODER = "simplejpeg"
+else:
+    YUV_ENCODER = "opencv"
+
+
+def encode_bgr(frame, width, height, quality):
+    """
+    Resize (if needed) and encode a BGR/XRGB frame
+    Returns:
+        JPEG buffer (memoryview), or None if encoding failed
+    """
+    if (frame.shape[1], frame.shape[0]) != (width, height):
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+    ret, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.reshape(-1).data if ret else None
+
+
+def i420_planes(frame, width, height):
+    """
+    Y, U and V plane views of a YUV420 frame from Picamera2
+    The frame is (height * 3/2, stride); stride may be padded beyond width.
+    """
+    stride = frame.shape[1]
+    flat = frame.reshape(-1)
+    y_size = stride * height
+    c_size = (stride // 2) * (height // 2)
+    y = flat[:y_size].reshape(height, stride)[:, :width]
+    u = flat[y_size:y_size + c_size].reshape(height // 2, stride // 2)[:, : width // 2]
+    v = flat[y_size + c_size:y_size + 2 * c_size].reshape(height // 2, stride // 2)[:, : width // 2]
+    return y, u, v
+
+
+def resize_i420(planes, width, height):
+    """Resize Y, U, V planes to width x height"""
+    chroma = (width // 2, height // 2)
+    y, u, v = planes
+    return (
+        cv2.resize(y, (width, height), interpolation=cv2.INTER_AREA),
+        cv2.resize(u, chroma, interpolation=cv2.INTER_AREA),
+        cv2.resize(v, chroma, interpolation=cv2.INTER_AREA),
+    )
+
+
+def encode_i420(frame, src_width, src_height, width, height, quality):
+    """
+    Resize (if needed) and encode a YUV420 frame without converting it to RGB
+    Output sizes are rounded down to even, as 4:2:0 chroma requires.
+    Returns:
+        JPEG buffer, or None if encoding failed
+    """
+    width &= ~1
+    height &= ~1
+    planes = i420_planes(frame, src_width, src_height)
+    resized = (width, height) != (src_width, src_height)
+    if resized:
+        planes = resize_i420(planes, width, height)
+
+    if _turbojpeg is None and simplejpeg is not None:
+        # Takes the (possibly strided) plane views as they are
+        return simplejpeg.encode_jpeg_yuv_planes(*planes, quality=quality)
+
+    if _turbojpeg is not None:
+        if not resized and frame.shape[1] == width:
+            packed = frame.reshape(-1)  # Unpadded capture: already contiguous I420
+        else:
+            packed = np.concatenate([plane.ravel() for plane in planes])
+        return _turbojpeg.encode_from_yuv(packed, height, width, quality, TJSAMP_420)
+
+    # No planar encoder: convert first
+    return encode_bgr(planes_to_bgr(planes), width, height, quality)
+
+
+def planes_to_bgr(planes):
+    """BGR image from full-range (JPEG/Sycc) Y, U, V planes"""
+    y, u, v = planes
+    size = (y.shape[1], y.shape[0])
+    cb = cv2.resize(u, size, interpolation=cv2.INTER_LINEAR)
+    cr = cv2.resize(v, size, interpolation=cv2.INTER_LINEAR)
+    return cv2.cvtColor(cv2.merge([y, cr, cb]), cv2.COLOR_YCrCb2BGR)
+
+
+def encode_still(frame, pixel_format, width, height, image_format="jpeg", quality=95):
+    """
+    Full-size still from a captured frame
+    Args:
+        pixel_format: "BGR" or "I420" (see CameraBackend)
+        image_format: "jpeg" or "png" (lossless, much slower to encode)
+    Returns:
+        Encoded image buffer, or None if encoding failed
+    """
+    if image_format == "jpeg":
+        if pixel_format == "I420":
+            return encode_i420(frame, width, height, width, height, quality)
+        return encode_bgr(frame, width, height, quality)
+
+    if pixel_format == "I420":
+        frame = planes_to_bgr(i420_planes(frame, width, height))
+    elif frame.ndim == 3 and frame.shape[2] == 4:
+        frame = frame[:, :, :3]  # XRGB8888: drop the unused channel
+    ret, buffer = cv2.imencode(".png", frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    return buffer.reshape(-1).data if ret else None
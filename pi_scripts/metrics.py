@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Lightweight metrics for the Pi services (stdlib only)
+Counters, gauges and histograms in a registry, served as plain text
+(Prometheus exposition format) or JSON on a small HTTP port per service
+"""
+
+import bisect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; suits I2C reads, JPEG encodes and socket sends alike
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+# Default metrics ports (camera service, sensor server, MAVLink relay)
+CAMERA_METRICS_PORT = 9101
+SENSOR_METRICS_PORT = 9102
+MAVLINK_METRICS_PORT = 9103
+
+
+class Counter:
+    """
+    Monotonic count
+    With fn, the value is read from fn() at scrape time instead (for
+    totals a service already keeps), costing nothing on the hot path.
+    """
+
+    kind = "counter"
+
+    def __init__(self, fn=None):
+        self.fn = fn
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self.fn() if self.fn else self._value
+
+
+class Gauge(Counter):
+    """Value that goes up and down; set() it or give fn"""
+
+    kind = "gauge"
+
+    def set(self, value):
+        self._value = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+
+class Histogram:
+    """Distribution of observed values (usually seconds) in fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # Last one is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def time(self):
+        """Context manager observing the duration of its block"""
+        return _Timer(self)
+
+    def snapshot(self):
+        """(cumulative counts per bucket incl. +Inf, sum, count)"""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = []
+        running = 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, count
+
+    def quantile(self, q, snapshot=None):
+        """Upper bound of the bucket holding quantile q (None if empty)"""
+        cumulative, _total, count = snapshot or self.snapshot()
+        if not count:
+            return None
+        index = bisect.bisect_left(cumulative, q * count)
+        return self.buckets[index] if index < len(self.buckets) else float("inf")
+
+
+class _Timer:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Registry:
+    """
+    Named metrics, each optionally split by labels
+    counter()/gauge()/histogram() return the existing metric for a name
+    and label set, so call sites can look metrics up instead of passing
+    them around.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._metrics = {}  # name -> (kind, help, {label items: metric})
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        key = tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+        with self._lock:
+            kind, _help, series = self._metrics.setdefault(name, (cls.kind, help_text, {}))
+            if kind != cls.kind:
+                raise ValueError(f"metric {name} is a {kind}, not a {cls.kind}")
+            metric = series.get(key)
+            if metric is None:
+                metric = series[key] = cls(**kwargs)
+            elif kwargs.get("fn"):
+                metric.fn = kwargs["fn"]  # Re-registered (e.g. camera restarted)
+            return metric
+
+    def counter(self, name, help_text="", labels=None, fn=None):
+        return self._get(Counter, name, help_text, labels, fn=fn)
+
+    def gauge(self, name, help_text="", labels=None, fn=None):
+        return self._get(Gauge, name, help_text, labels, fn=fn)
+
+    def histogram(self, name, help_text="", labels=None, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def _items(self):
+        with self._lock:
+            return [
+                (name, kind, help_text, list(series.items()))
+                for name, (kind, help_text, series) in sorted(self._metrics.items())
+            ]
+
+    def render_text(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for name, kind, help_text, series in self._items():
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in series:
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(key)} {_number(_read(metric))}")
+                    continue
+                cumulative, total, count = metric.snapshot()
+                bounds = [_number(b) for b in metric.buckets] + ["+Inf"]
+                for bound, c in zip(bounds, cumulative):
+                    lines.append(f"{name}_bucket{_labels(key + (('le', bound),))} {c}")
+                lines.append(f"{name}_sum{_labels(key)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def as_dict(self):
+        """JSON-friendly view; histograms as count/sum/mean and bucket quantiles"""
+        metrics = {}
+        for name, kind, _help, series in self._items():
+            entries = metrics[name] = []
+            for key, metric in series:
+                entry = {"labels": dict(key)} if key else {}
+                if kind == "histogram":
+                    snapshot = metric.snapshot()
+                    _cumulative, total, count = snapshot
+                    entry.update(
+                        count=count,
+                        sum=round(total, 6),
+                        mean=round(total / count, 6) if count else None,
+                        p50=metric.quantile(0.5, snapshot),
+                        p95=metric.quantile(0.95, snapshot),
+                    )
+                else:
+                    entry["value"] = _read(metric)
+                entries.append(entry)
+        return {
+            "time": time.time(),
+            "uptime": round(time.time() - self.started_at, 1),
+            "metrics": metrics,
+        }
+
+
+def _read(metric):
+    """Metric value; a failing callback reads as None instead of breaking the scrape"""
+    try:
+        return metric.value
+    except Exception:
+        return None
+
+
+def _labels(key):
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+
+def _number(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, float) and value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(int(value))
+
+
+# Process-wide registry used by the Pi services
+REGISTRY = Registry()
+
+
+def serve_metrics(port, host="0.0.0.0", registry=REGISTRY, name="METRICS"):
+    """
+    Serve registry on a daemon thread
+    GET /metrics (text), /metrics.json or /metrics?format=json
+    Returns:
+        The HTTP server (shutdown() to stop), or None if port is 0 or busy
+    """
+    if not port:
+        return None
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path, _sep, query = self.path.partition("?")
+            if path not in ("/", "/metrics", "/metrics.json"):
+                self.send_error(404)
+                return
+            if path == "/metrics.json" or "format=json" in query:
+                body = json.dumps(registry.as_dict()).encode()
+                content_type = "application/json"
+            else:
+                body = registry.render_text().encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes would flood the service log
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"[{name}] Metrics disabled, cannot listen on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    ).start()
+    print(f"[{name}] Metrics on http://{host}:{port}/metrics (JSON: /metrics.json)")
+    return server
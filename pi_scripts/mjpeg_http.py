@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Minimal asyncio HTTP server for MJPEG streaming (stdlib only)
+Used by pi_camera_server.py and cam.py in place of Flask's threaded server
+"""
+
+import asyncio
+import json
+import socket
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+BOUNDARY = b"frame"
+BOUNDARY_LINE = b"--" + BOUNDARY + b"\r\n"
+CRLF = b"\r\n"
+
+# Unsent bytes the kernel may hold per streaming socket
+NOTSENT_LOWAT = 16 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPRequest:
+    """Parsed request line, query and headers (names lower-cased)"""
+
+    def __init__(self, method, target, headers, peer=None):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = dict(parse_qsl(parts.query))
+        self.headers = headers
+        self.peer = peer
+
+
+async def read_request(reader, timeout=10.0):
+    """
+    Read one request head
+    Returns:
+        HTTPRequest, or None if the client sent nothing usable
+    """
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+        return None
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError:
+        return None
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return HTTPRequest(method, target, headers)
+
+
+def send_response(
+    writer, status, body=b"", content_type="text/plain; charset=utf-8", headers=None
+):
+    """Write a complete (Connection: close) response; headers adds extra fields"""
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"{extra}"
+        "Cache-Control: no-cache\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode("latin-1")
+    writer.writelines((head, body))
+
+
+def send_json(writer, obj, status=200):
+    """Write obj as a JSON response"""
+    send_response(writer, status, json.dumps(obj).encode(), "application/json")
+
+
+class PartHub:
+    """
+    Latest multipart part of one stream, handed from a producer thread to
+    any number of client coroutines on the event loop.
+
+    A part is a tuple of buffers (boundary, headers, payload, CRLF) written
+    with writelines, so the JPEG is never copied into a combined bytes
+    object. Clients that fall behind simply see the newest part.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.seq = 0
+        self.part = None
+        self.closed = False
+        self._event = asyncio.Event()
+
+    def publish_threadsafe(self, part):
+        """Publish a part from a producer thread"""
+        self.loop.call_soon_threadsafe(self._publish, part)
+
+    def close_threadsafe(self):
+        self.loop.call_soon_threadsafe(self.close)
+
+    def _publish(self, part):
+        self.part = part
+        self.seq += 1
+        self._wake()
+
+    def close(self):
+        self.closed = True
+        self._wake()
+
+    def _wake(self):
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    async def wait_for_part(self, last_seq, timeout=5.0):
+        """
+        Wait for a part newer than last_seq
+        Returns:
+            (seq, part) - part is None on timeout or when the hub is closed
+        """
+        if self.seq == last_seq and not self.closed:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        if self.seq == last_seq or self.closed:
+            return last_seq, None
+        return self.seq, self.part
+
+
+class ClientStats:
+    """Per-connection counters for a streaming client"""
+
+    def __init__(self, peer):
+        self.peer = peer
+        self.connected_at = time.time()
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+
+    def as_dict(self):
+        elapsed = max(time.time() - self.connected_at, 1e-3)
+        return {
+            "peer": self.peer,
+            "connected_for": round(elapsed, 1),
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "bytes_sent": self.bytes_sent,
+            "fps": round(self.frames_sent / elapsed, 1),
+            "kbps": round(self.bytes_sent * 8 / elapsed / 1000, 1),
+        }
+
+
+class MJPEGHTTPServer:
+    """
+    Single-threaded asyncio HTTP/1.1 server for MJPEG streams and small
+    JSON routes.
+
+    Handlers are coroutines handler(request, writer) registered per path
+    (GET/HEAD unless other methods are given).
+    stream_multipart() serves a PartHub to one client through a send slot
+    of depth one: a frame is written only once the previous one has been
+    handed to the kernel, and frames published meanwhile overwrite each
+    other in the hub instead of queueing, so a slow client gets the newest
+    frame next, holds at most one frame in memory and never delays other
+    clients or the producer. A client that cannot take a frame within
+    stall_timeout seconds is disconnected.
+    """
+
+    def __init__(
+        self,
+        host="0.0.0.0",
+        port=8080,
+        send_buffer=None,
+        stall_timeout=10.0,
+        name="HTTP",
+    ):
+        self.host = host
+        self.port = port
+        self.send_buffer = send_buffer  # SO_SNDBUF per client (None = OS default)
+        self.stall_timeout = stall_timeout
+        self.name = name
+        self.routes = {}
+        self.clients = set()
+        # Totals over all streaming clients, past and present
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+        self._server = None
+
+    def route(self, path, handler, methods=("GET", "HEAD")):
+        """Register coroutine handler(request, writer) for path"""
+        self.routes[path] = (handler, methods)
+
+    async def start(self):
+        """Start listening (on the running loop)"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        return self._server
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle_client(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.send_buffer:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        peer = writer.get_extra_info("peername")
+        try:
+            request = await read_request(reader)
+            if request is None:
+                return
+            request.peer = f"{peer[0]}:{peer[1]}" if peer else None
+            handler, methods = self.routes.get(request.path, (None, ()))
+            if handler is None:
+                send_json(writer, {"error": f"no route {request.path}"}, 404)
+            elif request.method not in methods:
+                send_json(writer, {"error": "method not allowed"}, 405)
+            else:
+                await handler(request, writer)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"[{self.name}] Request error: {e}")
+        finally:
+            writer.close()
+
+    async def stream_multipart(self, request, writer, hub):
+        """
+        Serve hub's parts to one client until it disconnects or the hub closes
+        The body never ends, so register stream routes for GET only.
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: multipart/x-mixed-replace; boundary=" + BOUNDARY + b"\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        transport = writer.transport
+        # Pause writing until the whole frame has left user space
+        transport.set_write_buffer_limits(high=0)
+        sock = writer.get_extra_info("socket")
+        if sock is not None and hasattr(socket, "TCP_NOTSENT_LOWAT"):
+            # Linux: keep the kernel from queueing frames behind the one
+            # being sent (in-flight data is unaffected, so throughput is too)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NOTSENT_LOWAT, NOTSENT_LOWAT)
+        stats = ClientStats(request.peer)
+        self.clients.add(stats)
+        seq = 0
+        try:
+            while not transport.is_closing():
+                last_seq = seq
+                seq, part = await hub.wait_for_part(seq)
+                if part is None:
+                    if hub.closed:
+                        break
+                    continue
+                if last_seq:
+                    # Parts overwritten while the previous one was sending
+                    stats.frames_dropped += seq - last_seq - 1
+                    self.frames_dropped += seq - last_seq - 1
+
+                writer.writelines(part)
+                try:
+                    await asyncio.wait_for(writer.drain(), self.stall_timeout)
+                except asyncio.TimeoutError:
+                    print(f"[{self.name}] Dropping stalled client {request.peer}")
+                    break
+                size = sum(len(buf) for buf in part)
+                stats.frames_sent += 1
+                stats.bytes_sent += size
+                self.frames_sent += 1
+                self.bytes_sent += size
+        finally:
+            self.clients.discard(stats)
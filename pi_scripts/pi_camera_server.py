@@ -1,103 +1,771 @@
 #!/usr/bin/env python3
 """
 Camera Server for Raspberry Pi
-Streams MJPEG video from Raspberry Pi cameras via Flask HTTP server
-Based on working cam.py code with Picamera2
+Streams MJPEG video from Raspberry Pi cameras via an asyncio HTTP server
+Based on working cam.py code with Picamera2 (see camera_backends.py)
 """
 
-from flask import Flask, Response
-from picamera2 import Picamera2
-import cv2
+from collections import namedtuple
+
+import asyncio
 import sys
+import threading
+import time
 import argparse
 
+from camera_backends import BACKENDS, create_backend
+from jpeg_encode import YUV_ENCODER, encode_bgr, encode_i420, encode_still
+from metrics import CAMERA_METRICS_PORT, REGISTRY, serve_metrics
+from mjpeg_http import (
+    BOUNDARY_LINE,
+    CRLF,
+    MJPEGHTTPServer,
+    PartHub,
+    send_json,
+    send_response,
+)
+
+DEFAULT_JPEG_QUALITY = 80
+SNAPSHOT_JPEG_QUALITY = 95
+SNAPSHOT_TYPES = {"jpeg": "image/jpeg", "png": "image/png"}
+# Consecutive capture errors before the camera is considered failed
+MAX_CAPTURE_ERRORS = 10
+# Seconds between attempts to (re)open a camera, growing up to the maximum
+RESTART_BACKOFF = 2.0
+MAX_RESTART_BACKOFF = 30.0
+
+
+class StreamProfile(namedtuple("StreamProfile", "stream width height quality fps")):
+    """
+    Camera stream ("main" or "lores"), output size, JPEG quality and frame
+    rate of one /video_feed or /preview_feed variant
+    fps=None streams every captured frame.
+    """
+
+    @classmethod
+    def from_args(cls, args, width, height, quality, stream="main"):
+        """
+        Parse ?w=&h=&q=&fps= request arguments (dict of strings)
+        Sizes are capped at the stream's size (width x height); giving only
+        w or h keeps the aspect ratio. Raises ValueError on malformed values.
+        """
+        values = {}
+        for name, convert in (("w", int), ("h", int), ("q", int), ("fps", float)):
+            if name in args:
+                try:
+                    values[name] = convert(args[name])
+                except ValueError:
+                    raise ValueError(f"invalid {name}: {args[name]!r}") from None
+        w, h, fps = values.get("w"), values.get("h"), values.get("fps")
+        q = values.get("q", quality)
+
+        if w and not h:
+            h = round(w * height / width)
+        elif h and not w:
+            w = round(h * width / height)
+        w = min(max(16, w or width), width)
+        h = min(max(16, h or height), height)
+        q = min(max(10, q), 100)
+        fps = max(1.0, fps) if fps else None
+        return cls(stream, w, h, q, fps)
+
+
+def jpeg_part(jpeg, capture_time, seq):
+    """Multipart part for one JPEG: boundary, headers, payload, CRLF"""
+    header = (
+        b"Content-Type: image/jpeg\r\n"
+        b"Content-Length: %d\r\n"
+        b"X-Timestamp: %.6f\r\n"
+        b"X-Seq: %d\r\n\r\n" % (len(jpeg), capture_time, seq)
+    )
+    # Boundary, headers and JPEG go out with writelines, uncombined
+    return (BOUNDARY_LINE, header, jpeg, CRLF)
+
+
+class FrameSource:
+    """
+    Single capture thread for a camera, shared by all stream profiles.
+    Captures only while at least one profile is subscribed, and only the
+    camera streams ("main", "lores") that have subscribers; each capture
+    takes all of them from the same sensor frame. After MAX_CAPTURE_ERRORS
+    failed captures in a row the thread gives up and sets failed, so the
+    camera can be restarted.
+    """
+
+    def __init__(self, camera, camera_id=0):
+        self.camera = camera
+        self.camera_id = camera_id
+        self._condition = threading.Condition()
+        self._frames = {}
+        self._capture_time = 0.0
+        self._seq = 0
+        self._subscribers = {name: 0 for name in camera.streams}
+        self._running = False
+        self._thread = None
+        self.frames_captured = 0
+        self.errors = 0
+        self.failed = False
+        self.fps = 0.0  # Capture rate over the last second
+        self._capture_time_metric = REGISTRY.histogram(
+            "camera_capture_seconds",
+            "Time to capture one frame (all subscribed streams)",
+            {"camera": camera_id},
+        )
+
+    def start(self):
+        """Start the capture thread"""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._capture_loop, name=f"camera{self.camera_id}-capture", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the capture thread and wake all waiters"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def subscribe(self, stream="main"):
+        with self._condition:
+            self._subscribers[stream] += 1
+            self._condition.notify_all()
+
+    def unsubscribe(self, stream="main"):
+        with self._condition:
+            self._subscribers[stream] -= 1
+
+    @property
+    def running(self):
+        return self._running
+
+    def wait_for_frame(self, last_seq, timeout=5.0, stream="main"):
+        """
+        Block until a frame newer than last_seq is captured
+        Returns:
+            (seq, frame, capture_time) - frame is None on timeout or shutdown,
+            or if that capture did not include stream
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._seq != last_seq or not self._running, timeout
+            )
+            if self._seq == last_seq or not self._running:
+                return last_seq, None, 0.0
+            return self._seq, self._frames.get(stream), self._capture_time
+
+    def latest_frame(self, timeout=2.0, stream="main"):
+        """
+        Wait for the next captured frame, capturing just for this call if no
+        stream is running
+        Returns:
+            (frame, capture_time) - frame is None on timeout
+        """
+        with self._condition:
+            seq = self._seq
+        self.subscribe(stream)
+        try:
+            deadline = time.monotonic() + timeout
+            frame, capture_time = None, 0.0
+            while frame is None and time.monotonic() < deadline:
+                seq, frame, capture_time = self.wait_for_frame(
+                    seq, deadline - time.monotonic(), stream
+                )
+        finally:
+            self.unsubscribe(stream)
+        return frame, capture_time
+
+    def _capture_loop(self):
+        consecutive_errors = 0
+        window_start, window_frames = time.monotonic(), 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: any(self._subscribers.values()) or not self._running
+                )
+                if not self._running:
+                    return
+                names = [name for name, count in self._subscribers.items() if count > 0]
+
+            try:
+                with self._capture_time_metric.time():
+                    frames = self.camera.capture_arrays(names)
+            except Exception as e:
+                self.errors += 1
+                consecutive_errors += 1
+                print(f"[CAMERA {self.camera_id}] Frame capture error: {e}")
+                if consecutive_errors >= MAX_CAPTURE_ERRORS:
+                    print(f"[CAMERA {self.camera_id}] Capture failed {consecutive_errors} times")
+                    with self._condition:
+                        self.failed = True
+                        self._running = False
+                        self._condition.notify_all()
+                    return
+                time.sleep(0.5)
+                continue
+            consecutive_errors = 0
+            window_frames += 1
+            now = time.monotonic()
+            if now - window_start >= 1.0:
+                self.fps = window_frames / (now - window_start)
+                window_start, window_frames = now, 0
+
+            with self._condition:
+                self._frames = frames
+                self._capture_time = time.time()
+                self._seq += 1
+                self.frames_captured += 1
+                self._condition.notify_all()
+
+
+class FrameBroadcaster:
+    """
+    Encodes each frame once per stream profile, for any number of viewers.
+
+    One thread takes frames from the shared FrameSource, resizes them to the
+    profile size, JPEG-encodes them (from the YUV planes for I420 sources)
+    at the profile quality (paced to the
+    profile fps) and publishes the complete multipart part (headers + JPEG)
+    to a PartHub. Client coroutines on the event loop send the same buffers,
+    so encode cost does not grow with the number of viewers.
+    """
+
+    hardware = False
+
+    def __init__(self, source, profile, loop, camera_id=0):
+        self.source = source
+        self.profile = profile
+        self.camera_id = camera_id
+        self.hub = PartHub(loop)
+        self.clients = 0  # Managed by CameraServer on the event loop
+        self._running = False
+        self._thread = None
+        self.frames_encoded = 0
+        self._encode_time_metric = REGISTRY.histogram(
+            "camera_encode_seconds",
+            "Software resize + JPEG encode time per frame",
+            {"camera": camera_id, "stream": profile.stream},
+        )
+
+    def start(self):
+        """Subscribe to the frame source and start the encode thread"""
+        self._running = True
+        self.source.subscribe(self.profile.stream)
+        self._thread = threading.Thread(
+            target=self._encode_loop, name=f"camera{self.camera_id}-encode", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, wait=False):
+        """
+        Stop encoding and end all client streams
+        The thread exits within half a second; wait=True joins it (do not
+        wait from the event loop).
+        """
+        if not self._running:
+            return
+        self._running = False
+        self.source.unsubscribe(self.profile.stream)
+        self.hub.close_threadsafe()
+        if wait and self._thread:
+            self._thread.join(timeout=2.0)
+
+    def _encode(self, frame):
+        """JPEG buffer for one source frame at the profile size and quality"""
+        profile = self.profile
+        width, height, pixel_format = self.source.camera.streams[profile.stream]
+        if pixel_format == "I420":
+            return encode_i420(
+                frame, width, height, profile.width, profile.height, profile.quality
+            )
+        return encode_bgr(frame, profile.width, profile.height, profile.quality)
+
+    def _encode_loop(self):
+        """Resize + encode once per frame and publish to all clients"""
+        profile = self.profile
+        interval = 1.0 / profile.fps if profile.fps else 0.0
+        next_time = 0.0
+        frame_seq = 0
+
+        while self._running:
+            frame_seq, frame, capture_time = self.source.wait_for_frame(
+                frame_seq, 0.5, profile.stream
+            )
+            if frame is None:
+                continue
+            if interval:
+                now = time.monotonic()
+                if now < next_time:
+                    continue
+                next_time = max(next_time + interval, now)
+
+            with self._encode_time_metric.time():
+                buffer = self._encode(frame)
+            if buffer is None:
+                continue
+
+            self.frames_encoded += 1
+            self.hub.publish_threadsafe(jpeg_part(buffer, capture_time, self.frames_encoded))
+
+
+class EncodedBroadcaster:
+    """
+    Streams JPEGs produced by the camera backend's own encoder.
+
+    Used instead of FrameBroadcaster when the backend can encode the
+    profile's size itself (Picamera2 MJPEGEncoder/JpegEncoder): frames go
+    from the ISP to the encoder without a capture_array() copy or an OpenCV
+    encode, and the encoder output is published as-is. Same interface as
+    FrameBroadcaster.
+    """
+
+    hardware = True
+
+    def __init__(self, backend, profile, loop, camera_id=0):
+        self.backend = backend
+        self.profile = profile
+        self.camera_id = camera_id
+        self.hub = PartHub(loop)
+        self.clients = 0  # Managed by CameraServer on the event loop
+        self._running = False
+        self._interval = 1.0 / profile.fps if profile.fps else 0.0
+        self._next_time = 0.0
+        self.frames_encoded = 0
+
+    def start(self):
+        """Start the backend encoder"""
+        self._running = True
+        self.backend.start_encoding(self.profile.quality, self._on_jpeg)
+
+    def stop(self, wait=False):
+        """Stop the backend encoder and end all client streams"""
+        if not self._running:
+            return
+        self._running = False
+        self.backend.stop_encoding()
+        self.hub.close_threadsafe()
+
+    def _on_jpeg(self, jpeg, capture_time):
+        """Encoder output callback (encoder thread)"""
+        if not self._running:
+            return
+        if self._interval:
+            now = time.monotonic()
+            if now < self._next_time:
+                return
+            self._next_time = max(self._next_time + self._interval, now)
+        self.frames_encoded += 1
+        self.hub.publish_threadsafe(jpeg_part(jpeg, capture_time, self.frames_encoded))
+
 
 class CameraServer:
-    """Flask-based MJPEG camera server using Picamera2"""
+    """
+    asyncio MJPEG camera server
+
+    backend selects the frame source (see camera_backends.BACKENDS): "auto"
+    uses Picamera2 with the hardware MJPEG encoder for full-size streams
+    and OpenCV for scaled ones, "software" always encodes with OpenCV and
+    "test" serves a synthetic pattern without a camera.
+
+    /video_feed streams the full-resolution main stream. /preview_feed
+    streams the lores stream (lores_width x lores_height, scaled by the ISP
+    at no extra cost) for piloting at low bandwidth and latency; a lores
+    size of 0 disables it.
+
+    start() runs one camera in its own process. run()/close() instead run
+    it on an existing event loop next to other cameras (see
+    pi_camera_service.py); the camera is then reopened with backoff when it
+    fails, and POST /restart reopens it on demand.
+    """
 
-    def __init__(self, camera_id=0, width=1920, height=1080, port=8080, host="0.0.0.0"):
+    def __init__(
+        self,
+        camera_id=0,
+        width=1920,
+        height=1080,
+        port=8080,
+        host="0.0.0.0",
+        quality=DEFAULT_JPEG_QUALITY,
+        backend="auto",
+        yuv=False,
+        lores_width=640,
+        lores_height=360,
+    ):
         self.camera_id = camera_id
         self.width = width
         self.height = height
+        self.lores = (lores_width, lores_height) if lores_width and lores_height else None
         self.port = port
         self.host = host
+        self.quality = quality
+        self.backend_name = backend
+        self.yuv = yuv
         self.camera = None
-        self.app = Flask(__name__)
+        self.source = None
+        self.loop = None
+        self._watchdog = None
+        self._restarting = False
+        self.restarts = 0
+        self._backoff = RESTART_BACKOFF
+        self._next_open = 0.0
+        # One broadcaster per requested profile, kept while it has clients.
+        # Only touched from the event loop, under the lock while encoders
+        # start and stop in the executor.
+        self.broadcasters = {}
+        self._broadcasters_lock = asyncio.Lock()
+        self.http = MJPEGHTTPServer(host, port, name=f"CAMERA {camera_id}")
 
-        self._setup_routes()
+        # Streams are GET only: a HEAD would otherwise get an endless body
+        self.http.route("/video_feed", self._video_feed, methods=("GET",))
+        self.http.route("/preview_feed", self._preview_feed, methods=("GET",))
+        self.http.route("/snapshot", self._snapshot)
+        self.http.route("/status", self._status)
+        self.http.route("/restart", self._restart, methods=("POST",))
+        self._register_metrics()
 
-    def _setup_routes(self):
-        """Setup Flask routes"""
+    def _register_metrics(self):
+        """Callback metrics: read from existing counters only when scraped"""
+        labels = {"camera": self.camera_id}
+        http = self.http
+        for name, help_text, fn in (
+            ("camera_frames_captured_total", "Frames captured since the camera (re)started",
+             lambda: self.source.frames_captured if self.source else 0),
+            ("camera_capture_errors_total", "Failed captures since the camera (re)started",
+             lambda: self.source.errors if self.source else 0),
+            ("camera_restarts_total", "Camera restarts", lambda: self.restarts),
+            ("camera_frames_sent_total", "Frames sent to streaming clients",
+             lambda: http.frames_sent),
+            ("camera_frames_dropped_total", "Frames skipped for slow streaming clients",
+             lambda: http.frames_dropped),
+            ("camera_bytes_sent_total", "Bytes sent to streaming clients",
+             lambda: http.bytes_sent),
+        ):
+            REGISTRY.counter(name, help_text, labels, fn=fn)
+        for name, help_text, fn in (
+            ("camera_up", "1 while the camera is open", lambda: int(self.camera is not None)),
+            ("camera_capture_fps", "Capture rate over the last second",
+             lambda: round(self.source.fps, 1) if self.source else 0.0),
+            ("camera_clients", "Connected streaming clients", lambda: len(http.clients)),
+            ("camera_profiles", "Active stream profiles (encoders)",
+             lambda: len(self.broadcasters)),
+        ):
+            REGISTRY.gauge(name, help_text, labels, fn=fn)
 
-        @self.app.route("/video_feed")
-        def video_feed():
-            return Response(
-                self._generate_frames(),
-                mimetype="multipart/x-mixed-replace; boundary=frame",
+    async def _video_feed(self, request, writer):
+        """Main-stream MJPEG; optional ?w=&h=&q=&fps= select a profile"""
+        await self._stream(request, writer, "main")
+
+    async def _preview_feed(self, request, writer):
+        """Lores-stream MJPEG; same profile arguments as /video_feed"""
+        if self.lores is None:
+            send_json(writer, {"error": "preview stream disabled"}, 404)
+            return
+        await self._stream(request, writer, "lores")
+
+    async def _stream(self, request, writer, stream):
+        if self.camera is None:
+            send_json(writer, {"error": "camera not running"}, 503)
+            return
+        width, height, _format = self.camera.streams[stream]
+        try:
+            profile = StreamProfile.from_args(
+                request.query, width, height, self.quality, stream
             )
+        except ValueError as e:
+            send_json(writer, {"error": str(e)}, 400)
+            return
+
+        broadcaster = await self._acquire_broadcaster(profile)
+        if broadcaster is None:
+            send_json(writer, {"error": "camera not running"}, 503)
+            return
+        try:
+            await self.http.stream_multipart(request, writer, broadcaster.hub)
+        finally:
+            await self._release_broadcaster(broadcaster)
+
+    async def _snapshot(self, request, writer):
+        """
+        Newest frame at the full capture size, untouched by stream profiles
+        ?format=jpeg|png, ?q= JPEG quality (default 95). Capture and encode
+        run off the event loop, so live streams are not held up.
+        """
+        image_format = request.query.get("format", "jpeg").lower().replace("jpg", "jpeg")
+        if image_format not in SNAPSHOT_TYPES:
+            send_json(writer, {"error": f"invalid format: {image_format!r}"}, 400)
+            return
+        try:
+            quality = min(max(10, int(request.query.get("q", SNAPSHOT_JPEG_QUALITY))), 100)
+        except ValueError:
+            send_json(writer, {"error": f"invalid q: {request.query['q']!r}"}, 400)
+            return
+
+        result = await self.loop.run_in_executor(
+            None, self._take_snapshot, image_format, quality
+        )
+        if result is None:
+            send_json(writer, {"error": "no frame available"}, 503)
+            return
+        image, capture_time = result
+        send_response(
+            writer,
+            200,
+            image,
+            SNAPSHOT_TYPES[image_format],
+            headers={"X-Timestamp": f"{capture_time:.6f}"},
+        )
+
+    def _take_snapshot(self, image_format, quality):
+        """Capture and encode a still (executor thread)"""
+        source, camera = self.source, self.camera
+        if source is None:
+            return None
+        frame, capture_time = source.latest_frame()
+        if frame is None:
+            return None
+        image = encode_still(
+            frame, camera.pixel_format, self.width, self.height, image_format, quality
+        )
+        return (image, capture_time) if image is not None else None
 
-        @self.app.route("/status")
-        def status():
-            return {
+    async def _status(self, request, writer):
+        profiles = [
+            {
+                **profile._asdict(),
+                "clients": b.clients,
+                "frames_encoded": b.frames_encoded,
+                "hardware": b.hardware,
+            }
+            for profile, b in self.broadcasters.items()
+        ]
+        send_json(
+            writer,
+            {
                 "camera_id": self.camera_id,
                 "resolution": f"{self.width}x{self.height}",
+                "preview_resolution": f"{self.lores[0]}x{self.lores[1]}" if self.lores else None,
                 "status": "running" if self.camera else "stopped",
-            }
+                "backend": self.camera.name if self.camera else self.backend_name,
+                "pixel_format": self.camera.pixel_format if self.camera else None,
+                "yuv_encoder": YUV_ENCODER if self.yuv else None,
+                "clients": sum(p["clients"] for p in profiles),
+                "frames_captured": self.source.frames_captured if self.source else 0,
+                "restarts": self.restarts,
+                "profiles": profiles,
+                "client_stats": [c.as_dict() for c in self.http.clients],
+                # Lets the ground station estimate the Pi clock offset
+                "time": time.time(),
+            },
+        )
 
-    def _generate_frames(self):
-        """Generate MJPEG frames"""
-        while True:
+    async def _acquire_broadcaster(self, profile):
+        """
+        Shared broadcaster for profile, started on first use
+        Returns:
+            The broadcaster with this client counted, or None if the camera
+            was closed meanwhile
+        """
+        async with self._broadcasters_lock:
+            if self.camera is None:
+                return None
+            broadcaster = self.broadcasters.get(profile)
+            if broadcaster is None:
+                broadcaster = await self._start_broadcaster(profile)
+                self.broadcasters[profile] = broadcaster
+                kind = "hardware" if broadcaster.hardware else "software"
+                print(f"[CAMERA {self.camera_id}] Profile started ({kind}): {profile}")
+            broadcaster.clients += 1
+            return broadcaster
+
+    async def _start_broadcaster(self, profile):
+        """New running broadcaster for profile (lock held)"""
+        # The backend has one encoder; later profiles of the same size
+        # fall back to OpenCV while it is busy
+        hardware_busy = any(b.hardware for b in self.broadcasters.values())
+        if (
+            not hardware_busy
+            and profile.stream == "main"
+            and self.camera.can_encode(profile.width, profile.height)
+        ):
+            broadcaster = EncodedBroadcaster(self.camera, profile, self.loop, self.camera_id)
             try:
-                frame = self.camera.capture_array()
-                ret, buffer = cv2.imencode(".jpg", frame)
-                if ret:
-                    frame_bytes = buffer.tobytes()
-                    yield (
-                        b"--frame\r\n"
-                        b"Content-Type: image/jpeg\r\n\r\n" + frame_bytes + b"\r\n"
-                    )
+                # Configuring the backend encoder blocks; keep it off the loop
+                await self.loop.run_in_executor(None, broadcaster.start)
+                return broadcaster
             except Exception as e:
-                print(f"[CAMERA {self.camera_id}] Frame capture error: {e}")
-                break
+                print(f"[CAMERA {self.camera_id}] Hardware encoder failed, using software: {e}")
+        broadcaster = FrameBroadcaster(self.source, profile, self.loop, self.camera_id)
+        broadcaster.start()
+        return broadcaster
 
-    def start(self):
-        """Initialize camera and start Flask server"""
-        try:
-            print(f"[CAMERA {self.camera_id}] Initializing Picamera2...")
-            self.camera = Picamera2(self.camera_id)
+    async def _release_broadcaster(self, broadcaster):
+        """Drop one client; the last one stops the profile's encoder"""
+        async with self._broadcasters_lock:
+            broadcaster.clients -= 1
+            if broadcaster.clients > 0:
+                return
+            if self.broadcasters.get(broadcaster.profile) is broadcaster:
+                del self.broadcasters[broadcaster.profile]
+            # Stopping a hardware encoder joins its thread; the lock keeps a
+            # new client from starting it again before it has stopped
+            await self.loop.run_in_executor(None, broadcaster.stop)
+        print(f"[CAMERA {self.camera_id}] Profile stopped: {broadcaster.profile}")
 
-            # Configure camera
-            config = self.camera.create_preview_configuration(
-                main={"format": "XRGB8888", "size": (self.width, self.height)}
-            )
-            self.camera.configure(config)
-            self.camera.start()
+    async def _restart(self, request, writer):
+        """POST: reopen this camera without touching other cameras or the server"""
+        if self._restarting:
+            send_json(writer, {"error": "restart already in progress"}, 503)
+            return
+        await self.restart()
+        send_json(writer, {"camera_id": self.camera_id, "running": self.camera is not None})
+
+    def _open_camera(self):
+        """Create and start the backend and frame source (blocking)"""
+        print(f"[CAMERA {self.camera_id}] Initializing {self.backend_name} backend...")
+        camera = create_backend(
+            self.backend_name,
+            self.camera_id,
+            self.width,
+            self.height,
+            yuv=self.yuv,
+            lores=self.lores,
+        )
+        camera.start()
+        self.source = FrameSource(camera, self.camera_id)
+        self.source.start()
+        self.camera = camera
+        print(f"[CAMERA {self.camera_id}] Camera initialized ({camera.name})")
+
+    def _detach_camera(self):
+        """
+        Take the camera, frame source and broadcasters out of service (event
+        loop), so new requests see no camera while they are closed
+        Returns:
+            Arguments for _close_camera()
+        """
+        broadcasters = list(self.broadcasters.values())
+        self.broadcasters.clear()
+        source, camera = self.source, self.camera
+        self.source = self.camera = None
+        return broadcasters, source, camera
 
-            print(f"[CAMERA {self.camera_id}] Camera initialized successfully")
+    def _close_camera(self, broadcasters, source, camera):
+        """Stop broadcasters (ending their streams), the source and the backend (blocking)"""
+        for broadcaster in broadcasters:
+            broadcaster.stop(wait=True)
+        if source:
+            source.stop()
+        if camera:
+            try:
+                camera.stop()
+            except Exception as e:
+                print(f"[CAMERA {self.camera_id}] Error stopping camera: {e}")
+            print(f"[CAMERA {self.camera_id}] Camera stopped")
+
+    async def restart(self):
+        """Close and reopen the camera; the HTTP server keeps running"""
+        self._restarting = True
+        try:
+            print(f"[CAMERA {self.camera_id}] Restarting camera...")
+            self.restarts += 1
+            await self._shut_down_camera()
+            await self._try_open()
+        finally:
+            self._restarting = False
+
+    async def _try_open(self):
+        """Open the camera; on failure schedule a retry with backoff"""
+        try:
+            await self.loop.run_in_executor(None, self._open_camera)
+            self._backoff = RESTART_BACKOFF
+            return True
+        except Exception as e:
             print(
-                f"[CAMERA {self.camera_id}] Starting Flask server on {self.host}:{self.port}"
+                f"[CAMERA {self.camera_id}] Failed to start: {e} "
+                f"(retrying in {self._backoff:.0f}s)"
             )
+            self._next_open = time.monotonic() + self._backoff
+            self._backoff = min(self._backoff * 2, MAX_RESTART_BACKOFF)
+            return False
+
+    async def _watch(self):
+        """Reopen the camera if it failed to start or its capture failed"""
+        while True:
+            await asyncio.sleep(1.0)
+            if self._restarting:
+                continue
+            if self.camera is None:
+                if time.monotonic() >= self._next_open:
+                    await self._try_open()
+            elif self.source.failed:
+                await self.restart()
+
+    def _print_urls(self):
+        base = f"http://{self.host}:{self.port}"
+        print(f"[CAMERA {self.camera_id}] Stream URL: {base}/video_feed")
+        if self.lores:
             print(
-                f"[CAMERA {self.camera_id}] Stream URL: http://{self.host}:{self.port}/video_feed"
+                f"[CAMERA {self.camera_id}] Preview URL: "
+                f"{base}/preview_feed ({self.lores[0]}x{self.lores[1]})"
             )
+        print(f"[CAMERA {self.camera_id}] Snapshot URL: {base}/snapshot?format=png")
 
-            # Run Flask server
-            self.app.run(host=self.host, port=self.port, threaded=True)
+    async def run(self):
+        """
+        Start serving on the running event loop and return
+        The camera is opened (and reopened after failures) in the
+        background, so several CameraServers can share one loop and one
+        camera failing does not affect the others.
+        """
+        self.loop = asyncio.get_running_loop()
+        await self.http.start()
+        print(f"[CAMERA {self.camera_id}] Serving on {self.host}:{self.port}")
+        self._print_urls()
+        if self.camera is None:
+            await self._try_open()
+        self._watchdog = self.loop.create_task(self._watch())
 
+    async def close(self):
+        """Stop serving and close the camera (on the event loop)"""
+        if self._watchdog:
+            self._watchdog.cancel()
+        self.http.close()
+        await self._shut_down_camera()
+
+    async def _shut_down_camera(self):
+        """Detach the camera once no encoder is starting, then close it off the loop"""
+        async with self._broadcasters_lock:
+            detached = self._detach_camera()
+        await self.loop.run_in_executor(None, self._close_camera, *detached)
+
+    async def _serve(self):
+        await self.run()
+        await self.http.serve_forever()
+
+    def start(self):
+        """Initialize camera and run the HTTP server (blocks)"""
+        try:
+            self._open_camera()
         except Exception as e:
             print(f"[CAMERA {self.camera_id}] Failed to start: {e}")
             sys.exit(1)
 
+        try:
+            asyncio.run(self._serve())
+        except OSError as e:
+            print(f"[CAMERA {self.camera_id}] Failed to start: {e}")
+            sys.exit(1)
+
     def stop(self):
         """Stop camera"""
-        if self.camera:
-            self.camera.stop()
-            print(f"[CAMERA {self.camera_id}] Camera stopped")
+        self._close_camera(*self._detach_camera())
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Stream Raspberry Pi camera via Flask MJPEG server"
+        description="Stream Raspberry Pi camera via asyncio MJPEG server"
     )
     parser.add_argument(
         "camera_id", type=int, choices=[0, 1], help="Camera ID (0 or 1)"
@@ -112,8 +780,45 @@ def main():
     parser.add_argument(
         "--host", type=str, default="0.0.0.0", help="Host address (default: 0.0.0.0)"
     )
+    parser.add_argument(
+        "--quality",
+        type=int,
+        default=DEFAULT_JPEG_QUALITY,
+        help=f"Default JPEG quality, overridable per stream with ?q= (default: {DEFAULT_JPEG_QUALITY})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="auto",
+        help="auto (hardware MJPEG, else software), mjpeg, jpeg, software, "
+        "or test (synthetic pattern, no camera) (default: auto)",
+    )
+    parser.add_argument(
+        "--yuv",
+        action="store_true",
+        help="Capture YUV420 and encode from the planes (less memory traffic than XRGB8888)",
+    )
+    parser.add_argument(
+        "--lores-width",
+        type=int,
+        default=640,
+        help="Preview (lores) stream width, 0 to disable /preview_feed (default: 640)",
+    )
+    parser.add_argument(
+        "--lores-height",
+        type=int,
+        default=360,
+        help="Preview (lores) stream height (default: 360)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=CAMERA_METRICS_PORT,
+        help=f"Metrics HTTP port, 0 to disable (default: {CAMERA_METRICS_PORT})",
+    )
 
     args = parser.parse_args()
+    serve_metrics(args.metrics_port, args.host, name=f"CAMERA {args.camera_id}")
 
     server = CameraServer(
         camera_id=args.camera_id,
@@ -121,6 +826,11 @@ def main():
         height=args.height,
         port=args.port,
         host=args.host,
+        quality=args.quality,
+        backend=args.backend,
+        yuv=args.yuv,
+        lores_width=args.lores_width,
+        lores_height=args.lores_height,
     )
 
     try:
@@ -143,6 +853,14 @@ if __name__ == "__main__":
         print("    python3 pi_camera_server.py 1 8081")
         print("\n  Custom resolution:")
         print("    python3 pi_camera_server.py 0 8080 --width 1280 --height 720")
+        print("\n  Test pattern without a camera:")
+        print("    python3 pi_camera_server.py 0 8080 --backend test")
+        print("\nStream profiles (per request):")
+        print("    http://<pi>:8080/video_feed?w=960&h=540&q=70&fps=15")
+        print("\nLow-resolution preview (ISP lores stream):")
+        print("    http://<pi>:8080/preview_feed")
+        print("\nFull-size stills:")
+        print("    http://<pi>:8080/snapshot?format=png")
         sys.exit(1)
 
     main()
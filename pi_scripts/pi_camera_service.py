@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Camera Service for Raspberry Pi
+Runs every camera in one process: one interpreter, one copy of OpenCV/numpy
+and one asyncio event loop, with each camera on its own port as before
+"""
+
+import argparse
+import asyncio
+import signal
+
+from camera_backends import BACKENDS
+from metrics import CAMERA_METRICS_PORT, serve_metrics
+from pi_camera_server import DEFAULT_JPEG_QUALITY, CameraServer
+
+
+def parse_camera(value):
+    """'ID:PORT' -> (camera_id, port)"""
+    try:
+        camera_id, port = (int(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ID:PORT, got {value!r}")
+    return camera_id, port
+
+
+class CameraService:
+    """
+    CameraServers sharing one event loop.
+
+    Each camera keeps its own port and routes (/video_feed, /preview_feed,
+    /snapshot, /status) and its own capture and encode threads. A camera
+    that is missing at startup or whose capture fails is reopened with
+    backoff while the others keep streaming; POST /restart on a camera's
+    port restarts just that camera.
+    """
+
+    def __init__(self, cameras, **options):
+        """
+        Args:
+            cameras: [(camera_id, port), ...]
+            options: CameraServer arguments shared by all cameras
+        """
+        self.servers = [
+            CameraServer(camera_id=camera_id, port=port, **options)
+            for camera_id, port in cameras
+        ]
+
+    async def run(self):
+        """Serve until SIGINT/SIGTERM/SIGHUP, then close every camera"""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            loop.add_signal_handler(sig, stop.set)
+
+        started = []
+        for server in self.servers:
+            try:
+                await server.run()
+                started.append(server)
+            except OSError as e:
+                print(f"[CAMERA {server.camera_id}] Failed to listen on port {server.port}: {e}")
+        if not started:
+            print("[CAMERAS] No camera server could start")
+            return 1
+
+        print(f"[CAMERAS] Serving {len(started)} camera(s) in one process")
+        await stop.wait()
+        print("\n[CAMERAS] Stopping...")
+        for server in started:
+            await server.close()
+        print("[CAMERAS] Stopped")
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream all Raspberry Pi cameras from one process"
+    )
+    parser.add_argument(
+        "--camera",
+        type=parse_camera,
+        action="append",
+        dest="cameras",
+        metavar="ID:PORT",
+        help="Camera ID and HTTP port, repeatable (default: 0:8080 1:8081)",
+    )
+    parser.add_argument(
+        "--width", type=int, default=1920, help="Video width (default: 1920)"
+    )
+    parser.add_argument(
+        "--height", type=int, default=1080, help="Video height (default: 1080)"
+    )
+    parser.add_argument(
+        "--host", type=str, default="0.0.0.0", help="Host address (default: 0.0.0.0)"
+    )
+    parser.add_argument(
+        "--quality",
+        type=int,
+        default=DEFAULT_JPEG_QUALITY,
+        help=f"Default JPEG quality, overridable per stream with ?q= (default: {DEFAULT_JPEG_QUALITY})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="auto",
+        help="auto (hardware MJPEG, else software), mjpeg, jpeg, software, "
+        "or test (synthetic pattern, no camera) (default: auto)",
+    )
+    parser.add_argument(
+        "--yuv",
+        action="store_true",
+        help="Capture YUV420 and encode from the planes (less memory traffic than XRGB8888)",
+    )
+    parser.add_argument(
+        "--lores-width",
+        type=int,
+        default=640,
+        help="Preview (lores) stream width, 0 to disable /preview_feed (default: 640)",
+    )
+    parser.add_argument(
+        "--lores-height",
+        type=int,
+        default=360,
+        help="Preview (lores) stream height (default: 360)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=CAMERA_METRICS_PORT,
+        help=f"Metrics HTTP port, 0 to disable (default: {CAMERA_METRICS_PORT})",
+    )
+
+    args = parser.parse_args()
+    serve_metrics(args.metrics_port, args.host, name="CAMERAS")
+
+    service = CameraService(
+        args.cameras or [(0, 8080), (1, 8081)],
+        width=args.width,
+        height=args.height,
+        host=args.host,
+        quality=args.quality,
+        backend=args.backend,
+        yuv=args.yuv,
+        lores_width=args.lores_width,
+        lores_height=args.lores_height,
+    )
+    return asyncio.run(service.run())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
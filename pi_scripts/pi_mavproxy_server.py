@@ -23,6 +23,8 @@ import os
 from pathlib import Path
 from pymavlink import mavutil
 
+from metrics import MAVLINK_METRICS_PORT, REGISTRY, serve_metrics
+
 
 class MAVLinkTCPRelay:
     """Relay MAVLink messages between serial Pixhawk and TCP clients."""
@@ -53,6 +55,48 @@ class MAVLinkTCPRelay:
         self.clients = []
         self.clients_lock = threading.Lock()
         self.running = True
+        self._last_heartbeat = None
+        self._register_metrics()
+
+    def _register_metrics(self):
+        """Relay metrics (see metrics.py); gauges are read only when scraped"""
+        self.rx_bytes = REGISTRY.counter(
+            "mavlink_serial_rx_bytes_total", "Bytes of MAVLink read from the Pixhawk"
+        )
+        self.rx_messages = REGISTRY.counter(
+            "mavlink_serial_rx_messages_total", "MAVLink messages read from the Pixhawk"
+        )
+        self.tx_bytes = REGISTRY.counter(
+            "mavlink_serial_tx_bytes_total", "Bytes forwarded from clients to the Pixhawk"
+        )
+        self.errors = REGISTRY.counter(
+            "mavlink_relay_errors_total", "Forwarding, send and relay errors"
+        )
+        self.send_time = REGISTRY.histogram(
+            "mavlink_client_send_seconds", "Time to send one message to all clients"
+        )
+        REGISTRY.gauge(
+            "mavlink_clients", "Connected Ground Station clients", fn=lambda: len(self.clients)
+        )
+        # The relay has no queue of its own; backlog builds up in the
+        # serial driver and in pymavlink's parse buffer
+        REGISTRY.gauge(
+            "mavlink_serial_backlog_bytes",
+            "Bytes received on the serial port but not yet read by the relay",
+            fn=lambda: self.pixhawk.port.in_waiting if self.pixhawk else 0,
+        )
+        REGISTRY.gauge(
+            "mavlink_parse_backlog_bytes",
+            "Bytes read but not yet parsed into messages",
+            fn=lambda: self.pixhawk.mav.buf_len() if self.pixhawk else 0,
+        )
+        REGISTRY.gauge(
+            "mavlink_heartbeat_age_seconds",
+            "Seconds since the last Pixhawk heartbeat",
+            fn=lambda: (
+                round(time.time() - self._last_heartbeat, 2) if self._last_heartbeat else None
+            ),
+        )
 
     def connect_pixhawk(self):
         """
@@ -136,7 +180,9 @@ class MAVLinkTCPRelay:
                     if self.pixhawk:
                         try:
                             self.pixhawk.write(data)
+                            self.tx_bytes.inc(len(data))
                         except Exception as e:
+                            self.errors.inc()
                             print(f"[FORWARD] ⚠️ Error forwarding to Pixhawk: {e}")
 
                 except socket.timeout:
@@ -176,7 +222,11 @@ class MAVLinkTCPRelay:
                             # Fallback: encode the message manually
                             msg_bytes = self.pixhawk.mav.encode(msg)
 
+                        self.rx_messages.inc()
+                        self.rx_bytes.inc(len(msg_bytes) if msg_bytes else 0)
+
                         # Send to all connected clients
+                        send_started = time.perf_counter()
                         with self.clients_lock:
                             dead_clients = []
                             for client in self.clients:
@@ -184,6 +234,7 @@ class MAVLinkTCPRelay:
                                     if msg_bytes:
                                         client.sendall(msg_bytes)
                                 except Exception as e:
+                                    self.errors.inc()
                                     print(f"[RELAY] ⚠️ Error sending to client: {e}")
                                     dead_clients.append(client)
 
@@ -194,9 +245,11 @@ class MAVLinkTCPRelay:
                                     client.close()
                                 except:
                                     pass
+                        self.send_time.observe(time.perf_counter() - send_started)
 
                         # Log heartbeats periodically
                         if msg.get_type() == "HEARTBEAT":
+                            self._last_heartbeat = time.time()
                             if not hasattr(self, "_last_hb_log"):
                                 self._last_hb_log = 0
                             if time.time() - self._last_hb_log > 5:
@@ -206,11 +259,13 @@ class MAVLinkTCPRelay:
                                 self._last_hb_log = time.time()
 
                     except Exception as e:
+                        self.errors.inc()
                         print(f"[RELAY] ⚠️ Error encoding message: {e}")
                 else:
                     time.sleep(0.01)  # Small delay to prevent CPU spinning
 
             except Exception as e:
+                self.errors.inc()
                 print(f"[RELAY] ⚠️ Relay error: {e}")
                 time.sleep(0.1)
 
@@ -343,6 +398,12 @@ def main():
     parser.add_argument(
         "--port", type=int, default=7000, help="TCP server port (default: 7000)"
     )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=MAVLINK_METRICS_PORT,
+        help=f"Metrics HTTP port, 0 to disable (default: {MAVLINK_METRICS_PORT})",
+    )
 
     args = parser.parse_args()
 
@@ -351,6 +412,8 @@ def main():
         if not check_prerequisites(args.master):
             print("\n[⚠️] Some checks failed. Continuing anyway...")
 
+        serve_metrics(args.metrics_port, args.host, name="MAVLINK")
+
         # Start relay server
         relay = MAVLinkTCPRelay(
             serial_port=args.master,
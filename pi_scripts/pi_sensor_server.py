@@ -10,6 +10,8 @@ import time
 import socket
 import sys
 
+from metrics import REGISTRY, SENSOR_METRICS_PORT, serve_metrics
+
 
 # I2C Configuration
 I2C_BUS = 1  # I2C bus number (1 is standard on Raspberry Pi)
@@ -20,6 +22,21 @@ BMP388_TEMP_REG = 0x04
 BMP388_PRESS_REG = 0x07
 BMP388_ALT_REG = 0x08
 
+# Metrics (see metrics.py)
+I2C_READ_SECONDS = {
+    reading: REGISTRY.histogram(
+        "sensor_i2c_read_seconds", "BMP388 I2C block read time", {"reading": reading}
+    )
+    for reading in ("temperature", "pressure", "altitude")
+}
+READ_ERRORS = REGISTRY.counter("sensor_read_errors_total", "Failed BMP388 reads")
+SAMPLES_SENT = REGISTRY.counter("sensor_samples_sent_total", "Samples sent to the Ground Station")
+CLIENT_CONNECTED = REGISTRY.gauge("sensor_client_connected", "1 while a Ground Station is connected")
+LAST_VALUES = {
+    name: REGISTRY.gauge(f"sensor_{name}", f"Last {name.split('_')[0]} reading")
+    for name in ("temperature_celsius", "pressure_pascal", "depth_meters")
+}
+
 
 def initialize_sensor(bus):
     """Initialize BMP388 sensor."""
@@ -34,10 +51,12 @@ def initialize_sensor(bus):
 def read_temperature(bus):
     """Read temperature from BMP388."""
     try:
-        temp_data = bus.read_i2c_block_data(BMP388_ADDR, BMP388_TEMP_REG, 2)
+        with I2C_READ_SECONDS["temperature"].time():
+            temp_data = bus.read_i2c_block_data(BMP388_ADDR, BMP388_TEMP_REG, 2)
         raw_temp = (temp_data[1] << 8) | temp_data[0]
         return raw_temp / 256.0  # Convert to Celsius
     except Exception as e:
+        READ_ERRORS.inc()
         print(f"[SENSOR] ❌ Temperature read error: {e}")
         return 0.0
 
@@ -45,10 +64,12 @@ def read_temperature(bus):
 def read_pressure(bus):
     """Read pressure from BMP388."""
     try:
-        data = bus.read_i2c_block_data(BMP388_ADDR, BMP388_PRESS_REG, 3)
+        with I2C_READ_SECONDS["pressure"].time():
+            data = bus.read_i2c_block_data(BMP388_ADDR, BMP388_PRESS_REG, 3)
         pressure_raw = data[0] | (data[1] << 8) | (data[2] << 16)
         return pressure_raw / 256.0  # Pressure in Pa
     except Exception as e:
+        READ_ERRORS.inc()
         print(f"[SENSOR] ❌ Pressure read error: {e}")
         return 0.0
 
@@ -56,10 +77,12 @@ def read_pressure(bus):
 def read_altitude(bus):
     """Read altitude/depth from BMP388."""
     try:
-        data = bus.read_i2c_block_data(BMP388_ADDR, BMP388_ALT_REG, 3)
+        with I2C_READ_SECONDS["altitude"].time():
+            data = bus.read_i2c_block_data(BMP388_ADDR, BMP388_ALT_REG, 3)
         altitude_raw = data[0] | (data[1] << 8) | (data[2] << 16)
         return altitude_raw / 100.0  # Altitude in meters
     except Exception as e:
+        READ_ERRORS.inc()
         print(f"[SENSOR] ❌ Altitude read error: {e}")
         return 0.0
 
@@ -87,6 +110,7 @@ def start_sensor_server(host="0.0.0.0", port=5002):
         try:
             conn, addr = server.accept()
             print(f"[SENSOR] ✅ Connected to {addr}")
+            CLIENT_CONNECTED.set(1)
 
             # Initialize sensor
             initialize_sensor(bus)
@@ -101,6 +125,10 @@ def start_sensor_server(host="0.0.0.0", port=5002):
                     # Format: "temperature,pressure,depth\n"
                     data_string = f"{temperature},{pressure},{depth}\n"
                     conn.sendall(data_string.encode())
+                    SAMPLES_SENT.inc()
+                    LAST_VALUES["temperature_celsius"].set(temperature)
+                    LAST_VALUES["pressure_pascal"].set(pressure)
+                    LAST_VALUES["depth_meters"].set(depth)
 
                     print(
                         f"[SENSOR] Sent: T={temperature:.2f}°C P={pressure:.2f}Pa D={depth:.2f}m"
@@ -116,6 +144,7 @@ def start_sensor_server(host="0.0.0.0", port=5002):
                     break
 
             conn.close()
+            CLIENT_CONNECTED.set(0)
             print("[SENSOR] Connection closed, waiting for new connection...")
 
         except KeyboardInterrupt:
@@ -139,12 +168,19 @@ def main():
     parser.add_argument(
         "--port", type=int, default=5002, help="TCP port (default: 5002)"
     )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=SENSOR_METRICS_PORT,
+        help=f"Metrics HTTP port, 0 to disable (default: {SENSOR_METRICS_PORT})",
+    )
 
     args = parser.parse_args()
 
     print("=" * 60)
     print("BMP388 SENSOR SERVER - UIU MARINER")
     print("=" * 60)
+    serve_metrics(args.metrics_port, args.host, name="SENSOR")
 
     try:
         start_sensor_server(host=args.host, port=args.port)
@@ -45,33 +45,18 @@ else
     fi
 fi
 
-# Start Camera 0 (MJPEG HTTP Server)
+# Start Cameras (one MJPEG HTTP process for all cameras)
 echo ""
-echo "3️⃣  Starting Camera 0 MJPEG Server..."
-if screen -list | grep -q "cam0"; then
-    echo "   ⚠️  Camera 0 already running"
+echo "3️⃣  Starting Camera Service (cameras 0 and 1)..."
+if screen -list | grep -qE "cameras|cam0|cam1"; then
+    echo "   ⚠️  Camera service already running"
 else
-    screen -dmS cam0 python3 "$SCRIPT_DIR/pi_camera_server.py" 0 8080
+    screen -dmS cameras python3 "$SCRIPT_DIR/pi_camera_service.py" --camera 0:8080 --camera 1:8081
     sleep 1
-    if screen -list | grep -q "cam0"; then
-        echo "   ✅ Camera 0 started (HTTP port 8080)"
+    if screen -list | grep -q "cameras"; then
+        echo "   ✅ Camera service started (HTTP ports 8080, 8081)"
     else
-        echo "   ❌ Failed to start camera 0"
-    fi
-fi
-
-# Start Camera 1 (MJPEG HTTP Server)
-echo ""
-echo "4️⃣  Starting Camera 1 MJPEG Server..."
-if screen -list | grep -q "cam1"; then
-    echo "   ⚠️  Camera 1 already running"
-else
-    screen -dmS cam1 python3 "$SCRIPT_DIR/pi_camera_server.py" 1 8081
-    sleep 1
-    if screen -list | grep -q "cam1"; then
-        echo "   ✅ Camera 1 started (HTTP port 8081)"
-    else
-        echo "   ❌ Failed to start camera 1"
+        echo "   ❌ Failed to start camera service"
     fi
 fi
 
@@ -82,17 +67,18 @@ echo "✅ Service Startup Complete!"
 echo "========================================"
 echo ""
 echo "📊 Running Services:"
-screen -ls | grep -E "sensors|mavproxy|cam0|cam1" || echo "   ⚠️  No services running"
+screen -ls | grep -E "sensors|mavproxy|cameras" || echo "   ⚠️  No services running"
 
 echo ""
 echo "💡 Useful Commands:"
 echo "   View all services:    screen -ls"
 echo "   View sensor logs:     screen -r sensors"
 echo "   View MAVProxy logs:   screen -r mavproxy"
-echo "   View camera 0 logs:   screen -r cam0"
-echo "   View camera 1 logs:   screen -r cam1"
+echo "   View camera logs:     screen -r cameras"
+echo "   Restart one camera:   curl -X POST http://localhost:8081/restart"
 echo "   Detach from screen:   Ctrl+A then D"
 echo "   Stop all services:    ./stop_all_services.sh"
+echo "   Service metrics:      curl http://localhost:9101/metrics  (9102 sensors, 9103 MAVLink)"
 echo ""
 echo "� Camera Streams:"
 echo "   Camera 0: http://$(hostname -I | awk '{print $1}'):8080/video_feed"
@@ -1,5 +1,5 @@
 #!/bin/bash
-# Start both camera servers on Raspberry Pi
+# Start both cameras on Raspberry Pi (one camera service process)
 # Camera 0 on port 8080, Camera 1 on port 8081
 
 echo "=========================================="
@@ -8,33 +8,23 @@ echo "=========================================="
 
 # Kill any existing camera processes
 echo "Stopping any existing camera servers..."
-pkill -f "pi_camera_server.py"
+pkill -f "pi_camera_server.py|pi_camera_service.py"
 sleep 1
 
-# Start Camera 0 on port 8080
-echo "Starting Camera 0 on port 8080..."
-python3 /home/pi/mariner/pi_scripts/pi_camera_server.py 0 8080 > /tmp/camera0.log 2>&1 &
-CAM0_PID=$!
-echo "Camera 0 PID: $CAM0_PID"
-
-# Wait a bit before starting second camera
-sleep 2
-
-# Start Camera 1 on port 8081
-echo "Starting Camera 1 on port 8081..."
-python3 /home/pi/mariner/pi_scripts/pi_camera_server.py 1 8081 > /tmp/camera1.log 2>&1 &
-CAM1_PID=$!
-echo "Camera 1 PID: $CAM1_PID"
+# Start both cameras in one process (ports 8080 and 8081)
+echo "Starting camera service on ports 8080 and 8081..."
+python3 /home/pi/mariner/pi_scripts/pi_camera_service.py --camera 0:8080 --camera 1:8081 > /tmp/cameras.log 2>&1 &
+CAMERAS_PID=$!
+echo "Camera service PID: $CAMERAS_PID"
 
 echo ""
 echo "=========================================="
-echo "Camera servers started!"
+echo "Camera service started!"
 echo "Camera 0: http://$(hostname -I | awk '{print $1}'):8080/video_feed"
 echo "Camera 1: http://$(hostname -I | awk '{print $1}'):8081/video_feed"
 echo "=========================================="
 echo ""
-echo "Logs:"
-echo "  Camera 0: tail -f /tmp/camera0.log"
-echo "  Camera 1: tail -f /tmp/camera1.log"
+echo "Logs: tail -f /tmp/cameras.log"
 echo ""
-echo "To stop: pkill -f pi_camera_server.py"
+echo "To restart one camera: curl -X POST http://localhost:8081/restart"
+echo "To stop: pkill -f pi_camera_service.py"
@@ -7,40 +7,33 @@
 echo "🛑 Stopping UIU MARINER ROV Services..."
 echo "========================================"
 
-# Stop Camera 1
-if screen -list | grep -q "cam1"; then
-    echo "1️⃣  Stopping Camera 1..."
-    screen -X -S cam1 quit
-    echo "   ✅ Camera 1 stopped"
+# Stop Cameras (also sessions from the old one-process-per-camera setup)
+if screen -list | grep -qE "cameras|cam0|cam1"; then
+    echo "1️⃣  Stopping Camera Service..."
+    for session in cameras cam0 cam1; do
+        screen -list | grep -q "$session" && screen -X -S "$session" quit
+    done
+    echo "   ✅ Camera Service stopped"
 else
-    echo "1️⃣  Camera 1 not running"
-fi
-
-# Stop Camera 0
-if screen -list | grep -q "cam0"; then
-    echo "2️⃣  Stopping Camera 0..."
-    screen -X -S cam0 quit
-    echo "   ✅ Camera 0 stopped"
-else
-    echo "2️⃣  Camera 0 not running"
+    echo "1️⃣  Camera Service not running"
 fi
 
 # Stop MAVProxy
 if screen -list | grep -q "mavproxy"; then
-    echo "3️⃣  Stopping MAVProxy..."
+    echo "2️⃣  Stopping MAVProxy..."
     screen -X -S mavproxy quit
     echo "   ✅ MAVProxy stopped"
 else
-    echo "3️⃣  MAVProxy not running"
+    echo "2️⃣  MAVProxy not running"
 fi
 
 # Stop Sensor Server
 if screen -list | grep -q "sensors"; then
-    echo "4️⃣  Stopping Sensor Server..."
+    echo "3️⃣  Stopping Sensor Server..."
     screen -X -S sensors quit
     echo "   ✅ Sensor Server stopped"
 else
-    echo "4️⃣  Sensor Server not running"
+    echo "3️⃣  Sensor Server not running"
 fi
 
 # Wait a moment for processes to clean up
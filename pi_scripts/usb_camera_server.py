@@ -39,6 +39,7 @@ def start_usb_camera_stream(
     print(f"Destination: {ground_station_ip}:{port}")
     print(f"Resolution: {width}x{height}@{framerate}fps")
     print(f"Payload: {payload}")
+    print(f"Ground station stream URL: rtp://@:{port}?payload={payload}")
     print("=" * 60)
     print()
 
@@ -1,6 +1,6 @@
 """
 Simple Camera Integration with Object Detection
-Draws rectangle boxes around detected objects
+Finds objects and returns rectangle boxes as overlay data for the view layer
 """
 
 import cv2
@@ -11,7 +11,7 @@ from PyQt6.QtCore import QObject, pyqtSignal
 class CameraDetector(QObject):
     """
     Simple detector that processes camera frames
-    Detects objects and draws rectangle boxes
+    Detects objects and returns rectangle boxes (painted by the view layer)
     """
 
     detection_stats = pyqtSignal(dict)
@@ -37,17 +37,18 @@ class CameraDetector(QObject):
 
         print(f"[CV] Camera {camera_id} detector initialized")
 
-    def process_frame(self, frame):
-        """Process frame and return annotated frame with rectangles"""
+    def analyze(self, frame):
+        """
+        Run detection and return structured overlay data (frame is not modified)
+        Returns:
+            dict with mode, count, status text/colour and boxes in frame
+            coordinates, or None if frame is None
+        """
         if frame is None:
-            return frame
-        
+            return None
+
         if not self.enabled:
-            # Still draw status to show detection is disabled
-            output = frame.copy()
-            cv2.putText(output, "DETECTION: OFF", (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (128, 128, 128), 2)
-            return output
+            return self._overlay("off", [], "DETECTION: OFF", "#808080")
 
         try:
             if self.mode == "contour":
@@ -59,15 +60,23 @@ class CameraDetector(QObject):
             elif self.mode == "edge":
                 return self._detect_edges(frame)
             else:
-                return frame
+                return None
         except Exception as e:
             print(f"[CV] Error: {e}")
-            return frame
+            return None
+
+    def _overlay(self, mode, boxes, status, color):
+        """Build the overlay dict shared by all detection modes"""
+        return {
+            "mode": mode,
+            "count": len(boxes),
+            "boxes": boxes,
+            "status": status,
+            "status_color": color,
+        }
 
     def _detect_contours(self, frame):
-        """Detect objects by contour and draw rectangle boxes"""
-        output = frame.copy()
-        
+        """Detect objects by contour and return rectangle boxes"""
         # Convert to grayscale
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
@@ -80,35 +89,27 @@ class CameraDetector(QObject):
         # Find contours
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-        count = 0
+        boxes = []
         for contour in contours:
             area = cv2.contourArea(contour)
             if area > self.min_area:
-                # Get bounding rectangle
+                # Get bounding rectangle (green box with centre point)
                 x, y, w, h = cv2.boundingRect(contour)
-                
-                # Draw rectangle box (green)
-                cv2.rectangle(output, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                
-                # Draw center point
-                cx, cy = x + w // 2, y + h // 2
-                cv2.circle(output, (cx, cy), 4, (0, 0, 255), -1)
-                
-                # Label
-                label = f"Obj {count + 1}"
-                cv2.putText(output, label, (x, y - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-                count += 1
-
-        # Status overlay
-        cv2.putText(output, f"OBJECT DETECTION: {count} objects", (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-
+                boxes.append({
+                    "rect": (x, y, w, h),
+                    "label": f"Obj {len(boxes) + 1}",
+                    "color": "#00ff00",
+                    "center": True,
+                })
+
+        count = len(boxes)
         self.detection_stats.emit({"mode": "contour", "count": count})
-        return output
+        return self._overlay(
+            "contour", boxes, f"OBJECT DETECTION: {count} objects", "#00ff00"
+        )
 
     def _detect_color(self, frame):
-        """Detect colored objects and draw rectangle boxes"""
-        output = frame.copy()
+        """Detect colored objects and return rectangle boxes"""
         hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
         mask = cv2.inRange(hsv, self.color_lower, self.color_upper)
 
@@ -120,38 +121,33 @@ class CameraDetector(QObject):
         # Find contours
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-        count = 0
+        boxes = []
         for contour in contours:
             area = cv2.contourArea(contour)
             if area > self.min_area:
+                # Cyan box with centre point for color mode
                 x, y, w, h = cv2.boundingRect(contour)
-                
-                # Draw rectangle box (cyan for color mode)
-                cv2.rectangle(output, (x, y), (x + w, y + h), (255, 255, 0), 2)
-                
-                # Center point
-                cx, cy = x + w // 2, y + h // 2
-                cv2.circle(output, (cx, cy), 4, (0, 0, 255), -1)
-                
-                label = f"Color {count + 1}"
-                cv2.putText(output, label, (x, y - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
-                count += 1
-
-        cv2.putText(output, f"COLOR DETECTION: {count} objects", (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-
+                boxes.append({
+                    "rect": (x, y, w, h),
+                    "label": f"Color {len(boxes) + 1}",
+                    "color": "#00ffff",
+                    "center": True,
+                })
+
+        count = len(boxes)
         self.detection_stats.emit({"mode": "color", "count": count})
-        return output
+        return self._overlay(
+            "color", boxes, f"COLOR DETECTION: {count} objects", "#00ffff"
+        )
 
     def _detect_motion(self, frame):
-        """Detect motion and draw rectangle boxes"""
-        output = frame.copy()
+        """Detect motion and return rectangle boxes"""
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         gray = cv2.GaussianBlur(gray, (21, 21), 0)
 
-        if self.prev_frame is None:
+        if self.prev_frame is None or self.prev_frame.shape != gray.shape:
             self.prev_frame = gray
-            return output
+            return self._overlay("motion", [], "MOTION DETECTION: 0 areas", "#ffff00")
 
         frame_diff = cv2.absdiff(self.prev_frame, gray)
         thresh = cv2.threshold(frame_diff, self.motion_threshold, 255, cv2.THRESH_BINARY)[1]
@@ -159,29 +155,28 @@ class CameraDetector(QObject):
 
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-        count = 0
+        boxes = []
         for contour in contours:
             if cv2.contourArea(contour) > 1000:
+                # Yellow box for motion
                 x, y, w, h = cv2.boundingRect(contour)
-                
-                # Draw rectangle box (yellow for motion)
-                cv2.rectangle(output, (x, y), (x + w, y + h), (0, 255, 255), 2)
-                
-                label = f"Motion {count + 1}"
-                cv2.putText(output, label, (x, y - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-                count += 1
+                boxes.append({
+                    "rect": (x, y, w, h),
+                    "label": f"Motion {len(boxes) + 1}",
+                    "color": "#ffff00",
+                    "center": False,
+                })
 
         self.prev_frame = gray
 
-        cv2.putText(output, f"MOTION DETECTION: {count} areas", (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-
+        count = len(boxes)
         self.detection_stats.emit({"mode": "motion", "count": count})
-        return output
+        return self._overlay(
+            "motion", boxes, f"MOTION DETECTION: {count} areas", "#ffff00"
+        )
 
     def _detect_edges(self, frame):
         """Edge detection with contour rectangles"""
-        output = frame.copy()
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
         # Canny edge detection
@@ -190,20 +185,23 @@ class CameraDetector(QObject):
         # Find contours from edges
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        count = 0
+        boxes = []
         for contour in contours:
             if cv2.contourArea(contour) > self.min_area:
+                # Magenta box for edges
                 x, y, w, h = cv2.boundingRect(contour)
-                
-                # Draw rectangle box (magenta for edges)
-                cv2.rectangle(output, (x, y), (x + w, y + h), (255, 0, 255), 2)
-                count += 1
-
-        cv2.putText(output, f"EDGE DETECTION: {count} shapes", (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
-
+                boxes.append({
+                    "rect": (x, y, w, h),
+                    "label": None,
+                    "color": "#ff00ff",
+                    "center": False,
+                })
+
+        count = len(boxes)
         self.detection_stats.emit({"mode": "edge", "count": count})
-        return output
+        return self._overlay(
+            "edge", boxes, f"EDGE DETECTION: {count} shapes", "#ff00ff"
+        )
 
     def set_mode(self, mode):
         """Set detection mode: contour, color, motion, edge"""
@@ -245,3 +243,4 @@ class CameraDetector(QObject):
         """Disable detection"""
         self.enabled = False
         print("[CV] Detection disabled")
+
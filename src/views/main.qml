@@ -251,6 +251,10 @@ ApplicationWindow {
                                         cache: false
                                         asynchronous: true
                                         
+                                        // Workers resample frames to this size
+                                        onWidthChanged: if (index === 0) backend.setCameraViewSize("thumbnail", width, height)
+                                        onHeightChanged: if (index === 0) backend.setCameraViewSize("thumbnail", width, height)
+                                        
                                         // Refresh preview when frame updates
                                         Connections {
                                             target: backend
@@ -776,6 +780,10 @@ ApplicationWindow {
                                             cache: false
                                             asynchronous: true
                                             
+                                            // The active camera's worker resamples frames to this size
+                                            onWidthChanged: backend.setCameraViewSize("feed", width, height)
+                                            onHeightChanged: backend.setCameraViewSize("feed", width, height)
+                                            
                                             // Refresh image when camera frame updates
                                             Connections {
                                                 target: backend
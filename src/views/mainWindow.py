@@ -10,12 +10,13 @@ import json
 import time
 from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton, QWidget
 from PyQt6.QtCore import QTimer, Qt, pyqtSlot
-from PyQt6.QtGui import QPixmap, QFont
+from PyQt6.QtGui import QPixmap, QImage, QFont
 from PyQt6 import uic
 
 # --- Import all required classes for logic connection ---
 from ..computer_vision.camera_detector import CameraDetector
 from .workers.sensorWorker import SensorTelemetryWorker
+from .workers.hudOverlay import paint_hud_overlay
 from ..services.mavlinkConnection import PixhawkConnection
 from ..joystickController import JoystickController
 
@@ -45,6 +46,7 @@ class MarinerROVControl(QMainWindow):
         self.pixhawk = None
         self.joystick = None
         self.camera_manager = None
+        self._camera_overlays = {}
         self.sensor_worker = None
         self.media_manager = None
 
@@ -78,6 +80,8 @@ class MarinerROVControl(QMainWindow):
         # Delay import of MediaManager until here
         from .workers.mediaManager import MediaManager
         self.media_manager = MediaManager()
+        self.media_manager.snapshot_saved.connect(self._on_snapshot_saved)
+        self.media_manager.snapshot_failed.connect(self._on_snapshot_failed)
 
         # Start control loop - ArduSub requires MANUAL_CONTROL at high rate
         # Must be at least 10Hz (100ms), ideally 20Hz (50ms) for smooth control
@@ -108,6 +112,7 @@ class MarinerROVControl(QMainWindow):
             "camera": {
                 "stream_url0": "http://raspberrypi.local:8080/video_feed",
                 "stream_url1": "http://raspberrypi.local:8081/video_feed",
+                "preview_decode_scale": 4,
             },
             "sensors": {
                 "host": "raspberrypi.local",
@@ -611,40 +616,45 @@ class MarinerROVControl(QMainWindow):
             print(f"[UI] Connection setup error: {e}")
 
     def start_camera_feeds(self):
-        """Start dual camera feeds with object detection via MJPEG streams."""
+        """Start camera feeds with object detection via MJPEG streams."""
         try:
             # Delay heavy imports until needed
-            from .workers.cameraWorker import DualCameraManager
-
-            # Get MJPEG stream URLs from config
-            stream_url0 = self.config["camera"].get(
-                "stream_url0", "http://raspberrypi.local:8080/video_feed"
-            )
-            stream_url1 = self.config["camera"].get(
-                "stream_url1", "http://raspberrypi.local:8081/video_feed"
+            from .workers.cameraManager import CameraManager, stream_configs
+
+            # This window has a main and a small view, so only the first two
+            # configured streams are started
+            streams = stream_configs(self.config["camera"])[:2]
+            for camera_id, stream in enumerate(streams):
+                print(f"[CAMERAS] Camera {camera_id} ({stream['name']}) URL: {stream['url']}")
+
+            self.camera_manager = CameraManager(
+                streams,
+                max_parallel_decodes=self.config["camera"].get("max_parallel_decodes"),
+                max_parallel_processing=self.config["camera"].get(
+                    "max_parallel_processing"
+                ),
+                use_processes=self.config["camera"].get("process_mode", False),
             )
 
-            print(f"[CAMERAS] Camera 0 URL: {stream_url0}")
-            print(f"[CAMERAS] Camera 1 URL: {stream_url1}")
+            main_camera = self.camera_manager.get_camera(0)
+            small_camera = self.camera_manager.get_camera(1)
 
-            self.camera_manager = DualCameraManager(stream_url0, stream_url1)
+            if main_camera is not None:
+                # Connect camera 0 (port 8080) to MAIN display
+                main_camera.frame_ready.connect(self.update_camera_main)
+                main_camera.overlay_ready.connect(self.update_camera_overlay)
+                main_camera.error_occurred.connect(self.handle_camera_error)
+                main_camera.status_update.connect(self.update_camera_status_main)
 
-            # Connect camera 0 (port 8080) to MAIN display
-            self.camera_manager.camera0.frame_ready.connect(self.update_camera_main)
-            self.camera_manager.camera0.error_occurred.connect(self.handle_camera_error)
-            self.camera_manager.camera0.status_update.connect(
-                self.update_camera_status_main
-            )
-
-            # Connect camera 1 (port 8081) to CAM2 display
-            self.camera_manager.camera1.frame_ready.connect(self.update_camera_small)
-            self.camera_manager.camera1.error_occurred.connect(self.handle_camera_error)
-            self.camera_manager.camera1.status_update.connect(
-                self.update_camera_status_cam2
-            )
+            if small_camera is not None:
+                # Connect camera 1 (port 8081) to CAM2 display
+                small_camera.frame_ready.connect(self.update_camera_small)
+                small_camera.overlay_ready.connect(self.update_camera_overlay)
+                small_camera.error_occurred.connect(self.handle_camera_error)
+                small_camera.status_update.connect(self.update_camera_status_cam2)
 
             self.camera_manager.start_all()
-            print("[CAMERAS] [OK] Dual MJPEG camera feeds started")
+            print(f"[CAMERAS] [OK] {len(self.camera_manager)} MJPEG camera feeds started")
 
             # Setup object detection after a small delay to ensure cameras are ready
             print("[CAMERAS] Scheduling object detection setup...")
@@ -655,58 +665,38 @@ class MarinerROVControl(QMainWindow):
             traceback.print_exc()
 
     def setup_object_detection(self):
-        """Setup object detection for both cameras."""
+        """Setup object detection for every camera."""
         try:
             print("[DETECTION] Initializing object detection...")
+            if not self.camera_manager:
+                return
 
-            # Create detector for camera 0 (main camera)
-            self.detector0 = CameraDetector(camera_id=0)
-            self.detector0.set_mode("contour")  # Default: contour detection
-            self.detector0.enable()  # Enable detection on the detector object itself
-            print(
-                f"[DETECTION] Camera 0 detector created - Mode: {self.detector0.mode}, Enabled: {self.detector0.enabled}"
-            )
-
-            # Create detector for camera 1 (secondary camera)
-            self.detector1 = CameraDetector(camera_id=1)
-            self.detector1.set_mode("contour")  # Default: contour detection
-            self.detector1.enable()  # Enable detection on the detector object itself
-            print(
-                f"[DETECTION] Camera 1 detector created - Mode: {self.detector1.mode}, Enabled: {self.detector1.enabled}"
-            )
-
-            # Attach detectors to camera workers
-            if self.camera_manager:
-                self.camera_manager.camera0.set_detector(self.detector0)
-                self.camera_manager.camera1.set_detector(self.detector1)
-
-                # Enable detection on camera workers
-                self.camera_manager.camera0.enable_detection()
-                self.camera_manager.camera1.enable_detection()
+            self.detectors = []
+            for camera_id, camera in enumerate(self.camera_manager.cameras):
+                detector = CameraDetector(camera_id=camera_id)
+                detector.set_mode("contour")  # Default: contour detection
+                detector.enable()  # Enable detection on the detector object itself
+                self.detectors.append(detector)
 
-                print("[DETECTION] ✅ Object detection ACTIVE on both cameras")
+                # Attach detector to the camera worker and enable it there too
+                camera.set_detector(detector)
+                camera.enable_detection()
                 print(
-                    f"[DETECTION] Camera 0: worker_enabled={self.camera_manager.camera0.detection_enabled}, detector_enabled={self.detector0.enabled}"
+                    f"[DETECTION] Camera {camera_id}: worker_enabled={camera.detection_enabled}, detector_enabled={detector.enabled}"
                 )
-                print(
-                    f"[DETECTION] Camera 1: worker_enabled={self.camera_manager.camera1.detection_enabled}, detector_enabled={self.detector1.enabled}"
-                )
-                print("[DETECTION] Mode: Contour Detection (Rectangle Boxes)")
+
+            print("[DETECTION] ✅ Object detection ACTIVE on all cameras")
+            print("[DETECTION] Mode: Contour Detection (Rectangle Boxes)")
         except Exception as e:
             print(f"[DETECTION] [ERR] Failed to setup: {e}")
 
     def toggle_detection(self):
         """Toggle object detection on/off."""
         try:
-            if self.camera_manager:
-                if self.camera_manager.camera0.detection_enabled:
-                    self.camera_manager.camera0.disable_detection()
-                    self.camera_manager.camera1.disable_detection()
-                    print("[DETECTION] Disabled")
-                else:
-                    self.camera_manager.camera0.enable_detection()
-                    self.camera_manager.camera1.enable_detection()
-                    print("[DETECTION] Enabled")
+            if self.camera_manager and self.camera_manager.cameras:
+                enabled = not self.camera_manager.cameras[0].detection_enabled
+                self.camera_manager.toggle_all_detection(enabled)
+                print(f"[DETECTION] {'Enabled' if enabled else 'Disabled'}")
         except Exception as e:
             print(f"[DETECTION] Toggle error: {e}")
 
@@ -715,7 +705,7 @@ class MarinerROVControl(QMainWindow):
         try:
             if self.camera_manager:
                 self.camera_manager.zoom_in_all()
-                zoom_level = self.camera_manager.camera0.zoom_level
+                zoom_level = self.camera_manager.cameras[0].zoom_level
                 print(f"[ZOOM] Zoomed in to {zoom_level:.2f}x")
         except Exception as e:
             print(f"[ZOOM] Error: {e}")
@@ -725,7 +715,7 @@ class MarinerROVControl(QMainWindow):
         try:
             if self.camera_manager:
                 self.camera_manager.zoom_out_all()
-                zoom_level = self.camera_manager.camera0.zoom_level
+                zoom_level = self.camera_manager.cameras[0].zoom_level
                 print(f"[ZOOM] Zoomed out to {zoom_level:.2f}x")
         except Exception as e:
             print(f"[ZOOM] Error: {e}")
@@ -855,29 +845,54 @@ class MarinerROVControl(QMainWindow):
                 value_html = "<html><head/><body><p><span style=\" font-family:'Consolas'; font-size:11pt; font-weight:600; color:#ff5555;\">OFFLINE</span></p></body></html>"
                 self.ui.lblJoystickValue.setText(value_html)
 
-    @pyqtSlot(QPixmap)
-    def update_camera_small(self, pixmap):
-        """Update small camera display."""
-        if hasattr(self, "lblCameraSmall") and self.lblCameraSmall:
-            self.lblCameraSmall.setPixmap(
-                pixmap.scaled(
-                    self.lblCameraSmall.size(),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
+    def _image_to_pixmap(self, image):
+        """Convert a worker QImage to a pixmap on the GUI thread and release its buffer."""
+        pixmap = QPixmap.fromImage(image)
+        worker = self.sender()
+        if worker is not None and hasattr(worker, "frame_consumed"):
+            worker.frame_consumed()
+        return pixmap
+
+    def _show_camera_frame(self, label, image):
+        """Show a worker frame on a label and keep the worker's display size in sync."""
+        pixmap = self._image_to_pixmap(image)
+        if not label:
+            return
+
+        # The worker resamples to this size, so no GUI-thread scaling is needed
+        worker = self.sender()
+        size = label.size()
+        if worker is not None and hasattr(worker, "set_display_size"):
+            if worker.get_display_size() != (size.width(), size.height()):
+                worker.set_display_size(size.width(), size.height())
+
+        if pixmap.width() > size.width() or pixmap.height() > size.height():
+            # Label shrank since the frame was produced - cheap fit until the
+            # worker catches up with the new size
+            pixmap = pixmap.scaled(
+                size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.FastTransformation,
             )
 
-    @pyqtSlot(QPixmap)
-    def update_camera_main(self, pixmap):
+        # HUD is painted here at display resolution, never burned into frames
+        paint_hud_overlay(pixmap, self._camera_overlays.get(worker))
+        label.setPixmap(pixmap)
+
+    @pyqtSlot(dict)
+    def update_camera_overlay(self, overlay):
+        """Store the HUD data that goes with the sender's next frame."""
+        self._camera_overlays[self.sender()] = overlay
+
+    @pyqtSlot(QImage)
+    def update_camera_small(self, image):
+        """Update small camera display."""
+        self._show_camera_frame(getattr(self, "lblCameraSmall", None), image)
+
+    @pyqtSlot(QImage)
+    def update_camera_main(self, image):
         """Update main camera display."""
-        if hasattr(self, "lblCameraMain") and self.lblCameraMain:
-            self.lblCameraMain.setPixmap(
-                pixmap.scaled(
-                    self.lblCameraMain.size(),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-            )
+        self._show_camera_frame(getattr(self, "lblCameraMain", None), image)
 
     @pyqtSlot(str)
     def update_camera_status_main(self, status):
@@ -1396,36 +1411,36 @@ class MarinerROVControl(QMainWindow):
         print("[CAMERAS] [OK] Camera feeds restarted")
 
     def capture_image(self):
-        """Capture image from main camera (port 8080)."""
+        """Capture a full-resolution still from the main camera (port 8080)."""
         if not self.camera_manager:
             print("[MEDIA] [ERR] Camera manager not initialized")
             return
 
         try:
-            # Use camera0 (port 8080) - the main camera feed
-            camera = self.camera_manager.camera0
-            frame = camera.get_frame()
+            # Use camera 0 (port 8080) - the main camera feed. The still is
+            # fetched from the Pi in the background (see _on_snapshot_saved).
+            camera = self.camera_manager.get_camera(0)
+            self.media_manager.capture_snapshot(
+                camera.stream_url, camera_id=0, fallback=camera.get_frame
+            )
+        except Exception as e:
+            print(f"[MEDIA] [ERR] Capture failed: {e}")
 
-            if frame is not None:
-                filepath = self.media_manager.capture_image(frame, camera_id=0)
-                if filepath:
-                    from PyQt6.QtWidgets import QMessageBox
+    def _on_snapshot_saved(self, filepath):
+        from PyQt6.QtWidgets import QMessageBox
 
-                    QMessageBox.information(
-                        self, "Capture Complete", f"Image saved to:\n{filepath}"
-                    )
-                    print(f"[MEDIA] [OK] Image captured: {filepath}")
-            else:
-                print("[MEDIA]  No frame available for capture")
-                from PyQt6.QtWidgets import QMessageBox
+        print(f"[MEDIA] [OK] Image captured: {filepath}")
+        QMessageBox.information(self, "Capture Complete", f"Image saved to:\n{filepath}")
 
-                QMessageBox.warning(
-                    self,
-                    "Capture Failed",
-                    "No camera frame available.\nPlease ensure camera is connected.",
-                )
-        except Exception as e:
-            print(f"[MEDIA] [ERR] Capture failed: {e}")
+    def _on_snapshot_failed(self, error):
+        from PyQt6.QtWidgets import QMessageBox
+
+        print(f"[MEDIA]  Capture failed: {error}")
+        QMessageBox.warning(
+            self,
+            "Capture Failed",
+            f"{error}\nPlease ensure camera is connected.",
+        )
 
     def toggle_recording(self):
         """Toggle video recording on/off from main camera (port 8080)."""
@@ -1439,8 +1454,8 @@ class MarinerROVControl(QMainWindow):
                 self.stop_recording()
                 return
 
-            # Use camera0 (port 8080) - the main camera feed
-            camera = self.camera_manager.camera0
+            # Use camera 0 (port 8080) - the main camera feed
+            camera = self.camera_manager.get_camera(0)
             frame = camera.get_frame()
 
             if frame is None:
@@ -1454,10 +1469,15 @@ class MarinerROVControl(QMainWindow):
                 )
                 return
 
-            # Get frame dimensions
-            height, width = frame.shape[:2]
-
-            if self.media_manager.start_recording(width, height, 30, camera_id=0):
+            # Record the full-resolution stream. The worker may still be on
+            # the preview stream, so the first full frame sets the video size.
+            # Only while recording does the worker keep full-resolution frames
+            camera.set_full_stream(True)
+            camera.set_keep_full_frame(True)
+            if not self.media_manager.start_recording(None, None, 30, camera_id=0):
+                camera.set_keep_full_frame(False)
+                camera.set_full_stream(False)
+            else:
                 # Update button states
                 if hasattr(self, "btnStartRecording"):
                     self.btnStartRecording.setText("⏹ STOP")
@@ -1500,6 +1520,10 @@ class MarinerROVControl(QMainWindow):
                 self.recording_timer = None
 
             filepath = self.media_manager.stop_recording()
+            camera = self.camera_manager.get_camera(0) if self.camera_manager else None
+            if camera is not None:
+                camera.set_keep_full_frame(False)
+                camera.set_full_stream(False)
 
             # Restore button appearance
             if hasattr(self, "btnStartRecording"):
@@ -2074,11 +2098,14 @@ class MarinerROVControl(QMainWindow):
             return
 
         try:
-            # Use camera0 (port 8080) - the main camera feed
-            camera = self.camera_manager.camera0
-            frame = camera.get_frame()
-            if frame is not None:
-                self.media_manager.write_frame(frame)
+            # Use camera 0 (port 8080) - the main camera feed
+            camera = self.camera_manager.get_camera(0)
+            envelope = camera.get_frame_envelope()
+            # Preview-stream frames until the worker has switched over
+            if envelope is not None and envelope.stream == "main":
+                self.media_manager.write_frame(
+                    envelope.image, envelope.source_time(camera.clock_offset)
+                )
         except Exception as e:
             print(f"[MEDIA] [ERR] Failed to write frame: {e}")
 
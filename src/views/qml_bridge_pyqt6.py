@@ -44,26 +44,22 @@ try:
     # Import workers directly to avoid mainWindow
     import importlib.util
     
-    # Load camera worker
-    camera_worker_path = Path(__file__).parent / "workers" / "cameraWorker.py"
-    spec = importlib.util.spec_from_file_location("cameraWorker", camera_worker_path)
-    camera_worker_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(camera_worker_module)
-    CameraWorker = camera_worker_module.CameraWorker
-    
-    # Load sensor worker
-    sensor_worker_path = Path(__file__).parent / "workers" / "sensorWorker.py"
-    spec = importlib.util.spec_from_file_location("sensorWorker", sensor_worker_path)
-    sensor_worker_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(sensor_worker_module)
-    SensorTelemetryWorker = sensor_worker_module.SensorTelemetryWorker
-    
-    # Load media manager
-    media_manager_path = Path(__file__).parent / "workers" / "mediaManager.py"
-    spec = importlib.util.spec_from_file_location("mediaManager", media_manager_path)
-    media_manager_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(media_manager_module)
-    MediaManager = media_manager_module.MediaManager
+    # Load the workers package on its own (src.views would import mainWindow);
+    # the worker modules use relative imports, so they need a parent package
+    workers_path = Path(__file__).parent / "workers"
+    spec = importlib.util.spec_from_file_location(
+        "workers", workers_path / "__init__.py",
+        submodule_search_locations=[str(workers_path)]
+    )
+    workers_module = importlib.util.module_from_spec(spec)
+    sys.modules["workers"] = workers_module
+    spec.loader.exec_module(workers_module)
+    
+    from workers.cameraWorker import CameraWorker
+    from workers.cameraManager import CameraManager
+    from workers.hudOverlay import paint_hud_overlay
+    from workers.sensorWorker import SensorTelemetryWorker
+    from workers.mediaManager import MediaManager
     
 except Exception as e:
     print(f"[Import Error] {e}")
@@ -85,6 +81,15 @@ except Exception as e:
     class JoystickController:
         def __init__(self, *args, **kwargs):
             pass
+    class CameraManager:
+        def __init__(self, *args, **kwargs):
+            self.cameras = []
+            self.names = []
+        @classmethod
+        def from_config(cls, *args, **kwargs):
+            return cls()
+    def paint_hud_overlay(pixmap, overlay):
+        return pixmap
     class CameraDetector:
         def __init__(self, *args, **kwargs):
             pass
@@ -181,8 +186,13 @@ class ROVBackend(QObject):
         self.joystick = None
         self.sensor_worker = None
         self.media_manager = None
+        self._recording_worker = None  # Holds the full stream while recording
+        self.camera_manager = None
         self.camera_workers = []
         self.camera_providers = []
+        self.camera_overlays = {}
+        # QML item sizes the workers resample to (0 = not laid out yet)
+        self._camera_view_sizes = {"feed": (0, 0), "thumbnail": (0, 0)}
         
         # Control loop timer
         self.control_timer = QTimer()
@@ -372,11 +382,28 @@ class ROVBackend(QObject):
     def setActiveCamera(self, value):
         if self._active_camera != value:
             self._active_camera = value
+            # Only the active camera needs full-resolution decoding
+            if self.camera_manager:
+                self.camera_manager.set_main_camera(value)
+            self._apply_camera_display_sizes()
             self.activeCameraChanged.emit(value)
             print(f"[ROV] Active camera: {value}")
     
     activeCamera = Property(int, getActiveCamera, setActiveCamera, notify=activeCameraChanged)
     
+    @Slot(str, int, int)
+    def setCameraViewSize(self, view, width, height):
+        """QML reports the size of the main feed ("feed") or a thumbnail ("thumbnail")"""
+        if self._camera_view_sizes.get(view) != (width, height):
+            self._camera_view_sizes[view] = (width, height)
+            self._apply_camera_display_sizes()
+    
+    def _apply_camera_display_sizes(self):
+        """The active camera is resampled to the main feed size, the others to thumbnails"""
+        for camera_id, worker in enumerate(self.camera_workers):
+            view = "feed" if camera_id == self._active_camera else "thumbnail"
+            worker.set_display_size(*self._camera_view_sizes[view])
+    
     def getIsRecording(self):
         return self._is_recording
     
@@ -425,35 +452,28 @@ class ROVBackend(QObject):
         try:
             print("[Cameras] Initializing camera streams...")
             
-            # Create detectors for object detection
-            self.detector0 = CameraDetector(camera_id=0)
-            self.detector0.set_mode("contour")
-            self.detector0.enable()
-            
-            self.detector1 = CameraDetector(camera_id=1)
-            self.detector1.set_mode("contour")
-            self.detector1.enable()
+            # One worker per configured stream, sharing decode/processing slots
+            self.camera_manager = CameraManager.from_config(self.config["camera"])
+            self.camera_workers = self.camera_manager.cameras
+            self.camera_manager.set_main_camera(self._active_camera)
+            self._apply_camera_display_sizes()
             
-            # Camera 0 - Main camera
-            url0 = self.config["camera"]["stream_url0"]
-            worker0 = CameraWorker(url0, camera_id=0, flip_horizontal=True)
-            worker0.set_detector(self.detector0)
-            worker0.enable_detection()
-            worker0.frame_ready.connect(lambda pixmap: self._on_camera_frame(0, pixmap))
-            worker0.status_update.connect(lambda status: self._on_camera_status(0, status))
-            worker0.start()
-            self.camera_workers.append(worker0)
-            
-            # Camera 1 - Secondary camera
-            url1 = self.config["camera"]["stream_url1"]
-            worker1 = CameraWorker(url1, camera_id=1, flip_horizontal=True)
-            worker1.set_detector(self.detector1)
-            worker1.enable_detection()
-            worker1.frame_ready.connect(lambda pixmap: self._on_camera_frame(1, pixmap))
-            worker1.status_update.connect(lambda status: self._on_camera_status(1, status))
-            worker1.start()
-            self.camera_workers.append(worker1)
+            self.detectors = []
+            for camera_id, worker in enumerate(self.camera_workers):
+                # Create detector for object detection
+                detector = CameraDetector(camera_id=camera_id)
+                detector.set_mode("contour")
+                detector.enable()
+                self.detectors.append(detector)
+                
+                print(f"[Cameras] Camera {camera_id} ({self.camera_manager.get_name(camera_id)}): {worker.stream_url}")
+                worker.set_detector(detector)
+                worker.enable_detection()
+                worker.frame_ready.connect(lambda image, i=camera_id: self._on_camera_frame(i, image))
+                worker.overlay_ready.connect(lambda overlay, i=camera_id: self.camera_overlays.__setitem__(i, overlay))
+                worker.status_update.connect(lambda status, i=camera_id: self._on_camera_status(i, status))
             
+            self.camera_manager.start_all()
             print("[Cameras] Camera workers started with OBJECT DETECTION enabled")
             # Cameras connect to Pi, so mark Pi as connected
             self.setPiConnected(True)
@@ -542,14 +562,22 @@ class ROVBackend(QObject):
         try:
             print("[Media] Initializing media manager...")
             self.media_manager = MediaManager()
+            self.media_manager.snapshot_saved.connect(self._on_snapshot_saved)
+            self.media_manager.snapshot_failed.connect(self._on_snapshot_failed)
             print("[Media] ✅ Media manager ready")
         except Exception as e:
             print(f"[Media] Initialization error: {e}")
     
     # ======================== Callbacks ========================
     
-    def _on_camera_frame(self, camera_id, pixmap):
-        """Handle new camera frame"""
+    def _on_camera_frame(self, camera_id, image):
+        """Handle new camera frame (QImage over a pooled worker buffer)"""
+        # Convert on the GUI thread, then hand the buffer back to the worker
+        pixmap = QPixmap.fromImage(image)
+        if camera_id < len(self.camera_workers):
+            self.camera_workers[camera_id].frame_consumed()
+        # HUD is painted at display time so recordings/captures stay clean
+        paint_hud_overlay(pixmap, self.camera_overlays.get(camera_id))
         if camera_id < len(self.camera_providers):
             self.camera_providers[camera_id].updatePixmap(pixmap)
             self.cameraFrameUpdated.emit(camera_id)
@@ -666,10 +694,11 @@ class ROVBackend(QObject):
         
         # Button 7: Cycle through cameras
         if buttons.get("btn7", False) and not self._last_button_states.get("btn7", False):
-            next_camera = (self._active_camera + 1) % 4
+            camera_count = max(1, len(self.camera_workers))
+            next_camera = (self._active_camera + 1) % camera_count
             self.setActiveCamera(next_camera)
-            camera_names = ["Front", "Bottom", "Port", "Starboard"]
-            print(f"[Joystick] Button 7: Switched to Camera {next_camera + 1} ({camera_names[next_camera]})")
+            camera_name = self.camera_manager.get_name(next_camera) if self.camera_manager else ""
+            print(f"[Joystick] Button 7: Switched to Camera {next_camera + 1} ({camera_name})")
         
         # Button 3: Toggle mission timer
         if buttons.get("btn3", False) and not self._last_button_states.get("btn3", False):
@@ -739,19 +768,22 @@ class ROVBackend(QObject):
         print("[Media] Capturing image...")
         try:
             if self.media_manager and self.camera_workers:
+                # Full-resolution still fetched from the Pi in the background;
+                # the result arrives in _on_snapshot_saved/_on_snapshot_failed
                 worker = self.camera_workers[self._active_camera]
-                if worker.current_frame is not None:
-                    filename = self.media_manager.capture_image(worker.current_frame, self._active_camera)
-                    if filename:
-                        print(f"[Media] ✅ Image saved: {filename}")
-                        self.imageCaptured.emit(filename)
-                        self.mediaFilesChanged.emit()  # Refresh gallery
-                    else:
-                        print("[Media] ❌ Image capture failed")
-                else:
-                    print("[Media] ❌ No frame available from camera")
+                self.media_manager.capture_snapshot(
+                    worker.stream_url, self._active_camera, fallback=worker.get_frame
+                )
         except Exception as e:
             print(f"[Media] Image capture error: {e}")
+
+    def _on_snapshot_saved(self, filename):
+        print(f"[Media] ✅ Image saved: {filename}")
+        self.imageCaptured.emit(filename)
+        self.mediaFilesChanged.emit()  # Refresh gallery
+
+    def _on_snapshot_failed(self, error):
+        print(f"[Media] ❌ Image capture failed: {error}")
     
     @Slot()
     def testUpdate(self):
@@ -769,9 +801,11 @@ class ROVBackend(QObject):
             if self.media_manager and self.camera_workers:
                 worker = self.camera_workers[self._active_camera]
                 if worker.current_frame is not None:
-                    # Get frame dimensions from current frame
-                    h, w = worker.current_frame.shape[:2]
-                    self.media_manager.start_recording(w, h, 30, self._active_camera)
+                    # Record the full-resolution stream; its first frame sets
+                    # the video size (the worker may be on the preview stream)
+                    worker.set_full_stream(True)
+                    self._recording_worker = worker
+                    self.media_manager.start_recording(None, None, 30, self._active_camera)
                     
                     # Start recording timer to write frames continuously
                     if not hasattr(self, 'recording_timer'):
@@ -791,6 +825,9 @@ class ROVBackend(QObject):
             # Stop recording timer
             if hasattr(self, 'recording_timer'):
                 self.recording_timer.stop()
+            if self._recording_worker is not None:
+                self._recording_worker.set_full_stream(False)
+                self._recording_worker = None
             
             if self.media_manager:
                 filename = self.media_manager.stop_recording()
@@ -808,8 +845,12 @@ class ROVBackend(QObject):
         try:
             if self.media_manager and self.camera_workers and self.media_manager.is_recording():
                 worker = self.camera_workers[self._active_camera]
-                if worker.current_frame is not None:
-                    self.media_manager.write_frame(worker.current_frame)
+                envelope = worker.get_frame_envelope()
+                # Preview-stream frames until the worker has switched over
+                if envelope is not None and envelope.stream == "main":
+                    self.media_manager.write_frame(
+                        envelope.image, envelope.source_time(worker.clock_offset)
+                    )
         except Exception as e:
             print(f"[Media] Frame write error: {e}")
     
@@ -952,9 +993,7 @@ class ROVBackend(QObject):
         for i, worker in enumerate(self.camera_workers):
             if worker.isRunning():
                 print(f"[Camera {i}] Stopping worker...")
-                worker.running = False
-                worker.quit()
-                worker.wait(2000)
+                worker.stop()
         
         # Stop sensor worker
         if self.sensor_worker and self.sensor_worker.isRunning():
@@ -989,8 +1028,9 @@ def main():
         
         print("[ROV Backend] Initialized (PyQt6)")
         
-        # Register camera image providers
-        for i in range(4):
+        # Register camera image providers (QML shows at least four slots)
+        camera_count = len(backend.config["camera"].get("streams", []))
+        for i in range(max(4, camera_count)):
             provider = CameraImageProvider()
             backend.camera_providers.append(provider)
             engine.addImageProvider(f"camera{i}", provider)
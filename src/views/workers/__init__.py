@@ -3,7 +3,8 @@ UIU MARINER - Workers
 QThread workers for async operations (camera, sensors, etc)
 """
 
+from .cameraManager import CameraManager
 from .cameraWorker import CameraWorker
 from .sensorWorker import SensorTelemetryWorker
 
-__all__ = ["CameraWorker", "SensorTelemetryWorker"]
+__all__ = ["CameraManager", "CameraWorker", "SensorTelemetryWorker"]
@@ -0,0 +1,223 @@
+"""
+Camera Manager Module
+Runs any number of camera workers from the "camera" section of config.json
+"""
+
+from .cameraProcess import ProcessCameraWorker
+from .cameraResources import CameraResources
+from .cameraWorker import CameraWorker
+
+DEFAULT_CAMERA_NAMES = ["Front", "Bottom", "Port", "Starboard"]
+
+
+def stream_configs(camera_config):
+    """
+    Normalise the "camera" config section to a list of stream definitions.
+
+    "streams" is a list of {"url", "preview_url", "name", "max_fps",
+    "decode_scale", "flip_horizontal", "flip_vertical"}; only "url" is
+    required. URLs are MJPEG over HTTP or RTP (rtp://@:5000?payload=96, see
+    rtpStream). "preview_url" is the camera's low-resolution stream (the Pi
+    server's /preview_feed), shown instead of "url" until the full stream
+    is needed for recording. Older configs with stream_url0/stream_url1 are
+    still accepted.
+    """
+    preview_scale = camera_config.get("preview_decode_scale", 1)
+
+    streams = camera_config.get("streams")
+    if not streams:
+        streams = [
+            {"url": camera_config[key]}
+            for key in ("stream_url0", "stream_url1")
+            if camera_config.get(key)
+        ]
+
+    result = []
+    for i, stream in enumerate(streams):
+        if isinstance(stream, str):
+            stream = {"url": stream}
+        name = DEFAULT_CAMERA_NAMES[i] if i < len(DEFAULT_CAMERA_NAMES) else f"Camera {i + 1}"
+        result.append(
+            {
+                "url": stream["url"],
+                "preview_url": stream.get("preview_url"),
+                "name": stream.get("name", name),
+                "max_fps": stream.get("max_fps"),
+                "decode_scale": stream.get("decode_scale", preview_scale),
+                "flip_horizontal": stream.get("flip_horizontal"),
+                "flip_vertical": stream.get("flip_vertical"),
+            }
+        )
+    return result
+
+
+class CameraManager:
+    """
+    Manages one CameraWorker per configured stream.
+
+    All workers share a CameraResources instance that caps concurrent JPEG
+    decodes and pipeline runs, and each camera gets its own budget: an fps
+    cap (the reader never decodes faster) and the decode scale it uses while
+    it is not the main view.
+
+    With use_processes=True every camera runs in its own process instead
+    (ProcessCameraWorker); the shared thread limits then do not apply.
+    """
+
+    def __init__(
+        self,
+        streams,
+        flip_horizontal=True,
+        flip_vertical=False,
+        max_parallel_decodes=None,
+        max_parallel_processing=None,
+        use_processes=False,
+    ):
+        self.use_processes = use_processes
+        self.resources = CameraResources(max_parallel_decodes, max_parallel_processing)
+        self.cameras = []
+        self.names = []
+
+        for camera_id, stream in enumerate(streams):
+            flip_h = stream.get("flip_horizontal")
+            flip_v = stream.get("flip_vertical")
+            flip_h = flip_horizontal if flip_h is None else flip_h
+            flip_v = flip_vertical if flip_v is None else flip_v
+            if use_processes:
+                worker = ProcessCameraWorker(
+                    stream["url"],
+                    camera_id=camera_id,
+                    flip_horizontal=flip_h,
+                    flip_vertical=flip_v,
+                    preview_url=stream.get("preview_url"),
+                )
+            else:
+                worker = CameraWorker(
+                    stream["url"],
+                    camera_id=camera_id,
+                    flip_horizontal=flip_h,
+                    flip_vertical=flip_v,
+                    resources=self.resources,
+                    preview_url=stream.get("preview_url"),
+                )
+            worker.set_max_fps(stream.get("max_fps"))
+            worker.set_decode_scale(stream.get("decode_scale", 1))
+            self.cameras.append(worker)
+            self.names.append(stream.get("name", f"Camera {camera_id + 1}"))
+
+        self.main_camera = 0
+        self.set_main_camera(0)
+
+    @classmethod
+    def from_config(cls, camera_config, flip_horizontal=True, flip_vertical=False):
+        """Build a manager from the "camera" section of config.json"""
+        return cls(
+            stream_configs(camera_config),
+            flip_horizontal=flip_horizontal,
+            flip_vertical=flip_vertical,
+            max_parallel_decodes=camera_config.get("max_parallel_decodes"),
+            max_parallel_processing=camera_config.get("max_parallel_processing"),
+            use_processes=camera_config.get("process_mode", False),
+        )
+
+    def __len__(self):
+        return len(self.cameras)
+
+    def get_camera(self, camera_id):
+        """Worker for camera_id, or None if there is no such camera"""
+        if 0 <= camera_id < len(self.cameras):
+            return self.cameras[camera_id]
+        return None
+
+    def get_name(self, camera_id):
+        """Display name of a camera"""
+        if 0 <= camera_id < len(self.names):
+            return self.names[camera_id]
+        return f"Camera {camera_id + 1}"
+
+    def start_all(self):
+        """Start all camera streams."""
+        for cam in self.cameras:
+            cam.start()
+
+    def stop_all(self):
+        """Stop all camera streams."""
+        for cam in self.cameras:
+            cam.stop()
+
+    def set_flip_all(self, horizontal=None, vertical=None):
+        """Set flip settings for all cameras"""
+        for cam in self.cameras:
+            cam.set_flip(horizontal, vertical)
+
+    def set_flip_camera(self, camera_id, horizontal=None, vertical=None):
+        """Set flip settings for specific camera"""
+        if 0 <= camera_id < len(self.cameras):
+            self.cameras[camera_id].set_flip(horizontal, vertical)
+
+    def set_max_fps_camera(self, camera_id, max_fps):
+        """Change the fps budget of a specific camera (None = uncapped)"""
+        if 0 <= camera_id < len(self.cameras):
+            self.cameras[camera_id].set_max_fps(max_fps)
+
+    def set_stage_enabled_camera(self, camera_id, name, enabled):
+        """Turn a processing stage on or off for a specific camera"""
+        if 0 <= camera_id < len(self.cameras):
+            return self.cameras[camera_id].set_stage_enabled(name, enabled)
+        return False
+
+    def set_main_camera(self, camera_id):
+        """Mark which camera is in the main view (decoded at full resolution)"""
+        self.main_camera = camera_id
+        for i, cam in enumerate(self.cameras):
+            cam.set_main_view(i == camera_id)
+
+    def zoom_in_camera(self, camera_id):
+        """Zoom in on specific camera"""
+        if 0 <= camera_id < len(self.cameras):
+            return self.cameras[camera_id].zoom_in()
+        return 1.0
+
+    def zoom_out_camera(self, camera_id):
+        """Zoom out on specific camera"""
+        if 0 <= camera_id < len(self.cameras):
+            return self.cameras[camera_id].zoom_out()
+        return 1.0
+
+    def reset_zoom_camera(self, camera_id):
+        """Reset zoom on specific camera"""
+        if 0 <= camera_id < len(self.cameras):
+            return self.cameras[camera_id].reset_zoom()
+        return 1.0
+
+    def zoom_in_all(self):
+        """Zoom in on all cameras"""
+        for cam in self.cameras:
+            cam.zoom_in()
+
+    def zoom_out_all(self):
+        """Zoom out on all cameras"""
+        for cam in self.cameras:
+            cam.zoom_out()
+
+    def reset_zoom_all(self):
+        """Reset zoom on all cameras"""
+        for cam in self.cameras:
+            cam.reset_zoom()
+
+    def toggle_all_detection(self, enabled):
+        """Toggle detection on all cameras"""
+        for cam in self.cameras:
+            if enabled:
+                cam.enable_detection()
+            else:
+                cam.disable_detection()
+        status = "enabled" if enabled else "disabled"
+        print(f"[CAM_MGR] Detection {status} on all cameras")
+
+    def get_stats(self):
+        """Pipeline stats of every camera plus the shared limits"""
+        return {
+            "resources": self.resources.get_stats(),
+            "cameras": [cam.get_pipeline_stats() for cam in self.cameras],
+        }
@@ -0,0 +1,746 @@
+"""
+Camera Process Module
+Optional mode that reads, decodes and processes a camera feed in its own
+process and hands finished frames to the GUI through shared memory
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+from multiprocessing.connection import wait
+from pathlib import Path
+
+from PyQt6.QtGui import QImage
+
+from .cameraWorker import (
+    DECODE_SCALE_FLAGS,
+    CameraWorker,
+    open_video_capture,
+    placeholder_frame,
+    read_envelope,
+)
+from .frameEnvelope import FrameEnvelope
+from .frameTransform import FrameTransform, fit_size, scale_to_fit
+from .mjpegStreamReader import MJPEGStreamReader
+from .sharedFrameRing import DEFAULT_SLOT_BYTES, SharedFrameRing
+from .streamConnection import (
+    CONNECTED,
+    CONNECTING,
+    RECONNECTING,
+    WAITING,
+    ReconnectBackoff,
+    open_with_timeout,
+)
+
+PIPELINE_STAGES = ("transform", "detect", "scale", "overlay")
+
+
+def _open_stream(stream_url, use_native_reader, timeout):
+    if use_native_reader and stream_url.startswith("http://"):
+        return MJPEGStreamReader(stream_url, timeout=timeout)
+    return open_video_capture(stream_url, timeout)
+
+
+def camera_process_main(
+    camera_id,
+    stream_url,
+    use_native_reader,
+    open_timeout,
+    ring_name,
+    slots,
+    slot_bytes,
+    control,
+    events,
+):
+    """
+    Camera process entry point.
+
+    Reads and decodes the stream, runs transform/detect/scale, copies the
+    result into a free ring slot and sends ("frame", info) to the GUI
+    process. A frame is only read once enough slots are free, so a slow GUI
+    turns into skipped (never decoded) stream parts instead of a backlog.
+
+    Failed opens and dropped streams are retried forever with jittered
+    exponential backoff; each open is bounded by open_timeout.
+
+    control receives ("config", dict), ("release", [slots]) and ("stop", None).
+    A frame larger than a ring slot is answered with ("resize", bytes) and the
+    process exits, so the GUI can re-create the ring with slots that fit.
+    config["stream"] is the (kind, url) to read; when it changes the new
+    stream is opened before the old one is closed.
+    """
+    ring = SharedFrameRing(slots, slot_bytes, name=ring_name, create=False)
+    free = list(range(slots))
+    config = {}
+    transform = FrameTransform()
+    detector = None
+    detector_key = None
+    cap = None
+    opened_stream = None  # (kind, url) of cap
+    switch_at = 0.0
+    backoff = ReconnectBackoff()
+    state = None
+    retry_at = 0.0
+    last_frame_time = 0.0
+    placeholder = None  # (display size, frame)
+    failures = 0
+    next_read = 0.0
+    counters = {"frames_read": 0, "frames_published": 0, "slot_waits": 0}
+    last_stats = time.monotonic()
+
+    try:
+        while True:
+            need = 2 if config.get("keep_full_frame") else 1
+            timeout = 0.0 if cap is not None and len(free) >= need else 0.05
+            while control.poll(timeout):
+                timeout = 0.0
+                kind, payload = control.recv()
+                if kind == "stop":
+                    return
+                if kind == "release":
+                    free.extend(payload)
+                elif kind == "config":
+                    config = payload
+                    if isinstance(cap, MJPEGStreamReader):
+                        cap.decode_flags = DECODE_SCALE_FLAGS[config["decode_scale"]]
+
+            if not config:
+                continue
+
+            # (Re)connect with backoff
+            if cap is None:
+                remaining = retry_at - time.monotonic()
+                if remaining > 0:
+                    control.poll(min(remaining, 0.5))
+                    continue
+                if state != WAITING:
+                    state = CONNECTING if state is None else RECONNECTING
+                    events.send(("connection", {"state": state, "last_frame_time": last_frame_time}))
+
+                opened_stream = config.get("stream", ("main", stream_url))
+                url = opened_stream[1]
+                cap = open_with_timeout(
+                    lambda: _open_stream(url, use_native_reader, open_timeout),
+                    open_timeout,
+                )
+                if cap is None or not cap.isOpened():
+                    if cap is not None:
+                        cap.release()
+                    cap = None
+                    delay = backoff.next_delay()
+                    retry_at = time.monotonic() + delay
+                    if state != WAITING:
+                        # First failure of this outage: status + placeholder once
+                        events.send(("status", "Disconnected"))
+                        size = config["display_size"]
+                        if placeholder is None or placeholder[0] != size:
+                            placeholder = (size, scale_to_fit(placeholder_frame(camera_id), size))
+                        if free:
+                            slot = free.pop(0)
+                            events.send(
+                                (
+                                    "placeholder",
+                                    {"display": (slot, ring.write(slot, placeholder[1]))},
+                                )
+                            )
+                    state = WAITING
+                    events.send(
+                        (
+                            "connection",
+                            {
+                                "state": state,
+                                "attempts": backoff.attempts,
+                                "retry_in": delay,
+                                "last_frame_time": last_frame_time,
+                            },
+                        )
+                    )
+                    continue
+
+                if isinstance(cap, MJPEGStreamReader):
+                    cap.decode_flags = DECODE_SCALE_FLAGS[config["decode_scale"]]
+                backoff.reset()
+                state = CONNECTED
+                events.send(("connection", {"state": state, "last_frame_time": last_frame_time}))
+                events.send(("status", "Connected"))
+                failures = 0
+
+            elif config.get("stream", opened_stream) != opened_stream and (
+                time.monotonic() >= switch_at
+            ):
+                # Preview <-> full stream: open the new one, then swap
+                wanted = config["stream"]
+                new_cap = open_with_timeout(
+                    lambda: _open_stream(wanted[1], use_native_reader, open_timeout),
+                    open_timeout,
+                )
+                if new_cap is not None and new_cap.isOpened():
+                    cap.release()
+                    cap, opened_stream = new_cap, wanted
+                    if isinstance(cap, MJPEGStreamReader):
+                        cap.decode_flags = DECODE_SCALE_FLAGS[config["decode_scale"]]
+                    print(f"[CAM{camera_id}] Switched to {wanted[0]} stream: {wanted[1]}")
+                else:
+                    if new_cap is not None:
+                        new_cap.release()
+                    switch_at = time.monotonic() + 2.0
+                    print(f"[CAM{camera_id}] Could not open {wanted[0]} stream, retrying")
+
+            if len(free) < need:
+                counters["slot_waits"] += 1
+                continue
+
+            # Per-camera fps budget
+            max_fps = config.get("max_fps")
+            if max_fps:
+                wait_time = next_read - time.monotonic()
+                if wait_time > 0:
+                    time.sleep(min(wait_time, 0.5))
+                next_read = time.monotonic() + 1.0 / max_fps
+
+            ret, frame = cap.read()
+            if not ret:
+                failures += 1
+                if failures >= 30 or not cap.isOpened():
+                    print(f"[CAM{camera_id}] Too many frame read failures, reconnecting...")
+                    cap.release()
+                    cap = None
+                    state = RECONNECTING
+                    events.send(("status", "Disconnected"))
+                    continue
+                time.sleep(0.1)
+                continue
+            failures = 0
+            counters["frames_read"] += 1
+            last_frame_time = time.time()
+
+            envelope = read_envelope(
+                cap, frame, camera_id, counters["frames_read"], opened_stream[0]
+            )
+            timings = {}
+            if isinstance(cap, MJPEGStreamReader):
+                timings["decode"] = cap.last_decode_ms
+            stages = config["stages"]
+
+            # Detector lives in this process; rebuilt when its settings change
+            key = config.get("detector")
+            if key != detector_key:
+                detector_key = key
+                detector = None
+                if key is not None:
+                    detector_class, mode, min_area = key
+                    detector = detector_class(camera_id=camera_id)
+                    detector.set_mode(mode)
+                    detector.min_area = min_area
+                    detector.enable()
+            detecting = (
+                config.get("detection_enabled") and detector is not None and stages["detect"]
+            )
+
+            start = time.perf_counter()
+            full = None
+            if stages["transform"]:
+                height, width = frame.shape[:2]
+                flip_h, flip_v, zoom = config["flip_horizontal"], config["flip_vertical"], config["zoom"]
+                if flip_h or flip_v:
+                    envelope.add_transform("mirror", (flip_h, flip_v))
+                if zoom > 1.0:
+                    envelope.add_transform("zoom", zoom)
+                if config["keep_full_frame"]:
+                    frame = transform.apply(frame, (width, height), flip_h, flip_v, zoom)
+                    full = frame
+                elif detecting:
+                    frame = transform.apply(frame, None, flip_h, flip_v, zoom)
+                else:
+                    crop_w, crop_h = FrameTransform.crop_size(width, height, zoom)
+                    out_size = fit_size(crop_w, crop_h, config["display_size"])
+                    if out_size != (crop_w, crop_h):
+                        envelope.add_transform("resize", out_size)
+                    frame = transform.apply(frame, out_size, flip_h, flip_v, zoom)
+                timings["transform"] = (time.perf_counter() - start) * 1000.0
+            elif config["keep_full_frame"]:
+                full = frame
+            full_transforms = envelope.transforms
+
+            detection = None
+            detect_size = None
+            if detecting:
+                start = time.perf_counter()
+                detection = detector.analyze(frame)
+                detect_size = (frame.shape[1], frame.shape[0])
+                timings["detect"] = (time.perf_counter() - start) * 1000.0
+
+            if stages["scale"]:
+                start = time.perf_counter()
+                scaled = scale_to_fit(frame, config["display_size"])
+                if scaled is not frame:
+                    envelope.add_transform("resize", (scaled.shape[1], scaled.shape[0]))
+                frame = scaled
+                timings["scale"] = (time.perf_counter() - start) * 1000.0
+
+            overlay = None
+            if stages["overlay"]:
+                start = time.perf_counter()
+                overlay = {
+                    "camera_id": camera_id,
+                    "badge": f"CAM {camera_id + 1}",
+                    "zoom": config["zoom"],
+                    "frame_size": detect_size,
+                    "detection": detection,
+                }
+                timings["overlay"] = (time.perf_counter() - start) * 1000.0
+
+            if not ring.fits(frame.shape) or (full is not None and not ring.fits(full.shape)):
+                # Larger than the slots: the GUI re-creates the ring to fit
+                # and starts a new camera process
+                needed = max(frame.nbytes, 0 if full is None else full.nbytes)
+                events.send(("resize", needed))
+                return
+
+            # The envelope travels without its image (see FrameEnvelope.__getstate__)
+            envelope.process_time = time.time()
+            info = {"envelope": envelope, "overlay": overlay, "timings": timings}
+            slot = free.pop(0)
+            info["display"] = (slot, ring.write(slot, frame))
+            if full is not None:
+                slot = free.pop(0)
+                info["full"] = (slot, ring.write(slot, full))
+                info["full_transforms"] = full_transforms
+            events.send(("frame", info))
+            counters["frames_published"] += 1
+
+            now = time.monotonic()
+            if now - last_stats >= 1.0:
+                last_stats = now
+                stats = dict(counters)
+                if isinstance(cap, MJPEGStreamReader):
+                    stats.update(cap.get_stats())
+                events.send(("stats", stats))
+
+    except (EOFError, OSError, KeyboardInterrupt):
+        # GUI process went away
+        pass
+    except Exception as e:
+        try:
+            events.send(("error", f"Camera {camera_id} process error: {e}"))
+        except OSError:
+            pass
+    finally:
+        if cap is not None:
+            cap.release()
+        ring.close()
+
+
+class ProcessCameraWorker(CameraWorker):
+    """
+    CameraWorker whose reading, decoding and processing run in a child
+    process, so the per-frame Python work does not compete with the GUI and
+    control loop for the GIL.
+
+    Frames come back through a SharedFrameRing and are emitted as QImages
+    over the shared memory itself (no copy in the GUI process). Settings
+    (flip, zoom, display size, decode scale, detection, stage toggles,
+    preview/full stream) are the inherited ones and are forwarded to the
+    child whenever they change.
+    Extra stages added with add_stage() only run in thread mode.
+    """
+
+    def __init__(
+        self,
+        stream_url,
+        camera_id=0,
+        flip_horizontal=True,
+        flip_vertical=False,
+        use_native_reader=True,
+        ring_slots=6,
+        slot_bytes=DEFAULT_SLOT_BYTES,
+        preview_url=None,
+        parent=None,
+    ):
+        super().__init__(
+            stream_url,
+            camera_id=camera_id,
+            flip_horizontal=flip_horizontal,
+            flip_vertical=flip_vertical,
+            use_native_reader=use_native_reader,
+            preview_url=preview_url,
+            parent=parent,
+        )
+        self.ring_slots = ring_slots
+        self.slot_bytes = slot_bytes  # Grows to fit the stream's frames
+        self._ring_resized = False
+
+        self._process = None
+        self._control = None
+        self._wake_send = None
+        self._sent_config = None
+        self._child_stats = {}
+
+        # Slot reference counts; a slot goes back to the child at zero
+        self._slot_refs = {}
+        # Frames: shown by the GUI, waiting for the GUI, latest (get_frame)
+        self._frames_lock = threading.Lock()
+        self._gui_frame = None
+        self._pending_frame = None
+        self._latest_frame = None
+        self.pending_drops = 0
+
+    def run(self):
+        """
+        Run the camera process and forward its frames to the GUI.
+        A child that dies (crash, failed import, killed) is treated like a
+        dropped stream: reported, then respawned with the same jittered
+        backoff the stream reconnects use, until stop().
+        """
+        self.running = True
+        self.fps_start_time = time.time()
+        backoff = ReconnectBackoff()
+
+        while self.running:
+            try:
+                produced, reason = self._run_process()
+            except Exception as e:
+                produced, reason = False, f"camera process failed: {e!r}"
+            if not self.running:
+                break
+            if self._ring_resized:
+                # Not a failure: respawn at once with the larger slots
+                self._ring_resized = False
+                continue
+
+            if produced:
+                backoff.reset()
+            delay = backoff.next_delay()
+            error_msg = f"Camera {self.camera_id} error: {reason}"
+            self.error_occurred.emit(error_msg)
+            print(f"[CAM{self.camera_id}] ❌ {error_msg} (restarting in {delay:.1f}s)")
+            self._set_connection_state(RECONNECTING, delay, backoff.attempts)
+            deadline = time.monotonic() + delay
+            while self.running and time.monotonic() < deadline:
+                time.sleep(0.1)
+
+        print(f"[CAM{self.camera_id}] Stream closed")
+
+    @staticmethod
+    def _ensure_importable():
+        """
+        Make this module importable by name in a spawned child.
+        spawn re-imports the Process target by module name; the QML bridge
+        loads this package as a top-level "workers" module from its file,
+        which a child cannot find unless the package's parent directory is
+        on sys.path (the child inherits sys.path).
+        """
+        package_root = Path(__file__).resolve().parents[len(__package__.split("."))]
+        if str(package_root) not in sys.path:
+            sys.path.append(str(package_root))
+
+    def _run_process(self):
+        """
+        Start one camera process and serve it until it exits or stop()
+        Returns:
+            (produced frames, reason it ended)
+        """
+        self._ensure_importable()
+        # spawn: forking a Qt process with reader threads running is unsafe
+        ctx = multiprocessing.get_context("spawn")
+        ring = SharedFrameRing(self.ring_slots, self.slot_bytes)
+        control_recv, self._control = ctx.Pipe(duplex=False)
+        events, events_send = ctx.Pipe(duplex=False)
+        wake, self._wake_send = ctx.Pipe(duplex=False)
+        self._process = ctx.Process(
+            target=camera_process_main,
+            args=(
+                self.camera_id,
+                self.stream_url,
+                self.use_native_reader,
+                self.open_timeout,
+                ring.name,
+                self.ring_slots,
+                self.slot_bytes,
+                control_recv,
+                events_send,
+            ),
+            name=f"cam{self.camera_id}-process",
+            daemon=True,
+        )
+        frames_before = self.processed_frames
+        reason = None
+        try:
+            self._process.start()
+            control_recv.close()
+            events_send.close()
+            print(f"[CAM{self.camera_id}] Camera process started (pid {self._process.pid})")
+
+            while self.running:
+                self._push_config()
+                ready = wait([events, wake, self._process.sentinel], timeout=0.5)
+
+                if wake in ready:
+                    while wake.poll():
+                        wake.recv()
+                    self._on_gui_consumed()
+
+                if events in ready:
+                    try:
+                        while events.poll():
+                            kind, payload = events.recv()
+                            self._on_event(kind, payload, ring)
+                    except EOFError:
+                        pass  # Child closed its end; the exit code tells why
+                if self._ring_resized:
+                    break
+
+                if not self._process.is_alive():
+                    self._process.join(timeout=1.0)
+                    reason = f"camera process exited with code {self._process.exitcode}"
+                    break
+
+                if time.time() - self.fps_start_time >= 1.0:
+                    fps = self.fps_counter / (time.time() - self.fps_start_time)
+                    self.fps_update.emit(fps)
+                    self.pipeline_stats.emit(self.get_pipeline_stats())
+                    self.latency_stats.emit(self.get_latency_stats())
+                    self.stage_stats.emit(self.get_stage_stats())
+                    self.fps_counter = 0
+                    self.fps_start_time = time.time()
+
+                    if time.time() - self._last_offset_check > self.offset_check_interval:
+                        self._last_offset_check = time.time()
+                        threading.Thread(
+                            target=self._update_clock_offset, daemon=True
+                        ).start()
+
+        finally:
+            try:
+                self._control.send(("stop", None))
+            except OSError:
+                pass
+            if self._process.pid is not None:
+                self._process.join(timeout=2.0)
+                if self._process.is_alive():
+                    self._process.terminate()
+            with self._frames_lock:
+                self._gui_frame = self._pending_frame = self._latest_frame = None
+            self._slot_refs.clear()
+            self._sent_config = None
+            wake_send, self._wake_send = self._wake_send, None
+            for conn in (self._control, events, wake, wake_send, control_recv, events_send):
+                conn.close()
+            ring.close()
+
+        return self.processed_frames > frames_before, reason
+
+    def _process_config(self):
+        """Settings the camera process needs, as a picklable dict"""
+        detector = None
+        if self.detector is not None:
+            detector = (type(self.detector), self.detector.mode, self.detector.min_area)
+        return {
+            "flip_horizontal": self.flip_horizontal,
+            "flip_vertical": self.flip_vertical,
+            "zoom": self.zoom_level,
+            "display_size": self.get_display_size(),
+            "decode_scale": self.get_effective_decode_scale(),
+            "max_fps": self.max_fps,
+            "keep_full_frame": self.keep_full_frame,
+            "stream": self.active_stream(),
+            "detection_enabled": self.detection_enabled,
+            "detector": detector,
+            "stages": {
+                name: self.pipeline.is_stage_enabled(name) for name in PIPELINE_STAGES
+            },
+        }
+
+    def _push_config(self):
+        """Send the settings to the camera process if they changed"""
+        config = self._process_config()
+        if config != self._sent_config:
+            self._control.send(("config", config))
+            self._sent_config = config
+
+    def _on_event(self, kind, payload, ring):
+        """Handle one message from the camera process"""
+        if kind == "frame" or kind == "placeholder":
+            frame = {
+                "slots": [],
+                "envelope": payload.get("envelope"),
+                "full_transforms": payload.get("full_transforms"),
+            }
+            for key in ("display", "full"):
+                if key in payload:
+                    slot, shape = payload[key]
+                    frame["slots"].append(slot)
+                    frame[key] = ring.view(slot, shape)
+            self._slot_refs.update({slot: 1 for slot in frame["slots"]})
+
+            if kind == "frame":
+                self.last_frame_time = payload["envelope"].receive_time
+                self._record_timings(payload["timings"])
+                self.processed_frames += 1
+                self.fps_counter += 1
+            if payload.get("overlay") is not None or kind == "placeholder":
+                self.overlay_ready.emit(payload.get("overlay") or self._build_overlay())
+            self._on_frame(frame, store_current=kind == "frame")
+
+        elif kind == "status":
+            self.status_update.emit(payload)
+        elif kind == "connection":
+            self.connection_state = payload["state"]
+            self.last_frame_time = payload["last_frame_time"]
+            self._set_connection_state(
+                payload["state"], payload.get("retry_in"), payload.get("attempts", 0)
+            )
+        elif kind == "resize":
+            self.slot_bytes = payload
+            self._ring_resized = True
+            print(
+                f"[CAM{self.camera_id}] Frames need {payload} bytes per slot, "
+                "re-creating the shared-memory ring"
+            )
+        elif kind == "stats":
+            self._child_stats = payload
+        elif kind == "error":
+            self.error_occurred.emit(payload)
+            print(f"[CAM{self.camera_id}] ❌ {payload}")
+
+    def _record_timings(self, timings):
+        """Feed child stage timings into the (local) pipeline stage stats"""
+        if "decode" in timings:
+            self.stage_times["decode"].add(timings["decode"])
+        for name in PIPELINE_STAGES:
+            stage = self.pipeline.get_stage(name)
+            if stage is None:
+                continue
+            if name in timings:
+                stage.timings.add(timings[name])
+                stage.runs += 1
+            elif not stage.enabled:
+                stage.skipped += 1
+
+    def _on_frame(self, frame, store_current=True):
+        """Emit a frame now, or park it until the GUI has shown the previous one"""
+        released = []
+        with self._frames_lock:
+            if store_current:
+                # Held for get_frame() until the next frame arrives
+                for slot in frame["slots"]:
+                    self._slot_refs[slot] += 1
+                if self._latest_frame is not None:
+                    released.extend(self._latest_frame["slots"])
+                self._latest_frame = frame
+
+            if self._gui_frame is None:
+                self._gui_frame = frame
+            else:
+                if self._pending_frame is not None:
+                    self.pending_drops += 1
+                    released.extend(self._pending_frame["slots"])
+                self._pending_frame = frame
+                frame = None
+
+        self._release_slots(released)
+        if frame is not None:
+            self._emit_shared(frame)
+
+    def _emit_shared(self, frame):
+        """Emit a zero-copy QImage over the frame's shared-memory slot"""
+        start = time.perf_counter()
+        view = frame["display"]
+        h, w = view.shape[:2]
+        image = QImage(view.data, w, h, view.strides[0], QImage.Format.Format_BGR888)
+        self.frame_ready.emit(image)
+        self.stage_times["emit"].add((time.perf_counter() - start) * 1000.0)
+
+    def _on_gui_consumed(self):
+        """The GUI converted the last frame: free it and emit the pending one"""
+        with self._frames_lock:
+            done = self._gui_frame
+            self._gui_frame = self._pending_frame
+            self._pending_frame = None
+            frame = self._gui_frame
+
+        if done is not None:
+            self._release_slots(done["slots"])
+        if frame is not None:
+            self._emit_shared(frame)
+
+    def _release_slots(self, slots):
+        """Drop one reference per slot; hand slots at zero back to the child"""
+        free = []
+        for slot in slots:
+            count = self._slot_refs.get(slot, 0) - 1
+            if count <= 0:
+                self._slot_refs.pop(slot, None)
+                free.append(slot)
+            else:
+                self._slot_refs[slot] = count
+        if free:
+            self._control.send(("release", free))
+
+    def frame_consumed(self):
+        """Called by the GUI once the last emitted QImage has been converted"""
+        with self._frames_lock:
+            frame = self._gui_frame
+        self._record_display(frame.get("envelope") if frame is not None else None)
+
+        wake = self._wake_send
+        if wake is not None:
+            try:
+                wake.send(None)
+            except OSError:
+                pass
+
+    @property
+    def current_frame(self):
+        """Latest processed frame (full resolution if kept, else the display frame)"""
+        return self.get_frame()
+
+    def get_frame_envelope(self):
+        """Get a copy of the current frame (out of shared memory) with its envelope"""
+        with self._frames_lock:
+            frame = self._latest_frame
+            if frame is None:
+                return None
+            image = frame.get("full", frame["display"]).copy()
+        envelope = frame["envelope"]
+        if envelope is None:
+            return FrameEnvelope(image, self.camera_id)
+        envelope = envelope.with_image(image)
+        if "full" in frame:
+            # The full frame skipped the display resize
+            envelope.transforms = frame["full_transforms"]
+        return envelope
+
+    def get_stream_stats(self):
+        """Reader counters reported by the camera process"""
+        return self._child_stats
+
+    def get_pipeline_stats(self):
+        """
+        Get camera process / GUI hand-off counters
+        Returns:
+            dict with frames read/published by the child, slot waits and
+            frames dropped while the GUI was busy
+        """
+        stats = self._child_stats
+        return {
+            "camera_id": self.camera_id,
+            "mode": "process",
+            "frames_read": stats.get("frames_read", 0),
+            "frames_processed": self.processed_frames,
+            "stream_drops": stats.get("dropped_frames", 0),
+            "slot_waits": stats.get("slot_waits", 0),
+            "pending_drops": self.pending_drops,
+            "gui_in_flight": 1 if self._gui_frame is not None else 0,
+            "max_fps": self.max_fps,
+        }
+
+    def add_stage(self, stage, before=None, after=None):
+        """Custom stages cannot be shipped to the camera process"""
+        print(f"[CAM{self.camera_id}] Stage {stage.name} ignored: not supported in process mode")
+
+    def stop(self):
+        """Stop the camera process and thread."""
+        self.running = False
+        self.wait()
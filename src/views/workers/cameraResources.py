@@ -0,0 +1,32 @@
+"""
+Camera Resources Module
+CPU limits shared by all camera workers of one CameraManager
+"""
+
+import os
+import threading
+
+
+class CameraResources:
+    """
+    Bounds how many cameras decode or process a frame at the same time.
+
+    Every worker of a manager shares one instance, so adding cameras adds
+    waiting, not CPU oversubscription: with N cameras and K decode slots at
+    most K JPEG decodes run concurrently. Slots are only held around the
+    CPU-bound work, never while waiting on the network.
+    """
+
+    def __init__(self, max_parallel_decodes=None, max_parallel_processing=None):
+        cpus = os.cpu_count() or 2
+        self.max_parallel_decodes = max_parallel_decodes or max(1, cpus // 2)
+        self.max_parallel_processing = max_parallel_processing or max(1, cpus // 2)
+        self.decode_slots = threading.BoundedSemaphore(self.max_parallel_decodes)
+        self.process_slots = threading.BoundedSemaphore(self.max_parallel_processing)
+
+    def get_stats(self):
+        """Configured limits"""
+        return {
+            "max_parallel_decodes": self.max_parallel_decodes,
+            "max_parallel_processing": self.max_parallel_processing,
+        }
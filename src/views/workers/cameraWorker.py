@@ -1,22 +1,132 @@
 """
 Camera Worker Module
-Handles dual camera feeds from Raspberry Pi via MJPEG HTTP streams
+Handles camera feeds from Raspberry Pi via MJPEG HTTP or RTP/H.264 streams
 """
 
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
 import cv2
 import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtGui import QImage
+
+from .cameraResources import CameraResources
+from .frameBufferPool import FrameBufferPool
+from .frameCredits import FrameCredits
+from .frameEnvelope import FrameEnvelope
+from .frameTransform import FrameTransform, fit_size, scale_to_fit
+from .latestFrameSlot import LatestFrameSlot
+from .mjpegStreamReader import MJPEGStreamReader
+from .processingPipeline import ProcessingPipeline, ProcessingStage
+from .rtpStream import is_rtp_url, open_rtp_capture
+from .streamConnection import (
+    CONNECTED,
+    CONNECTING,
+    RECONNECTING,
+    WAITING,
+    ReconnectBackoff,
+    open_with_timeout,
+)
+from .streamLatency import RollingHistogram, estimate_clock_offset, status_url_for
+
+# JPEG decode scale -> imdecode flag (libjpeg DCT scaling)
+DECODE_SCALE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+@lru_cache(maxsize=None)
+def placeholder_frame(camera_id):
+    """Frame shown while a camera is unavailable (cached, read-only)"""
+    placeholder = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+    text = f"Camera {camera_id + 1} Unavailable"
+    cv2.putText(
+        placeholder,
+        text,
+        (100, 240),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.2,
+        (100, 100, 100),
+        2,
+    )
+
+    cv2.putText(
+        placeholder,
+        "Check network connection",
+        (140, 280),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.8,
+        (80, 80, 80),
+        1,
+    )
+    placeholder.flags.writeable = False
+    return placeholder
+
+
+def open_video_capture(stream_url, timeout):
+    """Open an OpenCV/FFmpeg capture with open/read timeouts where supported"""
+    if is_rtp_url(stream_url):
+        return open_rtp_capture(stream_url, timeout)
+    params = []
+    timeout_ms = int(timeout * 1000)
+    for prop in ("CAP_PROP_OPEN_TIMEOUT_MSEC", "CAP_PROP_READ_TIMEOUT_MSEC"):
+        if hasattr(cv2, prop):
+            params += [getattr(cv2, prop), timeout_ms]
+    if params:
+        return cv2.VideoCapture(stream_url, cv2.CAP_FFMPEG, params)
+    return cv2.VideoCapture(stream_url)
+
+
+def read_envelope(cap, frame, camera_id, local_seq, stream="main"):
+    """
+    Envelope for the frame just read from cap
+    Capture time and sequence come from the Pi's X-Timestamp/X-Seq part
+    headers when the stream has them; local_seq numbers frames otherwise.
+    """
+    decode_time = time.time()
+    envelope = FrameEnvelope(
+        frame, camera_id, seq=local_seq, decode_time=decode_time, stream=stream
+    )
+    if not isinstance(cap, MJPEGStreamReader):
+        envelope.receive_time = decode_time
+        return envelope
+
+    headers = cap.last_part_headers
+    envelope.receive_time = cap.last_receive_time
+    try:
+        if "x-timestamp" in headers:
+            envelope.capture_time = float(headers["x-timestamp"])
+        if "x-seq" in headers:
+            envelope.seq = int(headers["x-seq"])
+    except ValueError:
+        pass
+    return envelope
 
 
 class CameraWorker(QThread):
     """
     Worker thread for camera streaming.
     Receives MJPEG video stream via HTTP and displays the direct feed.
+
+    Frames are emitted as BGR888 QImages over pooled buffers; the GUI converts
+    them to pixmaps and must call frame_consumed() afterwards. Inside the
+    worker each frame travels as a FrameEnvelope carrying its timestamps.
     """
 
-    frame_ready = pyqtSignal(QPixmap)
+    frame_ready = pyqtSignal(QImage)
     fps_update = pyqtSignal(float)
+    pipeline_stats = pyqtSignal(dict)  # Queue depth / drop counters, once per second
+    latency_stats = pyqtSignal(dict)  # Latency p50/p95/p99 and stage timings, once per second
+    stage_stats = pyqtSignal(dict)  # Per-stage mean/p95 ms and skip counts, once per second
+    overlay_ready = pyqtSignal(dict)  # HUD data for the next frame, painted by the view
+    connection_state_changed = pyqtSignal(dict)  # State, retry delay, last good frame time
     error_occurred = pyqtSignal(str)
     status_update = pyqtSignal(
         str
@@ -28,17 +138,59 @@ class CameraWorker(QThread):
         camera_id=0,
         flip_horizontal=True,
         flip_vertical=False,
+        use_native_reader=True,
+        resources=None,
+        preview_url=None,
         parent=None,
     ):
         super().__init__(parent)
+        # Decode/processing slots, shared with the other cameras of a manager
+        self.resources = resources or CameraResources()
         self.stream_url = stream_url
+        # Low-resolution stream of the same camera (Pi /preview_feed). When
+        # set it is shown instead of stream_url except while the full stream
+        # is needed (see set_full_stream).
+        self.preview_url = preview_url
+        self.full_stream_needed = False
+        self._opened_stream = None  # (kind, url) of self.cap
+        self._next_switch_attempt = 0.0
+        self.use_native_reader = use_native_reader
         self.running = False
         self.camera_id = camera_id
         self.cap = None
-        self.current_frame = None
+        self.frame_pool = FrameBufferPool()
+        self.frame_slot = LatestFrameSlot()
+        self._reader_thread = None
+        self.processed_frames = 0
+
+        # Connection state (see _reader_loop)
+        self.open_timeout = 5.0  # Hard limit for one open attempt, seconds
+        self.connection_state = CONNECTING
+        self.last_frame_time = 0.0
+        self._stop_event = threading.Event()
+        self._placeholder = None  # (display size, frame), reused while offline
+        self._placeholder_pending = False  # Set by the reader, shown by the processor
+
+        # Latency measurement (X-Timestamp/X-Seq part headers from the Pi)
+        self.clock_offset = None  # Pi clock minus ground clock, seconds
+        self._last_offset_check = 0.0
+        self.offset_check_interval = 60.0
+        self.glass_latency = RollingHistogram()  # Pi capture -> GUI display
+        self.ground_latency = RollingHistogram()  # Ground receive -> GUI display
+        # Stages outside the processing pipeline (reader decode, GUI hand-off)
+        self.stage_times = {name: RollingHistogram() for name in ("decode", "emit")}
+        self._in_flight_meta = deque()  # (envelope, credit) per frame the GUI holds
+        self._meta_lock = threading.Lock()
+        self._read_seq = 0  # Local sequence for streams without X-Seq
+        self._current_buffer = None
+        self._current_envelope = None
+        self._current_lock = threading.Lock()
         self.flip_horizontal = flip_horizontal
         self.flip_vertical = flip_vertical
 
+        # Fused mirror/zoom/resize stage with a reused destination buffer
+        self.transform = FrameTransform()
+
         self.fps_counter = 0
         self.fps_start_time = 0
 
@@ -52,123 +204,111 @@ class CameraWorker(QThread):
         self.zoom_max = 5.0
         self.zoom_step = 0.25
 
-    def run(self):
-        """Main camera capture loop with MJPEG stream."""
-        import time
+        # Display scaling - frames are resampled once, in this thread, to the
+        # size of the widget showing them (None = emit at source resolution)
+        self._display_size = None
+        self._display_lock = threading.Lock()
+
+        # Full-resolution frame is only kept when capture/recording needs it
+        self.keep_full_frame = False
+        self._full_frame = None
+        self._full_envelope = None
+        # Two reused full-resolution buffers: the transform writes one while
+        # the other holds the published frame, copied only on request
+        self._full_buffers = [None, None]
+        self._full_index = 0
+        self._full_lock = threading.Lock()
+
+        # Reduced-scale JPEG decode for preview feeds (1, 2, 4 or 8). Only
+        # applies while this camera is neither the main nor the recorded view.
+        self.decode_scale = 1
+        self.is_main_view = True
+
+        # Backpressure: one frame in flight to the GUI at a time, and a
+        # processing rate adapted to how fast the GUI acknowledges frames
+        self.credits = FrameCredits(credits=1)
+        self.frame_skip = 0  # Frames grabbed without decoding per read (VideoCapture)
+        self.max_frame_skip = 5
+        self.target_fps = None  # Reader pace; None = as fast as the stream
+        self.max_fps = None  # Per-camera budget; caps target_fps
+        self.min_target_fps = 5.0
+        self.gui_bound_threshold = 0.25  # Share of time spent waiting for credits
+        self.consumer_fps = 0.0
+        self._next_read_time = 0.0
+        self._frames_grabbed = 0
+        self._rate_sample = None
+
+        # Per-camera processing stages (see add_stage/set_stage_enabled)
+        self.pipeline = self._build_pipeline()
 
+    def run(self):
+        """
+        Camera processor loop.
+        A separate reader thread drains the MJPEG stream and hands the newest
+        frame over through a capacity-one slot, so slow processing drops
+        frames instead of backing up the socket.
+        """
         self.running = True
         self.fps_start_time = time.time()
-        retry_count = 0
-        max_retries = 3
+        self.frame_slot.reopen()
+        self.credits.reset()
+        self._placeholder_pending = False
+        self._stop_event.clear()
+        self.connection_state = CONNECTING
+        self._rate_sample = None
+
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop, name=f"cam{self.camera_id}-reader", daemon=True
+        )
+        self._reader_thread.start()
 
         try:
-            while self.running and retry_count < max_retries:
-                print(
-                    f"[CAM{self.camera_id}] Attempting to open MJPEG stream (attempt {retry_count + 1}/{max_retries})..."
-                )
-                print(f"[CAM{self.camera_id}] URL: {self.stream_url}")
-
-                # Open MJPEG stream via HTTP
-                self.cap = cv2.VideoCapture(self.stream_url)
-
-                if not self.cap.isOpened():
-                    retry_count += 1
-                    error_msg = f"Camera {self.camera_id}: Failed to open MJPEG stream"
-                    self.error_occurred.emit(error_msg)
-                    self.status_update.emit("Disconnected")  # Emit status update
-                    print(f"[CAM{self.camera_id}] ❌ Failed to open: {self.stream_url}")
-
-                    if retry_count < max_retries:
-                        print(f"[CAM{self.camera_id}] Retrying in 2 seconds...")
-                        time.sleep(2)
-                    else:
-                        print(
-                            f"[CAM{self.camera_id}] Max retries reached, showing placeholder"
-                        )
-                        self._show_placeholder()
-                        return
-                    continue
-
-                print(f"[CAM{self.camera_id}] ✅ MJPEG stream opened successfully")
-                self.status_update.emit("Connected")  # Emit connected status
-                break
-
-            frame_timeout_count = 0
-            max_frame_timeout = 30
-            frame_skip_counter = 0
-            FRAME_SKIP = 1  # Less aggressive frame skipping for MJPEG
-
             while self.running:
-                ret, frame = self.cap.read()
-
-                if not ret:
-                    frame_timeout_count += 1
-                    if frame_timeout_count >= max_frame_timeout:
-                        print(
-                            f"[CAM{self.camera_id}] Too many frame read failures, reconnecting..."
-                        )
-                        # Try to reconnect
-                        if self.cap:
-                            self.cap.release()
-                        time.sleep(1)
-                        self.cap = cv2.VideoCapture(self.stream_url)
-                        if not self.cap.isOpened():
-                            self._show_placeholder()
-                            break
-                        frame_timeout_count = 0
-                    time.sleep(0.1)
+                # Backpressure: only process a frame once the GUI has
+                # acknowledged the previous one (the slot keeps the newest)
+                credit = self.credits.acquire(timeout=0.5)
+                if not credit:
                     continue
 
-                frame_timeout_count = 0
-
-                # Optional frame skipping for performance
-                frame_skip_counter += 1
-                if frame_skip_counter <= FRAME_SKIP:
+                if self._placeholder_pending:
+                    # Emitted here, not by the reader, so frames reach the GUI
+                    # in the order they were published
+                    self._placeholder_pending = False
+                    if not self._show_placeholder(credit):
+                        self.credits.give_back(credit, acknowledged=False)
                     continue
-                frame_skip_counter = 0
-
-                # Ensure consistent resolution (1920x1080 for HD)
-                if frame.shape[:2] != (1080, 1920):
-                    frame = cv2.resize(
-                        frame, (1920, 1080), interpolation=cv2.INTER_LINEAR
-                    )
-
-                # Flip camera if needed
-                frame = self._apply_flip(frame)
-
-                # Apply zoom if needed
-                if self.zoom_level > 1.0:
-                    frame = self._apply_zoom(frame)
-
-                # Apply object detection if enabled
-                if self.detection_enabled and self.detector:
-                    frame = self.detector.process_frame(frame)
-                    # Debug output every 100 frames
-                    if self.fps_counter % 100 == 0:
-                        print(
-                            f"[CAM{self.camera_id}] Detection running: {self.detector.mode}"
-                        )
-
-                # Add camera overlay
-                frame = self._add_camera_overlay(frame)
 
-                # Convert to QPixmap and emit
-                pixmap = self._frame_to_pixmap(frame)
-                self.frame_ready.emit(pixmap)
+                envelope = self.frame_slot.take(timeout=0.5)
+                if envelope is None:
+                    self.credits.give_back(credit, acknowledged=False)
+                    continue
 
-                # Store current frame for capture
-                self.current_frame = frame.copy()
+                try:
+                    with self.resources.process_slots:
+                        emitted = self._process_frame(envelope, credit)
+                except Exception as e:
+                    # A bad frame must not take the camera down
+                    error_msg = f"Camera {self.camera_id} processing error: {str(e)}"
+                    self.error_occurred.emit(error_msg)
+                    print(f"[CAM{self.camera_id}] ❌ {error_msg}")
+                    emitted = False
+                if not emitted:
+                    self.credits.give_back(credit, acknowledged=False)
+                self.processed_frames += 1
 
-                # Update FPS
+                # Update FPS and adapt the rate to the consumer
                 self.fps_counter += 1
-                if time.time() - self.fps_start_time >= 1.0:
-                    fps = self.fps_counter / (time.time() - self.fps_start_time)
+                elapsed = time.time() - self.fps_start_time
+                if elapsed >= 1.0:
+                    fps = self.fps_counter / elapsed
+                    self._adapt_frame_rate(elapsed)
                     self.fps_update.emit(fps)
+                    self.pipeline_stats.emit(self.get_pipeline_stats())
+                    self.latency_stats.emit(self.get_latency_stats())
+                    self.stage_stats.emit(self.get_stage_stats())
                     self.fps_counter = 0
                     self.fps_start_time = time.time()
 
-                time.sleep(0.01)
-
         except Exception as e:
             error_msg = f"Camera {self.camera_id} error: {str(e)}"
             self.error_occurred.emit(error_msg)
@@ -176,84 +316,614 @@ class CameraWorker(QThread):
             self._show_placeholder()
 
         finally:
-            if self.cap:
-                self.cap.release()
+            self.running = False
+            self._stop_event.set()
+            self.frame_slot.close()
+            if self._reader_thread:
+                # The reader releases the stream itself on its way out
+                self._reader_thread.join(timeout=self.open_timeout + 1.0)
+            with self._meta_lock:
+                self.frame_pool.reset()
+                self._in_flight_meta.clear()
+            self.transform.reset()
             print(f"[CAM{self.camera_id}] Stream closed")
 
-    def _show_placeholder(self):
-        """Show placeholder image when camera is unavailable."""
-        placeholder = np.zeros((1080, 1920, 3), dtype=np.uint8)
-
-        text = f"Camera {self.camera_id + 1} Unavailable"
-        cv2.putText(
-            placeholder,
-            text,
-            (100, 240),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1.2,
-            (100, 100, 100),
-            2,
+    def _reader_loop(self):
+        """
+        Reader thread: keep the stream open and drain it into the slot.
+        Never gives up: failed opens and dropped streams are retried with
+        jittered exponential backoff until the worker is stopped.
+        """
+        backoff = ReconnectBackoff()
+        frame_timeout_count = 0
+        max_frame_timeout = 30
+
+        try:
+            while self.running:
+                if self.cap is None:
+                    if not self._connect(backoff):
+                        continue
+                    frame_timeout_count = 0
+                elif self._opened_stream != self.active_stream():
+                    self._switch_stream()
+
+                try:
+                    ret, frame = self._read_next_frame()
+                except Exception as e:
+                    print(f"[CAM{self.camera_id}] ❌ Read error: {e}")
+                    ret, frame = False, None
+                    frame_timeout_count = max_frame_timeout
+
+                if not ret:
+                    frame_timeout_count += 1
+                    if (
+                        frame_timeout_count >= max_frame_timeout
+                        or not self.cap.isOpened()
+                    ):
+                        print(
+                            f"[CAM{self.camera_id}] Too many frame read failures, reconnecting..."
+                        )
+                        self._drop_connection()
+                    else:
+                        time.sleep(0.1)
+                    continue
+
+                frame_timeout_count = 0
+                self.last_frame_time = time.time()
+                self.frame_slot.put(self._read_envelope(frame))
+
+                # Re-estimate the Pi clock offset now and then (off-thread)
+                if time.time() - self._last_offset_check > self.offset_check_interval:
+                    self._last_offset_check = time.time()
+                    threading.Thread(
+                        target=self._update_clock_offset, daemon=True
+                    ).start()
+
+        finally:
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            self.frame_slot.close()
+
+    def _connect(self, backoff):
+        """
+        One connection attempt, bounded by open_timeout
+        Returns:
+            True if the stream is open; otherwise waits out the backoff delay
+        """
+        first = self.connection_state == CONNECTING and backoff.attempts == 0
+        self._set_connection_state(CONNECTING if first else RECONNECTING)
+        stream = self.active_stream()
+        print(f"[CAM{self.camera_id}] Opening stream (attempt {backoff.attempts + 1}): {stream[1]}")
+
+        cap = open_with_timeout(lambda: self._open_stream(stream[1]), self.open_timeout)
+        if cap is not None and cap.isOpened():
+            self.cap = cap
+            self._opened_stream = stream
+            self._apply_decode_scale()
+            self._placeholder_pending = False  # Back before it was shown
+            backoff.reset()
+            print(f"[CAM{self.camera_id}] ✅ Stream opened successfully")
+            self._set_connection_state(CONNECTED)
+            self.status_update.emit("Connected")
+            return True
+
+        if cap is not None:
+            cap.release()
+        delay = backoff.next_delay()
+        if self.connection_state != WAITING:
+            # First failure of this outage: tell the views once
+            self.error_occurred.emit(f"Camera {self.camera_id}: Failed to open stream")
+            self.status_update.emit("Disconnected")
+            self._placeholder_pending = True
+        print(f"[CAM{self.camera_id}] ❌ Failed to open, retrying in {delay:.1f}s")
+        self._set_connection_state(WAITING, retry_in=delay, attempts=backoff.attempts)
+        self._stop_event.wait(delay)
+        return False
+
+    def _switch_stream(self):
+        """
+        Move between the preview and the full stream without a gap: the new
+        stream is opened while the old one keeps delivering, then swapped in.
+        A failed open keeps the current stream and is retried shortly.
+        """
+        now = time.monotonic()
+        if now < self._next_switch_attempt:
+            return
+        stream = self.active_stream()
+        cap = open_with_timeout(lambda: self._open_stream(stream[1]), self.open_timeout)
+        if cap is None or not cap.isOpened():
+            if cap is not None:
+                cap.release()
+            self._next_switch_attempt = now + 2.0
+            print(f"[CAM{self.camera_id}] ❌ Could not open {stream[0]} stream, retrying")
+            return
+
+        old, self.cap = self.cap, cap
+        self._opened_stream = stream
+        self._apply_decode_scale()
+        old.release()
+        print(f"[CAM{self.camera_id}] Switched to {stream[0]} stream: {stream[1]}")
+
+    def active_stream(self):
+        """
+        Stream the worker should be reading
+        Returns:
+            ("preview", preview_url), or ("main", stream_url) while the full
+            stream is needed or there is no preview stream
+        """
+        if self.preview_url and not self.full_stream_needed:
+            return "preview", self.preview_url
+        return "main", self.stream_url
+
+    def set_full_stream(self, needed):
+        """
+        Ask for the full-resolution stream (recording) or let the worker go
+        back to the preview stream. Frames from the full stream carry
+        envelope.stream == "main"; the switch happens in the reader.
+        """
+        self.full_stream_needed = needed
+
+    def _drop_connection(self):
+        """Release a dead stream so the reader reconnects"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.status_update.emit("Disconnected")
+        self._set_connection_state(RECONNECTING)
+
+    def _set_connection_state(self, state, retry_in=None, attempts=0):
+        """Record and report the connection state"""
+        self.connection_state = state
+        self.connection_state_changed.emit(
+            {
+                "camera_id": self.camera_id,
+                "state": state,
+                "attempts": attempts,
+                "retry_in": retry_in,
+                "last_frame_time": self.last_frame_time,
+            }
         )
 
-        cv2.putText(
-            placeholder,
-            "Check network connection",
-            (140, 280),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.8,
-            (80, 80, 80),
-            1,
+    def get_connection_state(self):
+        """
+        Get the connection state
+        Returns:
+            dict with state, last_frame_time (epoch seconds, 0 if never) and
+            seconds since the last good frame (None if never)
+        """
+        last = self.last_frame_time
+        return {
+            "camera_id": self.camera_id,
+            "state": self.connection_state,
+            "last_frame_time": last,
+            "last_frame_age": time.time() - last if last else None,
+        }
+
+    def _build_pipeline(self):
+        """Default stage order: transform -> detect -> scale -> overlay"""
+        return ProcessingPipeline(
+            [
+                ProcessingStage("transform", self._stage_transform),
+                ProcessingStage("detect", self._stage_detect),
+                ProcessingStage("scale", self._stage_scale),
+                ProcessingStage("overlay", self._stage_overlay),
+            ]
         )
 
-        pixmap = self._frame_to_pixmap(placeholder)
-        self.frame_ready.emit(pixmap)
-
-    def _apply_flip(self, frame):
-        """Apply camera flip transformations."""
-        if self.flip_horizontal and self.flip_vertical:
-            # Flip both horizontally and vertically (180 degree rotation)
-            frame = cv2.flip(frame, -1)
-        elif self.flip_horizontal:
-            # Flip horizontally (mirror)
-            frame = cv2.flip(frame, 1)
-        elif self.flip_vertical:
-            # Flip vertically
-            frame = cv2.flip(frame, 0)
+    def _process_frame(self, envelope, credit=None):
+        """
+        Processor stage: run the pipeline, then emit the frame.
+        Stages work on plain arrays; the envelope is in context["envelope"].
+        credit is returned when the GUI acknowledges the frame.
+        Returns:
+            True if a frame was emitted to the GUI
+        """
+        context = {"envelope": envelope, "detection": None, "detect_size": None}
+        frame = self.pipeline.run(envelope.image, context)
+        if frame is None:
+            return False
+        envelope.image = frame
+        envelope.process_time = time.time()
+
+        # Publish via the buffer pool (also becomes the current frame)
+        start = time.perf_counter()
+        emitted = self._emit_frame(frame, envelope=envelope, credit=credit)
+        self.stage_times["emit"].add((time.perf_counter() - start) * 1000.0)
+        return emitted
+
+    def _detection_active(self):
+        """True if detection runs on this frame"""
+        return (
+            self.detection_enabled
+            and self.detector is not None
+            and self.pipeline.is_stage_enabled("detect")
+        )
+
+    def _stage_transform(self, frame, context):
+        """Mirror, digital zoom and (when possible) display resize in one pass"""
+        height, width = frame.shape[:2]
+        source_size = (width, height)
+        flip_h, flip_v, zoom = self.flip_horizontal, self.flip_vertical, self.zoom_level
+        envelope = context["envelope"]
+        if flip_h or flip_v:
+            envelope.add_transform("mirror", (flip_h, flip_v))
+        if zoom > 1.0:
+            envelope.add_transform("zoom", zoom)
+
+        if self.keep_full_frame:
+            # Recording needs the oriented frame at source resolution; it is
+            # retained until the next frame, so it alternates between two
+            # pooled buffers instead of the shared transform buffer
+            frame = self.transform.apply(
+                frame, source_size, flip_h, flip_v, zoom, out=self._next_full_buffer(frame)
+            )
+            with self._full_lock:
+                self._full_frame = frame
+                self._full_envelope = envelope.with_image(frame)
+            return frame
+
+        if self._full_frame is not None:
+            with self._full_lock:
+                self._full_frame = None
+                self._full_envelope = None
+        if self._detection_active():
+            # Detector thresholds are in source pixels: keep the zoomed region
+            # at native resolution (no upscale) and resize for display after
+            return self.transform.apply(frame, None, flip_h, flip_v, zoom)
+
+        # Fused path: mirror, zoom and display resize in one resample
+        crop_w, crop_h = FrameTransform.crop_size(width, height, zoom)
+        out_size = fit_size(crop_w, crop_h, self.get_display_size())
+        if out_size != (crop_w, crop_h):
+            envelope.add_transform("resize", out_size)
+        return self.transform.apply(frame, out_size, flip_h, flip_v, zoom)
+
+    def _next_full_buffer(self, frame):
+        """The full-resolution buffer not currently published, sized for frame"""
+        index = self._full_index
+        self._full_index = 1 - index
+        buf = self._full_buffers[index]
+        if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+            buf = self._full_buffers[index] = np.empty_like(frame)
+        return buf
+
+    def _stage_detect(self, frame, context):
+        """Object detection (returns overlay data, frame untouched)"""
+        if self.detection_enabled and self.detector:
+            context["detection"] = self.detector.analyze(frame)
+            context["detect_size"] = (frame.shape[1], frame.shape[0])
+            # Debug output every 100 frames
+            if self.fps_counter % 100 == 0:
+                print(f"[CAM{self.camera_id}] Detection running: {self.detector.mode}")
         return frame
 
-    def _add_camera_overlay(self, frame):
-        """Add simple camera ID overlay."""
-        # Camera ID badge
-        cv2.rectangle(frame, (5, 5), (120, 35), (0, 0, 0), -1)
-        cv2.rectangle(frame, (5, 5), (120, 35), (255, 136, 0), 2)
-        cv2.putText(
-            frame,
-            f"CAM {self.camera_id + 1}",
-            (15, 25),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
-            (255, 136, 0),
-            2,
+    def _stage_scale(self, frame, context):
+        """Resize to the display size (no-op after the fused transform)"""
+        scaled = self._scale_to_display(frame)
+        if scaled is not frame:
+            context["envelope"].add_transform("resize", (scaled.shape[1], scaled.shape[0]))
+        return scaled
+
+    def _stage_overlay(self, frame, context):
+        """HUD data for the view layer - nothing is drawn into the frame"""
+        self.overlay_ready.emit(
+            self._build_overlay(context["detection"], context["detect_size"])
         )
         return frame
 
-    def _frame_to_pixmap(self, frame):
-        """Convert OpenCV frame to QPixmap."""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_frame.shape
-        bytes_per_line = ch * w
-
-        q_image = QImage(
-            rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888
+    def _read_next_frame(self):
+        """
+        Read the next frame at the rate the consumer and the fps budget allow.
+        The MJPEG reader is paced (frames arriving meanwhile are drained
+        without decoding); a VideoCapture grabs frames without decoding until
+        the next read is due. Decoding holds a shared decode slot.
+        """
+        cap = self.cap
+        fps = self.get_reader_fps()
+        if isinstance(cap, MJPEGStreamReader):
+            if fps:
+                wait = self._next_read_time - time.monotonic()
+                if wait > 0:
+                    time.sleep(min(wait, 0.5))
+                self._next_read_time = time.monotonic() + 1.0 / fps
+            return cap.read()
+
+        for _ in range(self.frame_skip):
+            if not cap.grab():
+                break
+            self._frames_grabbed += 1
+        if fps:
+            while time.monotonic() < self._next_read_time and cap.grab():
+                self._frames_grabbed += 1
+            self._next_read_time = time.monotonic() + 1.0 / fps
+
+        if not cap.grab():
+            return False, None
+        self._frames_grabbed += 1
+        with self.resources.decode_slots:
+            return cap.retrieve()
+
+    def get_reader_fps(self):
+        """Reader pace: the adaptive target capped by the camera's fps budget"""
+        rates = [fps for fps in (self.target_fps, self.max_fps) if fps]
+        return min(rates) if rates else None
+
+    def _input_frame_count(self):
+        """Frames delivered by the stream so far (decoded or not)"""
+        cap = self.cap
+        if isinstance(cap, MJPEGStreamReader):
+            return cap.frames_received
+        return self._frames_grabbed
+
+    def _adapt_frame_rate(self, elapsed):
+        """
+        Match the processing rate to the measured consumer (GUI) rate.
+        When the processor spends a significant share of the interval waiting
+        for credits, the GUI is the bottleneck: lower target_fps to just above
+        the acknowledge rate and raise frame_skip accordingly. Otherwise
+        relax both step by step back to full rate.
+        """
+        credits = self.credits.get_stats()
+        sample = (credits["acks"], credits["wait_time"], self._input_frame_count())
+        previous, self._rate_sample = self._rate_sample, sample
+        if previous is None:
+            return
+
+        acks = sample[0] - previous[0]
+        waited = sample[1] - previous[1]
+        frames_in = max(0, sample[2] - previous[2])
+        self.consumer_fps = acks / elapsed
+        input_fps = frames_in / elapsed
+
+        if waited / elapsed > self.gui_bound_threshold and self.consumer_fps > 0:
+            target = max(self.min_target_fps, self.consumer_fps * 1.1)
+            self.target_fps = target
+            if input_fps > target:
+                skip = int(np.ceil(input_fps / target)) - 1
+                self.frame_skip = min(self.max_frame_skip, skip)
+        elif self.target_fps is not None or self.frame_skip:
+            self.frame_skip = max(0, self.frame_skip - 1)
+            if self.target_fps is not None:
+                self.target_fps *= 1.25
+                if input_fps and self.target_fps >= input_fps * 1.25:
+                    self.target_fps = None
+
+    def _read_envelope(self, frame):
+        """Wrap the frame just read with its timestamps and sequence number"""
+        self._read_seq += 1
+        if isinstance(self.cap, MJPEGStreamReader):
+            self.stage_times["decode"].add(self.cap.last_decode_ms)
+        return read_envelope(
+            self.cap, frame, self.camera_id, self._read_seq, self._opened_stream[0]
         )
 
-        return QPixmap.fromImage(q_image)
+    def _update_clock_offset(self):
+        """Estimate Pi-to-ground clock offset via the camera server /status route"""
+        if not self.stream_url.startswith("http"):
+            return
+        offset, rtt = estimate_clock_offset(status_url_for(self.stream_url))
+        if offset is not None:
+            self.clock_offset = offset
+            print(
+                f"[CAM{self.camera_id}] Clock offset {offset * 1000.0:+.1f} ms (rtt {rtt * 1000.0:.1f} ms)"
+            )
+
+    def _open_stream(self, url):
+        """
+        Open a camera stream
+        Plain HTTP MJPEG feeds use the native latest-frame-wins reader;
+        RTP (rtp:// or .sdp) and anything else go through OpenCV/FFmpeg.
+        """
+        if self.use_native_reader and url.startswith("http://"):
+            return MJPEGStreamReader(url, decode_slots=self.resources.decode_slots)
+        return open_video_capture(url, self.open_timeout)
+
+    def get_stream_stats(self):
+        """Get reader counters (received/decoded/dropped frames, bytes)"""
+        if isinstance(self.cap, MJPEGStreamReader):
+            return self.cap.get_stats()
+        return {}
+
+    def get_pipeline_stats(self):
+        """
+        Get reader/processor handoff counters
+        Returns:
+            dict with slot depth and drops, stream drops, GUI backlog, credits
+            and the adapted rate (consumer_fps, target_fps, frame_skip)
+        """
+        slot = self.frame_slot.get_stats()
+        stream = self.get_stream_stats()
+        credits = self.credits.get_stats()
+        return {
+            "camera_id": self.camera_id,
+            "slot_depth": slot["depth"],
+            "slot_drops": slot["drops"],
+            "frames_read": slot["puts"],
+            "frames_processed": self.processed_frames,
+            "stream_drops": stream.get("dropped_frames", 0),
+            "pool_drops": self.frame_pool.dropped,
+            "gui_in_flight": self.frame_pool.in_flight(),
+            "credits": credits["credits"],
+            "credit_reclaims": credits["reclaimed"],
+            "consumer_fps": self.consumer_fps,
+            "target_fps": self.target_fps,
+            "max_fps": self.max_fps,
+            "frame_skip": self.frame_skip,
+        }
+
+    def _show_placeholder(self, credit=None):
+        """
+        Show placeholder image when camera is unavailable (processor thread only)
+        Returns:
+            True if the placeholder was emitted
+        """
+        size = self.get_display_size()
+        if self._placeholder is None or self._placeholder[0] != size:
+            self._placeholder = (size, scale_to_fit(placeholder_frame(self.camera_id), size))
+
+        self.overlay_ready.emit(self._build_overlay())
+        return self._emit_frame(self._placeholder[1], store_current=False, credit=credit)
+
+    def _build_overlay(self, detection=None, frame_size=None):
+        """
+        Build HUD overlay data (camera badge, zoom, detections)
+        Detection boxes are in frame_size coordinates; the view scales them.
+        """
+        return {
+            "camera_id": self.camera_id,
+            "badge": f"CAM {self.camera_id + 1}",
+            "zoom": self.zoom_level,
+            "frame_size": frame_size,
+            "detection": detection,
+        }
+
+    def _emit_frame(self, frame, store_current=True, envelope=None, credit=None):
+        """
+        Copy frame into a pooled buffer and emit a zero-copy QImage over it.
+        Drops the frame if the GUI still holds every buffer. credit (if the
+        frame took one) goes back to the credits when the GUI acknowledges it.
+        """
+        buf = self.frame_pool.acquire(frame.shape)
+        if buf is None:
+            return False
+
+        np.copyto(buf.array, frame)
+        if envelope is not None:
+            # From here on the envelope refers to the pooled copy
+            envelope.image = buf.array
+        with self._meta_lock:
+            image = self.frame_pool.publish(buf)
+            self._in_flight_meta.append((envelope, credit))
+
+        if store_current:
+            with self._current_lock:
+                previous = self._current_buffer
+                self._current_buffer = buf
+                self._current_envelope = envelope
+            self.frame_pool.release(previous)
+        else:
+            self.frame_pool.release(buf)
+
+        self.frame_ready.emit(image)
+        return True
+
+    def frame_consumed(self):
+        """Called by the GUI once the last emitted QImage has been converted"""
+        with self._meta_lock:
+            self.frame_pool.consume()
+            envelope, credit = (
+                self._in_flight_meta.popleft() if self._in_flight_meta else (None, None)
+            )
+        if credit is not None:
+            self.credits.give_back(credit)
+        self._record_display(envelope)
+
+    def _record_display(self, envelope):
+        """Stamp the display time of a shown frame and add it to the latency stats"""
+        if envelope is None:
+            return
+        now = time.time()
+        envelope.display_time = now
+        self.ground_latency.add((now - envelope.receive_time) * 1000.0)
+        if envelope.capture_time is not None and self.clock_offset is not None:
+            # Convert the Pi capture time to the ground clock
+            latency = now - envelope.source_time(self.clock_offset)
+            self.glass_latency.add(latency * 1000.0)
+
+    def get_latency_stats(self):
+        """
+        Get latency percentiles and per-stage timings (milliseconds)
+        Returns:
+            dict with glass_to_glass, ground, stages, sequence_gaps, clock_offset_ms
+        """
+        stream = self.get_stream_stats()
+        return {
+            "camera_id": self.camera_id,
+            "glass_to_glass": self.glass_latency.percentiles(),
+            "ground": self.ground_latency.percentiles(),
+            "stages": {
+                "decode": self.stage_times["decode"].percentiles(),
+                **self.pipeline.get_timings(),
+                "emit": self.stage_times["emit"].percentiles(),
+            },
+            "sequence_gaps": stream.get("sequence_gaps", 0),
+            "clock_offset_ms": (
+                self.clock_offset * 1000.0 if self.clock_offset is not None else None
+            ),
+        }
+
+    def get_stage_stats(self):
+        """
+        Get processing stage stats
+        Returns:
+            dict of stage name -> {enabled, mean_ms, p95_ms, runs, skipped}
+        """
+        return {
+            "camera_id": self.camera_id,
+            "stages": self.pipeline.get_stats(),
+            "frames_dropped": self.pipeline.frames_dropped,
+        }
+
+    def add_stage(self, stage, before=None, after=None):
+        """Register an extra processing stage (e.g. enhancement, stabilisation)"""
+        self.pipeline.add_stage(stage, before=before, after=after)
+        print(f"[CAM{self.camera_id}] Stage added: {stage.name}")
+
+    def remove_stage(self, name):
+        """Unregister a processing stage"""
+        return self.pipeline.remove_stage(name)
+
+    def set_stage_enabled(self, name, enabled):
+        """Turn a processing stage on or off while running"""
+        if not self.pipeline.set_stage_enabled(name, enabled):
+            print(f"[CAM{self.camera_id}] Unknown stage: {name}")
+            return False
+        print(f"[CAM{self.camera_id}] Stage {name} {'enabled' if enabled else 'disabled'}")
+        return True
+
+    @property
+    def current_frame(self):
+        """
+        Latest processed frame (full resolution if kept, else the display
+        frame); a live buffer - use get_frame() for a copy to keep
+        """
+        full = self._full_frame
+        if full is not None:
+            return full
+        buf = self._current_buffer
+        return buf.array if buf is not None else None
 
     def get_frame(self):
         """Get current frame for capture"""
-        if self.current_frame is not None:
-            return self.current_frame.copy()
-        return None
+        envelope = self.get_frame_envelope()
+        return envelope.image if envelope is not None else None
+
+    def get_frame_envelope(self):
+        """
+        Get a copy of the current frame with its envelope
+        Returns:
+            FrameEnvelope owning a copied image (full resolution if kept), or None
+        """
+        with self._full_lock:
+            full = self._full_envelope
+            if full is not None:
+                # Copied under the lock: the worker reuses the buffer two frames on
+                return full.with_image(full.image.copy())
+
+        with self._current_lock:
+            buf = self._current_buffer
+            envelope = self._current_envelope
+            if buf is None:
+                return None
+            self.frame_pool.retain(buf)
+        try:
+            image = buf.array.copy()
+        finally:
+            self.frame_pool.release(buf)
+        if envelope is None:
+            return FrameEnvelope(image, self.camera_id)
+        return envelope.with_image(image)
 
     def set_flip(self, horizontal=None, vertical=None):
         """
@@ -308,117 +978,81 @@ class CameraWorker(QThread):
         print(f"[CAM{self.camera_id}] Zoom reset to 1.0x")
         return self.zoom_level
 
-    def _apply_zoom(self, frame):
-        """Apply digital zoom to frame by cropping and resizing"""
-        if self.zoom_level <= 1.0:
-            return frame
-
-        height, width = frame.shape[:2]
-
-        # Calculate crop dimensions (smaller region = more zoom)
-        crop_width = int(width / self.zoom_level)
-        crop_height = int(height / self.zoom_level)
-
-        # Calculate crop center (center of frame)
-        start_x = (width - crop_width) // 2
-        start_y = (height - crop_height) // 2
+    def set_display_size(self, width, height):
+        """
+        Set the size of the widget showing this camera (thread-safe)
+        Pass width/height <= 0 to emit frames at source resolution.
+        """
+        with self._display_lock:
+            if width > 0 and height > 0:
+                self._display_size = (int(width), int(height))
+            else:
+                self._display_size = None
+
+    def get_display_size(self):
+        """Get the current target display size (or None)"""
+        with self._display_lock:
+            return self._display_size
+
+    def set_keep_full_frame(self, enabled):
+        """Keep the full-resolution frame for capture/recording"""
+        self.keep_full_frame = enabled
+        if not enabled:
+            with self._full_lock:
+                self._full_frame = None
+                self._full_envelope = None
+            self._full_buffers = [None, None]
+        self._apply_decode_scale()
+
+    def set_max_fps(self, max_fps):
+        """
+        Set this camera's fps budget
+        Args:
+            max_fps: Highest rate frames are decoded at; None or 0 = uncapped
+        """
+        self.max_fps = float(max_fps) if max_fps else None
+        self._next_read_time = 0.0
 
-        # Crop the center region
-        cropped = frame[start_y : start_y + crop_height, start_x : start_x + crop_width]
+    def set_decode_scale(self, scale):
+        """
+        Set preview JPEG decode scale
+        Args:
+            scale: 1 (full), 2, 4 or 8 - decode directly at 1/scale resolution
+        """
+        if scale not in DECODE_SCALE_FLAGS:
+            print(f"[CAM{self.camera_id}] Invalid decode scale: {scale}")
+            return
+        self.decode_scale = scale
+        self._apply_decode_scale()
+
+    def set_main_view(self, is_main):
+        """Mark this camera as shown in the main view (forces full decode)"""
+        self.is_main_view = is_main
+        self._apply_decode_scale()
+
+    def get_effective_decode_scale(self):
+        """
+        Decode scale actually in use (full when main view or recording, and
+        for the already small preview stream)
+        """
+        if self.is_main_view or self.keep_full_frame or self.active_stream()[0] == "preview":
+            return 1
+        return self.decode_scale
 
-        # Resize back to original dimensions
-        zoomed = cv2.resize(cropped, (width, height), interpolation=cv2.INTER_LINEAR)
+    def _apply_decode_scale(self):
+        """Push the effective decode scale to the stream reader"""
+        cap = self.cap
+        if isinstance(cap, MJPEGStreamReader):
+            cap.decode_flags = DECODE_SCALE_FLAGS[self.get_effective_decode_scale()]
 
-        return zoomed
+    def _scale_to_display(self, frame):
+        """Resample frame once to fit the display size, keeping aspect ratio"""
+        return scale_to_fit(frame, self.get_display_size())
 
     def stop(self):
         """Stop the camera thread."""
         self.running = False
+        self._stop_event.set()
+        self.frame_slot.close()
+        self.credits.close()
         self.wait()
-
-
-class DualCameraManager:
-    """
-    Manages two camera workers for dual camera setup with MJPEG streams.
-    """
-
-    def __init__(
-        self, stream_url0, stream_url1, flip_horizontal=True, flip_vertical=False
-    ):
-        self.camera0 = CameraWorker(
-            stream_url0,
-            camera_id=0,
-            flip_horizontal=flip_horizontal,
-            flip_vertical=flip_vertical,
-        )
-        self.camera1 = CameraWorker(
-            stream_url1,
-            camera_id=1,
-            flip_horizontal=flip_horizontal,
-            flip_vertical=flip_vertical,
-        )
-
-        self.cameras = [self.camera0, self.camera1]
-
-    def start_all(self):
-        """Start both camera streams."""
-        for cam in self.cameras:
-            cam.start()
-
-    def stop_all(self):
-        """Stop both camera streams."""
-        for cam in self.cameras:
-            cam.stop()
-
-    def set_flip_all(self, horizontal=None, vertical=None):
-        """Set flip settings for all cameras"""
-        for cam in self.cameras:
-            cam.set_flip(horizontal, vertical)
-
-    def set_flip_camera(self, camera_id, horizontal=None, vertical=None):
-        """Set flip settings for specific camera"""
-        if 0 <= camera_id < len(self.cameras):
-            self.cameras[camera_id].set_flip(horizontal, vertical)
-
-    def zoom_in_camera(self, camera_id):
-        """Zoom in on specific camera"""
-        if 0 <= camera_id < len(self.cameras):
-            return self.cameras[camera_id].zoom_in()
-        return 1.0
-
-    def zoom_out_camera(self, camera_id):
-        """Zoom out on specific camera"""
-        if 0 <= camera_id < len(self.cameras):
-            return self.cameras[camera_id].zoom_out()
-        return 1.0
-
-    def reset_zoom_camera(self, camera_id):
-        """Reset zoom on specific camera"""
-        if 0 <= camera_id < len(self.cameras):
-            return self.cameras[camera_id].reset_zoom()
-        return 1.0
-
-    def zoom_in_all(self):
-        """Zoom in on all cameras"""
-        for cam in self.cameras:
-            cam.zoom_in()
-
-    def zoom_out_all(self):
-        """Zoom out on all cameras"""
-        for cam in self.cameras:
-            cam.zoom_out()
-
-    def reset_zoom_all(self):
-        """Reset zoom on all cameras"""
-        for cam in self.cameras:
-            cam.reset_zoom()
-
-    def toggle_all_detection(self, enabled):
-        """Toggle detection on all cameras"""
-        for cam in self.cameras:
-            if enabled:
-                cam.enable_detection()
-            else:
-                cam.disable_detection()
-        status = "enabled" if enabled else "disabled"
-        print(f"[CAM_MGR] Detection {status} on all cameras")
@@ -0,0 +1,117 @@
+"""
+Frame Buffer Pool Module
+Preallocated, reference-counted frame buffers shared between camera workers and the GUI
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+from PyQt6.QtGui import QImage
+
+
+class FrameBuffer:
+    """
+    A single pooled BGR frame buffer.
+    The buffer is only written by the worker while nobody else holds a reference.
+    """
+
+    def __init__(self, shape):
+        self.array = np.empty(shape, dtype=np.uint8)
+        self.refcount = 0
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    def to_qimage(self):
+        """Wrap the buffer in a QImage without copying (BGR888, no colour conversion)."""
+        h, w = self.array.shape[:2]
+        return QImage(
+            self.array.data, w, h, self.array.strides[0], QImage.Format.Format_BGR888
+        )
+
+
+class FrameBufferPool:
+    """
+    Fixed set of preallocated frame buffers.
+
+    The worker acquires a free buffer, fills it and hands out references
+    (current frame for capture, in-flight QImage for display). A buffer
+    goes back to the free list once every reference has been released.
+    """
+
+    def __init__(self, size=4):
+        self.size = size
+        self._lock = threading.Lock()
+        self._buffers = []
+        self._in_flight = deque()
+        self.dropped = 0
+
+    def acquire(self, shape):
+        """
+        Get a free buffer of the given shape with a refcount of 1
+        Returns:
+            FrameBuffer, or None if every buffer is still referenced
+        """
+        with self._lock:
+            for buf in self._buffers:
+                if buf.refcount == 0:
+                    if buf.shape != shape:
+                        # Resolution changed - reallocate this slot in place
+                        buf.array = np.empty(shape, dtype=np.uint8)
+                    buf.refcount = 1
+                    return buf
+
+            if len(self._buffers) < self.size:
+                buf = FrameBuffer(shape)
+                buf.refcount = 1
+                self._buffers.append(buf)
+                return buf
+
+            self.dropped += 1
+            return None
+
+    def retain(self, buf):
+        """Add a reference to a buffer"""
+        with self._lock:
+            buf.refcount += 1
+
+    def release(self, buf):
+        """Drop a reference to a buffer"""
+        if buf is None:
+            return
+        with self._lock:
+            if buf.refcount > 0:
+                buf.refcount -= 1
+
+    def publish(self, buf):
+        """
+        Mark a buffer as in flight to the GUI and return a zero-copy QImage over it
+        The GUI must call consume() once it has converted the image.
+        """
+        with self._lock:
+            buf.refcount += 1
+            self._in_flight.append(buf)
+        return buf.to_qimage()
+
+    def consume(self):
+        """Release the oldest in-flight buffer (queued signals arrive in order)"""
+        with self._lock:
+            if self._in_flight:
+                buf = self._in_flight.popleft()
+                if buf.refcount > 0:
+                    buf.refcount -= 1
+
+    def in_flight(self):
+        """Number of frames emitted but not yet consumed by the GUI"""
+        with self._lock:
+            return len(self._in_flight)
+
+    def reset(self):
+        """Forget in-flight frames (e.g. when the consumer disconnects)"""
+        with self._lock:
+            while self._in_flight:
+                buf = self._in_flight.popleft()
+                if buf.refcount > 0:
+                    buf.refcount -= 1
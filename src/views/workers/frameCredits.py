@@ -0,0 +1,136 @@
+"""
+Frame Credits Module
+Credit-based backpressure between a camera worker and the GUI that shows it
+"""
+
+import threading
+import time
+
+
+class FrameCredits:
+    """
+    The worker must take a credit before emitting a frame; the GUI gives it
+    back when it acknowledges the frame (CameraWorker.frame_consumed). With
+    one credit, at most one frame is ever queued in the Qt event loop.
+
+    A credit that is not returned within reclaim_after seconds is taken back
+    so a consumer that never acknowledges cannot freeze the stream. Credits
+    are numbered, so a late ack for a reclaimed credit is ignored instead of
+    freeing one that is still outstanding.
+    """
+
+    def __init__(self, credits=1, reclaim_after=1.0):
+        self.max_credits = credits
+        self.reclaim_after = reclaim_after
+        self._cond = threading.Condition()
+        self._available = credits
+        self._taken_at = {}  # credit id -> monotonic time it was handed out (oldest first)
+        self._next_id = 1
+        self._closed = False
+
+        self.acks = 0
+        self.reclaimed = 0
+        self.late_acks = 0  # Acks for credits already reclaimed
+        self.wait_time = 0.0  # Seconds spent waiting for the consumer
+
+    def _reclaim_expired(self, now):
+        """Take back credits outstanding for reclaim_after or longer (lock held)"""
+        for credit, taken_at in list(self._taken_at.items()):
+            if now - taken_at < self.reclaim_after:
+                break
+            # Consumer went quiet - take the credit back
+            del self._taken_at[credit]
+            self._available += 1
+            self.reclaimed += 1
+
+    def _oldest(self):
+        """Hand-out time of the oldest outstanding credit (lock held)"""
+        return next(iter(self._taken_at.values()), None)
+
+    def _take(self, now):
+        credit = self._next_id
+        self._next_id += 1
+        self._available -= 1
+        self._taken_at[credit] = now
+        return credit
+
+    def acquire(self, timeout=None):
+        """
+        Wait for a credit and take it
+        A credit's age counts from when it was handed out, across calls, so
+        a producer polling with short timeouts still gets it back.
+        Returns:
+            Id of the credit taken (pass it to give_back), or None on
+            timeout/close
+        """
+        with self._cond:
+            start = time.monotonic()
+            self._reclaim_expired(start)
+            if self._available > 0:
+                return self._take(start)
+
+            deadline = None if timeout is None else start + timeout
+            while not self._closed:
+                now = time.monotonic()
+                self._reclaim_expired(now)
+                if self._available > 0 or (deadline is not None and now >= deadline):
+                    break
+                oldest = self._oldest()
+                wait_until = None if oldest is None else oldest + self.reclaim_after
+                if deadline is not None:
+                    wait_until = deadline if wait_until is None else min(deadline, wait_until)
+                self._cond.wait(None if wait_until is None else wait_until - now)
+
+            now = time.monotonic()
+            self.wait_time += now - start
+            if self._available <= 0 or self._closed:
+                return None
+            return self._take(now)
+
+    def give_back(self, credit, acknowledged=True):
+        """
+        Return a credit
+        Args:
+            credit: Id returned by acquire; ignored if it was already
+                reclaimed (or the credits were reset since)
+            acknowledged: False when the frame was never emitted
+        """
+        with self._cond:
+            if acknowledged:
+                self.acks += 1
+            if self._taken_at.pop(credit, None) is None:
+                if acknowledged:
+                    self.late_acks += 1
+                return
+            self._available += 1
+            self._cond.notify()
+
+    def available(self):
+        """Credits currently available"""
+        with self._cond:
+            return self._available
+
+    def close(self):
+        """Wake up a waiting producer"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reset(self):
+        """Restore all credits so the worker can run again"""
+        with self._cond:
+            self._available = self.max_credits
+            self._taken_at.clear()
+            self._closed = False
+
+    def get_stats(self):
+        """Get credit counters"""
+        with self._cond:
+            return {
+                "credits": self._available,
+                "acks": self.acks,
+                "reclaimed": self.reclaimed,
+                "late_acks": self.late_acks,
+                "wait_time": self.wait_time,
+            }
+
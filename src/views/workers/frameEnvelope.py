@@ -0,0 +1,94 @@
+"""
+Frame Envelope Module
+Per-frame timing and provenance record that travels with the pixel buffer
+"""
+
+import time
+
+
+class FrameEnvelope:
+    """
+    A frame buffer plus where it came from and when.
+
+    Timestamps are time.time() seconds. capture_time is on the Pi clock (from
+    the X-Timestamp part header) and may be None; all other times are on the
+    ground clock. The image is referenced, never copied: stages replace it as
+    the frame is transformed, and transforms records what was applied as
+    (name, value) pairs. stream is the camera stream the frame came from:
+    "main" (full resolution) or "preview" (the Pi's lores stream).
+    """
+
+    __slots__ = (
+        "image",
+        "camera_id",
+        "stream",
+        "seq",
+        "capture_time",
+        "receive_time",
+        "decode_time",
+        "process_time",
+        "display_time",
+        "transforms",
+    )
+
+    def __init__(
+        self,
+        image=None,
+        camera_id=0,
+        seq=None,
+        capture_time=None,
+        receive_time=None,
+        decode_time=None,
+        stream="main",
+    ):
+        self.image = image
+        self.camera_id = camera_id
+        self.stream = stream
+        self.seq = seq
+        self.capture_time = capture_time
+        self.receive_time = receive_time if receive_time is not None else time.time()
+        self.decode_time = decode_time
+        self.process_time = None
+        self.display_time = None
+        self.transforms = ()
+
+    def add_transform(self, name, value):
+        """Record a transform applied to the image"""
+        self.transforms += ((name, value),)
+
+    def source_time(self, clock_offset=None):
+        """
+        Best estimate of when the frame was captured, on the ground clock
+        Args:
+            clock_offset: Pi clock minus ground clock, seconds (None if unknown)
+        """
+        if self.capture_time is not None and clock_offset is not None:
+            return self.capture_time - clock_offset
+        return self.receive_time
+
+    def with_image(self, image):
+        """New envelope with the same metadata around another buffer"""
+        envelope = FrameEnvelope.__new__(FrameEnvelope)
+        for name in self.__slots__:
+            setattr(envelope, name, getattr(self, name))
+        envelope.image = image
+        return envelope
+
+    def to_dict(self):
+        """Metadata only (no image), for logs and telemetry"""
+        return {name: getattr(self, name) for name in self.__slots__ if name != "image"}
+
+    def __getstate__(self):
+        # The image is not sent between processes (shared memory carries it)
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.image = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return (
+            f"FrameEnvelope(camera_id={self.camera_id}, stream={self.stream}, seq={self.seq}, "
+            f"receive_time={self.receive_time:.3f}, transforms={self.transforms})"
+        )
@@ -0,0 +1,151 @@
+"""
+Frame Transform Module
+Fused mirror + digital zoom + resize as a single affine resample
+"""
+
+import cv2
+import numpy as np
+
+
+def fit_size(width, height, target_size):
+    """
+    Largest size with the aspect ratio of width x height that fits target_size
+    Returns:
+        (width, height); the input size if target_size is None
+    """
+    if target_size is None:
+        return max(1, int(width)), max(1, int(height))
+    scale = min(target_size[0] / width, target_size[1] / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def scale_to_fit(frame, target_size):
+    """Resample frame once to fit target_size, keeping aspect ratio"""
+    if target_size is None:
+        return frame
+
+    height, width = frame.shape[:2]
+    out_w, out_h = fit_size(width, height, target_size)
+    if (out_w, out_h) == (width, height):
+        return frame
+
+    interpolation = cv2.INTER_AREA if out_w < width else cv2.INTER_LINEAR
+    return cv2.resize(frame, (out_w, out_h), interpolation=interpolation)
+
+
+class FrameTransform:
+    """
+    Maps a source frame to an output frame in one pass.
+
+    Horizontal/vertical mirror, centre crop for digital zoom and scaling to
+    the output size are folded into one 2x3 affine matrix and applied with a
+    single cv2.warpAffine into a destination buffer that is reused while the
+    output size stays the same. The matrix is cached per parameter set.
+    """
+
+    def __init__(self, interpolation=cv2.INTER_LINEAR):
+        self.interpolation = interpolation
+        self._dst = None
+        self._key = None
+        self._matrix = None
+
+    @staticmethod
+    def crop_size(width, height, zoom):
+        """Size of the centre region shown at the given zoom level"""
+        zoom = max(1.0, zoom)
+        return max(1, int(width / zoom)), max(1, int(height / zoom))
+
+    def matrix(self, src_size, out_size, flip_horizontal, flip_vertical, zoom):
+        """
+        Affine matrix mapping source pixels to output pixels
+        Pixel centres are aligned, so a pure resize matches cv2.resize.
+        """
+        key = (src_size, out_size, flip_horizontal, flip_vertical, zoom)
+        if key == self._key:
+            return self._matrix
+
+        width, height = src_size
+        out_w, out_h = out_size
+        crop_w, crop_h = self.crop_size(width, height, zoom)
+        x0 = (width - crop_w) // 2
+        y0 = (height - crop_h) // 2
+
+        sx = out_w / crop_w
+        sy = out_h / crop_h
+        tx = (0.5 - x0) * sx - 0.5
+        ty = (0.5 - y0) * sy - 0.5
+        if flip_horizontal:
+            sx, tx = -sx, out_w - 1 - tx
+        if flip_vertical:
+            sy, ty = -sy, out_h - 1 - ty
+
+        self._matrix = np.array([[sx, 0.0, tx], [0.0, sy, ty]], dtype=np.float64)
+        self._key = key
+        return self._matrix
+
+    def apply(
+        self,
+        frame,
+        out_size=None,
+        flip_horizontal=False,
+        flip_vertical=False,
+        zoom=1.0,
+        reuse=True,
+        out=None,
+    ):
+        """
+        Transform frame in a single resample
+        Args:
+            frame: Source BGR frame
+            out_size: (width, height) of the result; None keeps the crop size
+            flip_horizontal/flip_vertical: Mirror the result
+            zoom: Digital zoom level (>= 1.0, centre crop)
+            reuse: Write into the shared destination buffer. Pass False when
+                the caller keeps the result beyond the next apply() call.
+            out: Caller-owned destination (result shape and dtype); takes
+                precedence over reuse
+        Returns:
+            Transformed frame (frame itself when nothing needs to change)
+        """
+        height, width = frame.shape[:2]
+        zoomed = zoom > 1.0
+        if out_size is None:
+            out_size = self.crop_size(width, height, zoom)
+        out_w, out_h = out_size
+        same_size = (out_w, out_h) == (width, height)
+
+        if not zoomed and same_size and not (flip_horizontal or flip_vertical):
+            return frame
+
+        dst = out
+        if dst is None and reuse:
+            shape = (out_h, out_w) + frame.shape[2:]
+            if self._dst is None or self._dst.shape != shape or self._dst.dtype != frame.dtype:
+                self._dst = np.empty(shape, dtype=frame.dtype)
+            dst = self._dst
+
+        if not zoomed and same_size:
+            # Mirror only - cv2.flip is cheaper than a general warp
+            if flip_horizontal and flip_vertical:
+                code = -1
+            else:
+                code = 1 if flip_horizontal else 0
+            return cv2.flip(frame, code, dst=dst)
+
+        matrix = self.matrix(
+            (width, height), (out_w, out_h), flip_horizontal, flip_vertical, zoom
+        )
+        return cv2.warpAffine(
+            frame,
+            matrix,
+            (out_w, out_h),
+            dst=dst,
+            flags=self.interpolation,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
+
+    def reset(self):
+        """Drop the destination buffer and cached matrix"""
+        self._dst = None
+        self._key = None
+        self._matrix = None
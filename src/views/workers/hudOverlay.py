@@ -0,0 +1,83 @@
+"""
+HUD Overlay Module
+Paints camera HUD data (ID badge, zoom, detections) onto display pixmaps
+"""
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen
+
+BADGE_COLOR = "#0088ff"
+
+
+def paint_hud_overlay(pixmap, overlay):
+    """
+    Paint overlay data from CameraWorker.overlay_ready onto a pixmap
+    Args:
+        pixmap: Display-resolution QPixmap (painted in place)
+        overlay: dict with camera_id, badge, zoom, frame_size and detection
+    Returns:
+        The same pixmap
+    """
+    if not overlay or pixmap.isNull():
+        return pixmap
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    font = QFont("Consolas")
+    font.setPixelSize(14)
+    font.setBold(True)
+    painter.setFont(font)
+
+    # Camera ID badge
+    badge = QRectF(5, 5, 115, 30)
+    painter.fillRect(badge, QColor(0, 0, 0))
+    painter.setPen(QPen(QColor(BADGE_COLOR), 2))
+    painter.drawRect(badge)
+    painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, overlay.get("badge", ""))
+
+    # Zoom level
+    zoom = overlay.get("zoom", 1.0)
+    if zoom > 1.0:
+        painter.drawText(
+            QRectF(130, 5, 120, 30), Qt.AlignmentFlag.AlignVCenter, f"ZOOM {zoom:.2f}x"
+        )
+
+    detection = overlay.get("detection")
+    frame_size = overlay.get("frame_size")
+    if detection and frame_size:
+        # Detection boxes are in processing-frame coordinates
+        sx = pixmap.width() / frame_size[0]
+        sy = pixmap.height() / frame_size[1]
+
+        label_font = QFont(font)
+        label_font.setPixelSize(12)
+        painter.setFont(label_font)
+
+        for box in detection["boxes"]:
+            x, y, w, h = box["rect"]
+            rect = QRectF(x * sx, y * sy, w * sx, h * sy)
+            color = QColor(box["color"])
+            painter.setPen(QPen(color, 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(rect)
+            if box["center"]:
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor(255, 0, 0))
+                painter.drawEllipse(rect.center(), 3.0, 3.0)
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+            if box["label"]:
+                painter.setPen(QPen(color))
+                painter.drawText(QPointF(rect.left(), rect.top() - 4), box["label"])
+
+        # Detection status below the badge
+        painter.setFont(font)
+        painter.setPen(QPen(QColor(detection["status_color"])))
+        painter.drawText(
+            QRectF(10, 40, pixmap.width() - 20, 24),
+            Qt.AlignmentFlag.AlignVCenter,
+            detection["status"],
+        )
+
+    painter.end()
+    return pixmap
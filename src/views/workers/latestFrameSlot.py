@@ -0,0 +1,74 @@
+"""
+Latest Frame Slot Module
+Capacity-one handoff between a camera reader thread and its processor
+"""
+
+import threading
+
+
+class LatestFrameSlot:
+    """
+    Holds at most one frame. A put() over an unconsumed frame overwrites it
+    (and counts a drop) so the producer never blocks and the consumer always
+    gets the newest frame.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._closed = False
+
+        self.puts = 0
+        self.takes = 0
+        self.drops = 0
+
+    def put(self, item):
+        """Store item, replacing any frame that was not taken yet"""
+        with self._cond:
+            if self._item is not None:
+                self.drops += 1
+            self._item = item
+            self.puts += 1
+            self._cond.notify()
+
+    def take(self, timeout=None):
+        """
+        Wait for a frame and remove it from the slot
+        Returns:
+            The newest frame, or None on timeout/close
+        """
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            item = self._item
+            self._item = None
+            if item is not None:
+                self.takes += 1
+            return item
+
+    def depth(self):
+        """Number of frames waiting (0 or 1)"""
+        with self._cond:
+            return 0 if self._item is None else 1
+
+    def close(self):
+        """Wake up any waiting consumer"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        """Clear the slot so it can be used again"""
+        with self._cond:
+            self._closed = False
+            self._item = None
+
+    def get_stats(self):
+        """Get handoff counters"""
+        with self._cond:
+            return {
+                "depth": 0 if self._item is None else 1,
+                "puts": self.puts,
+                "takes": self.takes,
+                "drops": self.drops,
+            }
@@ -3,11 +3,15 @@ Media Manager Module
 Handles camera capture and video recording functionality
 """
 
+import threading
+
 import cv2
 from datetime import datetime
 from pathlib import Path
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from .snapshotClient import fetch_snapshot, snapshot_url_for
+
 
 class MediaManager(QObject):
     """
@@ -16,6 +20,8 @@ class MediaManager(QObject):
 
     recording_status = pyqtSignal(bool)
     capture_complete = pyqtSignal(str)
+    snapshot_saved = pyqtSignal(str)  # Path, from capture_snapshot()
+    snapshot_failed = pyqtSignal(str)  # Error message, from capture_snapshot()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -28,6 +34,11 @@ class MediaManager(QObject):
         self.video_writer = None
         self.current_video_path = None
 
+        # Timestamp pacing (see write_frame)
+        self.record_fps = 30
+        self._record_start = None
+        self._frames_written = 0
+
         self._setup_directories()
 
     def _setup_directories(self):
@@ -53,9 +64,8 @@ class MediaManager(QObject):
             return None
 
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            filename = f"cam{camera_id}_{timestamp}.png"
-            filepath = self.images_dir / filename
+            filepath = self._image_path(camera_id, "png")
+            filename = filepath.name
 
             cv2.imwrite(str(filepath), frame)
             print(f"[MEDIA] Image captured: {filename}")
@@ -66,12 +76,67 @@ class MediaManager(QObject):
             print(f"[MEDIA] ERROR: Failed to capture image: {e}")
             return None
 
+    def _image_path(self, camera_id, extension):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        return self.images_dir / f"cam{camera_id}_{timestamp}.{extension}"
+
+    def capture_snapshot(self, stream_url, camera_id=0, image_format="png", fallback=None):
+        """
+        Save a full-resolution still from the Pi camera server, in the background
+        The still comes from the server's /snapshot route, straight from the
+        sensor (not the decoded, resized and mirrored display frame), and
+        is written as received. Nothing runs on the calling (GUI) thread:
+        the result arrives as snapshot_saved(path) or snapshot_failed(error).
+        Args:
+            stream_url: Camera stream URL; its server provides /snapshot
+            camera_id: Camera identifier (used in the file name)
+            image_format: "png" (lossless) or "jpeg"
+            fallback: Optional callable returning a BGR frame, saved instead
+                when the stream has no snapshot route or the request fails
+        """
+        threading.Thread(
+            target=self._snapshot_thread,
+            args=(stream_url, camera_id, image_format, fallback),
+            name=f"snapshot-cam{camera_id}",
+            daemon=True,
+        ).start()
+
+    def _snapshot_thread(self, stream_url, camera_id, image_format, fallback):
+        error = None
+        snapshot_url = snapshot_url_for(stream_url, image_format)
+        if snapshot_url is not None:
+            try:
+                data, extension = fetch_snapshot(snapshot_url)
+                filepath = self._image_path(camera_id, extension)
+                filepath.write_bytes(data)
+                print(f"[MEDIA] Snapshot saved: {filepath.name} ({len(data) // 1024} KB)")
+                self.capture_complete.emit(str(filepath))
+                self.snapshot_saved.emit(str(filepath))
+                return
+            except Exception as e:
+                error = f"Snapshot request failed: {e}"
+                print(f"[MEDIA] {error}")
+
+        frame = fallback() if fallback is not None else None
+        if frame is not None:
+            try:
+                filepath = self._image_path(camera_id, "png")
+                if cv2.imwrite(str(filepath), frame):
+                    print(f"[MEDIA] Saved display frame instead: {filepath.name}")
+                    self.capture_complete.emit(str(filepath))
+                    self.snapshot_saved.emit(str(filepath))
+                    return
+                error = "Failed to write image"
+            except Exception as e:
+                error = f"Failed to save frame: {e}"
+        self.snapshot_failed.emit(error or "No camera frame available")
+
     def start_recording(self, frame_width=1920, frame_height=1080, fps=30, camera_id=0):
         """
         Start video recording
         Args:
-            frame_width: Frame width in pixels
-            frame_height: Frame height in pixels
+            frame_width: Frame width in pixels (None: size of the first frame)
+            frame_height: Frame height in pixels (None: size of the first frame)
             fps: Frames per second
             camera_id: Camera identifier
         Returns:
@@ -86,16 +151,13 @@ class MediaManager(QObject):
             filename = f"cam{camera_id}_{timestamp}.mp4"
             self.current_video_path = self.videos_dir / filename
 
-            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-            self.video_writer = cv2.VideoWriter(
-                str(self.current_video_path), fourcc, fps, (frame_width, frame_height)
-            )
-
-            if not self.video_writer.isOpened():
-                print("[MEDIA] ERROR: Failed to open video writer")
-                self.video_writer = None
+            self.record_fps = fps
+            self.video_writer = None
+            if frame_width and frame_height and not self._open_writer(frame_width, frame_height):
                 return False
 
+            self._record_start = None
+            self._frames_written = 0
             self.recording = True
             self.recording_status.emit(True)
             print(f"[MEDIA] Recording started: {filename}")
@@ -107,19 +169,51 @@ class MediaManager(QObject):
             self.recording_status.emit(False)
             return False
 
-    def write_frame(self, frame):
+    def _open_writer(self, frame_width, frame_height):
+        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+        self.video_writer = cv2.VideoWriter(
+            str(self.current_video_path), fourcc, self.record_fps, (frame_width, frame_height)
+        )
+        if not self.video_writer.isOpened():
+            print("[MEDIA] ERROR: Failed to open video writer")
+            self.video_writer = None
+            return False
+        return True
+
+    def write_frame(self, frame, timestamp=None):
         """
         Write frame to video file during recording
         Args:
             frame: OpenCV frame (BGR format)
+            timestamp: Capture time of the frame (seconds). When given, the
+                fixed-rate video follows capture time: a frame is repeated to
+                cover a gap and skipped if its time slot is already written.
         Returns:
             True if frame written successfully
         """
-        if not self.recording or self.video_writer is None:
+        if not self.recording:
             return False
+        if self.video_writer is None:
+            # Recording started without a size: the first frame sets it
+            height, width = frame.shape[:2]
+            if not self._open_writer(width, height):
+                return False
+
+        copies = 1
+        if timestamp is not None:
+            if self._record_start is None:
+                self._record_start = timestamp
+            due = int((timestamp - self._record_start) * self.record_fps) + 1
+            copies = min(due - self._frames_written, self.record_fps)
+            if copies <= 0:
+                return True
+            self._frames_written = max(due, self._frames_written + copies)
+        else:
+            self._frames_written += 1
 
         try:
-            self.video_writer.write(frame)
+            for _ in range(copies):
+                self.video_writer.write(frame)
             return True
         except Exception as e:
             print(f"[MEDIA] ERROR: Failed to write frame: {e}")
@@ -131,10 +225,17 @@ class MediaManager(QObject):
         Returns:
             Path to saved video or None if failed
         """
-        if not self.recording or self.video_writer is None:
+        if not self.recording:
             print("[MEDIA] No recording in progress")
             return None
 
+        if self.video_writer is None:
+            print("[MEDIA] Recording stopped before any frame arrived")
+            self.recording = False
+            self.recording_status.emit(False)
+            self.current_video_path = None
+            return None
+
         try:
             self.video_writer.release()
             self.video_writer = None
@@ -0,0 +1,372 @@
+"""
+MJPEG Stream Reader Module
+Persistent HTTP client for multipart/x-mixed-replace MJPEG feeds with
+latest-frame-wins semantics
+"""
+
+import select
+import socket
+import time
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
+
+
+class MJPEGStreamReader:
+    """
+    Reads an MJPEG HTTP stream without FFmpeg's internal buffering.
+
+    Parts are parsed incrementally from one reusable bytearray. Every read()
+    drains whatever the socket already holds and decodes only the newest
+    complete JPEG; older complete JPEGs are skipped without decoding and
+    counted in dropped_frames.
+
+    Implements the subset of cv2.VideoCapture used by CameraWorker
+    (isOpened/read/release) so the two can be swapped.
+    """
+
+    def __init__(
+        self,
+        url,
+        timeout=5.0,
+        recv_size=65536,
+        max_buffer=8 * 1024 * 1024,
+        decode_flags=cv2.IMREAD_COLOR,
+        decode_slots=None,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.max_buffer = max_buffer
+        self.decode_flags = decode_flags
+        # Optional semaphore bounding concurrent decodes across cameras
+        self.decode_slots = decode_slots
+
+        self._sock = None
+        self._recv_buf = bytearray(recv_size)
+        self._recv_view = memoryview(self._recv_buf)
+        self._buffer = bytearray()
+        self._boundary = b"--frame"
+
+        # Chunked transfer-encoding state (Werkzeug uses it for HTTP/1.1)
+        self._chunked = False
+        self._chunk_left = 0
+        self._chunk_trailer = 0
+        self._chunk_line = bytearray()
+
+        # Parser state: offset of the first unparsed byte in _buffer
+        self._parse_pos = 0
+
+        # Counters
+        self.frames_received = 0
+        self.frames_decoded = 0
+        self.dropped_frames = 0
+        self.bytes_received = 0
+
+        # Sequence tracking (X-Seq part header, if the server sends it)
+        self.sequence_gaps = 0
+        self._last_seq = None
+
+        # Headers/timing of the part that produced the last decoded frame
+        self.last_part_headers = {}
+        self.last_receive_time = 0.0
+        self.last_decode_ms = 0.0
+
+        self.open()
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    def open(self):
+        """Open the HTTP connection and read the response headers"""
+        self.release()
+
+        parts = urlsplit(self.url)
+        host = parts.hostname
+        port = parts.port or 80
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        try:
+            sock = socket.create_connection((host, port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            request = (
+                f"GET {path} HTTP/1.1\r\n"
+                f"Host: {host}:{port}\r\n"
+                "Accept: multipart/x-mixed-replace\r\n"
+                "Connection: keep-alive\r\n\r\n"
+            )
+            sock.sendall(request.encode("ascii"))
+            self._sock = sock
+
+            if not self._read_response_headers():
+                self.release()
+                return False
+            return True
+        except OSError as e:
+            print(f"[MJPEG] Connection to {self.url} failed: {e}")
+            self.release()
+            return False
+
+    def _read_response_headers(self):
+        """Read the HTTP status line and headers; leftover bytes stay buffered"""
+        while True:
+            end = self._buffer.find(b"\r\n\r\n")
+            if end >= 0:
+                break
+            if len(self._buffer) > 65536 or self._recv(True) <= 0:
+                return False
+
+        header_block = bytes(self._buffer[:end]).decode("latin-1")
+        body = bytes(self._buffer[end + 4 :])
+        self._buffer.clear()
+
+        lines = header_block.split("\r\n")
+        status = lines[0].split(" ", 2)
+        if len(status) < 2 or status[1] != "200":
+            print(f"[MJPEG] Unexpected response from {self.url}: {lines[0]}")
+            return False
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        content_type = headers.get("content-type", "")
+        if "multipart" not in content_type:
+            print(f"[MJPEG] Not a multipart stream: {content_type}")
+            return False
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "boundary" and value:
+                value = value.strip('"')
+                if not value.startswith("--"):
+                    value = "--" + value
+                self._boundary = value.encode("latin-1")
+
+        self._chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        self._feed(memoryview(body))
+        return True
+
+    def isOpened(self):
+        """True while the connection is alive"""
+        return self._sock is not None
+
+    def release(self):
+        """Close the connection and reset parser state"""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._buffer.clear()
+        self._parse_pos = 0
+        self._last_seq = None
+        self._chunk_left = 0
+        self._chunk_trailer = 0
+        self._chunk_line.clear()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _recv(self, blocking):
+        """
+        Receive one block from the socket into the stream buffer
+        Returns:
+            bytes received, 0 if nothing was waiting (non-blocking), -1 on EOF/error
+        """
+        if self._sock is None:
+            return -1
+
+        try:
+            if not blocking:
+                ready, _, _ = select.select([self._sock], [], [], 0)
+                if not ready:
+                    return 0
+            n = self._sock.recv_into(self._recv_view)
+        except socket.timeout:
+            return -1
+        except OSError:
+            self.release()
+            return -1
+
+        if n == 0:
+            self.release()
+            return -1
+
+        self.bytes_received += n
+        self._feed(self._recv_view[:n])
+        return n
+
+    def _feed(self, data):
+        """Append received bytes to the stream buffer, removing chunked framing"""
+        if not self._chunked:
+            self._buffer += data
+            return
+
+        pos = 0
+        end = len(data)
+        while pos < end:
+            if self._chunk_left > 0:
+                n = min(self._chunk_left, end - pos)
+                self._buffer += data[pos : pos + n]
+                pos += n
+                self._chunk_left -= n
+                if self._chunk_left == 0:
+                    self._chunk_trailer = 2  # CRLF after chunk data
+            elif self._chunk_trailer:
+                skip = min(self._chunk_trailer, end - pos)
+                pos += skip
+                self._chunk_trailer -= skip
+            else:
+                # Chunk-size line, possibly split across reads
+                newline = -1
+                for i in range(pos, end):
+                    if data[i] == 0x0A:
+                        newline = i
+                        break
+                if newline < 0:
+                    self._chunk_line += data[pos:end]
+                    return
+                self._chunk_line += data[pos:newline]
+                pos = newline + 1
+                size_field = bytes(self._chunk_line).split(b";")[0].strip()
+                self._chunk_line.clear()
+                if size_field:
+                    self._chunk_left = int(size_field, 16)
+
+    def _next_part(self):
+        """
+        Find the next complete part after _parse_pos
+        Returns:
+            (start, end, headers) of the JPEG payload, or None if incomplete
+        """
+        buf = self._buffer
+        start_marker = buf.find(self._boundary, self._parse_pos)
+        if start_marker < 0:
+            return None
+        header_end = buf.find(b"\r\n\r\n", start_marker)
+        if header_end < 0:
+            return None
+
+        headers = {}
+        raw_headers = bytes(buf[start_marker + len(self._boundary) : header_end])
+        for line in raw_headers.decode("latin-1").split("\r\n"):
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        start = header_end + 4
+        length = headers.get("content-length")
+        if length is not None and length.isdigit():
+            end = start + int(length)
+            if end > len(buf):
+                return None
+        else:
+            end = buf.find(b"\r\n" + self._boundary, start)
+            if end < 0:
+                return None
+
+        return start, end, headers
+
+    def _latest_part(self, current):
+        """Advance over every complete part, keeping only the newest one"""
+        latest = current
+        while True:
+            part = self._next_part()
+            if part is None:
+                return latest
+            self.frames_received += 1
+            self._track_sequence(part[2])
+            if latest is not None:
+                self.dropped_frames += 1
+            latest = part
+            self._parse_pos = part[1]
+            self.last_receive_time = time.time()
+
+    def _track_sequence(self, headers):
+        """Count frames the server produced but we never received"""
+        seq = headers.get("x-seq")
+        if seq is None or not seq.isdigit():
+            return
+        seq = int(seq)
+        if self._last_seq is not None and seq > self._last_seq + 1:
+            self.sequence_gaps += seq - self._last_seq - 1
+        self._last_seq = seq
+
+    def _compact(self):
+        """Discard parsed bytes so the buffer is reused instead of growing"""
+        if self._parse_pos:
+            del self._buffer[: self._parse_pos]
+            self._parse_pos = 0
+
+    def read(self):
+        """
+        Return the newest complete frame in the stream
+        Returns:
+            (ret, frame) like cv2.VideoCapture.read()
+        """
+        if self._sock is None:
+            return False, None
+
+        deadline = time.monotonic() + self.timeout
+        part = self._latest_part(None)
+
+        # Block until at least one complete part exists, then drain whatever
+        # else is already waiting so we hand over the newest one
+        while True:
+            n = self._recv(blocking=part is None)
+            if n < 0:
+                if part is None:
+                    return False, None
+                break
+            if n == 0:
+                break
+            part = self._latest_part(part)
+            if part is None and time.monotonic() > deadline:
+                return False, None
+            if len(self._buffer) > self.max_buffer:
+                print("[MJPEG] Stream buffer overflow, resyncing")
+                self._buffer.clear()
+                self._parse_pos = 0
+                part = None
+
+        start, end, headers = part
+        if self.decode_slots is not None:
+            with self.decode_slots:
+                frame = self._decode(start, end)
+        else:
+            frame = self._decode(start, end)
+        self._compact()
+
+        if frame is None:
+            return False, None
+
+        self.frames_decoded += 1
+        self.last_part_headers = headers
+        return True, frame
+
+    def _decode(self, start, end):
+        """Decode the JPEG at _buffer[start:end] without copying it"""
+        decode_start = time.perf_counter()
+        with memoryview(self._buffer) as view:
+            jpeg = np.frombuffer(view[start:end], dtype=np.uint8)
+            frame = cv2.imdecode(jpeg, self.decode_flags)
+            del jpeg
+        self.last_decode_ms = (time.perf_counter() - decode_start) * 1000.0
+        return frame
+
+    def get_stats(self):
+        """Get reader counters"""
+        return {
+            "frames_received": self.frames_received,
+            "frames_decoded": self.frames_decoded,
+            "dropped_frames": self.dropped_frames,
+            "sequence_gaps": self.sequence_gaps,
+            "bytes_received": self.bytes_received,
+        }
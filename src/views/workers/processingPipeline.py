@@ -0,0 +1,162 @@
+"""
+Processing Pipeline Module
+Ordered, per-camera frame processing stages with runtime toggles and timing
+"""
+
+import threading
+import time
+
+from .streamLatency import RollingHistogram
+
+
+class ProcessingStage:
+    """
+    One step of a camera processing pipeline.
+
+    Either pass a callable func(frame, context) -> frame or subclass and
+    override process(). Returning None drops the frame: the remaining stages
+    are skipped and nothing is emitted. context is a dict shared by all
+    stages for one frame (meta, detection results, ...).
+    """
+
+    def __init__(self, name, func=None, enabled=True):
+        self.name = name
+        self.func = func
+        self.enabled = enabled
+
+        self.timings = RollingHistogram(size=256)
+        self.runs = 0
+        self.skipped = 0
+
+    def process(self, frame, context):
+        """Process one frame"""
+        if self.func is None:
+            return frame
+        return self.func(frame, context)
+
+    def get_stats(self):
+        """
+        Get stage timing (milliseconds) and counters
+        Returns:
+            dict with enabled, mean_ms, p95_ms, runs, skipped
+        """
+        timing = self.timings.percentiles()
+        return {
+            "enabled": self.enabled,
+            "mean_ms": timing.get("mean", 0.0),
+            "p95_ms": timing.get("p95", 0.0),
+            "runs": self.runs,
+            "skipped": self.skipped,
+        }
+
+
+class ProcessingPipeline:
+    """
+    Runs registered stages in order on every frame.
+
+    Stages may be added, removed or toggled from any thread while frames are
+    processed; changes apply from the next frame. Each stage is timed with
+    time.perf_counter(). A disabled stage, or every stage after one that
+    dropped the frame, counts the frame as skipped.
+    """
+
+    def __init__(self, stages=None):
+        self._stages = list(stages or [])
+        self._lock = threading.Lock()
+        self.frames_dropped = 0
+
+    def add_stage(self, stage, before=None, after=None):
+        """
+        Register a stage
+        Args:
+            stage: ProcessingStage (names must be unique)
+            before/after: Name of an existing stage to insert next to;
+                appended at the end if neither is given
+        """
+        with self._lock:
+            if any(s.name == stage.name for s in self._stages):
+                raise ValueError(f"Stage '{stage.name}' already registered")
+            anchor = before or after
+            if anchor is None:
+                self._stages.append(stage)
+                return
+            index = self._index(anchor)
+            self._stages.insert(index if before else index + 1, stage)
+
+    def remove_stage(self, name):
+        """Unregister a stage; returns it, or None if it does not exist"""
+        with self._lock:
+            for i, stage in enumerate(self._stages):
+                if stage.name == name:
+                    return self._stages.pop(i)
+        return None
+
+    def set_stage_enabled(self, name, enabled):
+        """Turn a stage on or off; returns False if there is no such stage"""
+        stage = self.get_stage(name)
+        if stage is None:
+            return False
+        stage.enabled = enabled
+        return True
+
+    def is_stage_enabled(self, name):
+        """True if the stage exists and is enabled"""
+        stage = self.get_stage(name)
+        return stage is not None and stage.enabled
+
+    def get_stage(self, name):
+        """Look up a stage by name"""
+        with self._lock:
+            for stage in self._stages:
+                if stage.name == name:
+                    return stage
+        return None
+
+    def stage_names(self):
+        """Registered stage names in execution order"""
+        with self._lock:
+            return [stage.name for stage in self._stages]
+
+    def _index(self, name):
+        for i, stage in enumerate(self._stages):
+            if stage.name == name:
+                return i
+        raise KeyError(f"No stage named '{name}'")
+
+    def run(self, frame, context):
+        """
+        Pass frame through every enabled stage
+        Returns:
+            The processed frame, or None if a stage dropped it
+        """
+        with self._lock:
+            stages = list(self._stages)
+
+        for i, stage in enumerate(stages):
+            if not stage.enabled:
+                stage.skipped += 1
+                continue
+
+            start = time.perf_counter()
+            frame = stage.process(frame, context)
+            stage.timings.add((time.perf_counter() - start) * 1000.0)
+            stage.runs += 1
+
+            if frame is None:
+                self.frames_dropped += 1
+                for rest in stages[i + 1 :]:
+                    rest.skipped += 1
+                return None
+        return frame
+
+    def get_stats(self):
+        """Per-stage stats keyed by stage name, in execution order"""
+        with self._lock:
+            stages = list(self._stages)
+        return {stage.name: stage.get_stats() for stage in stages}
+
+    def get_timings(self):
+        """Per-stage p50/p95/p99/mean timing (milliseconds) keyed by stage name"""
+        with self._lock:
+            stages = list(self._stages)
+        return {stage.name: stage.timings.percentiles() for stage in stages}
@@ -0,0 +1,133 @@
+"""
+RTP Stream Module
+Receives the Pi's GStreamer RTP/H.264 UDP stream through OpenCV's FFmpeg backend
+"""
+
+import os
+import tempfile
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+
+# Receive settings; all can be overridden in the URL query string, e.g.
+# rtp://@:5000?payload=96&jitter_ms=30&reorder=64
+RTP_DEFAULTS = {
+    "payload": 96,  # RTP payload type (rtph264pay pt=)
+    "encoding": "H264",  # rtpmap encoding name
+    "clock_rate": 90000,
+    "jitter_ms": 50,  # Longest wait for late/out-of-order packets
+    "reorder": 64,  # Packets held for reordering (RTP jitter buffer)
+    "buffer_kb": 1024,  # UDP socket receive buffer
+    "threads": 1,  # Decoder threads; frame threading adds one frame of delay per thread
+}
+
+# OPENCV_FFMPEG_CAPTURE_OPTIONS is process-wide and read while a capture opens
+_options_lock = threading.Lock()
+
+
+def is_rtp_url(stream_url):
+    """True for rtp:// URLs and .sdp files"""
+    return stream_url.startswith("rtp://") or stream_url.lower().endswith(".sdp")
+
+
+def parse_rtp_url(stream_url):
+    """
+    Split an rtp:// URL into receive settings
+    Returns:
+        dict of RTP_DEFAULTS plus "address" and "port"
+    """
+    parsed = urlparse(stream_url)
+    settings = dict(RTP_DEFAULTS)
+    for key, values in parse_qs(parsed.query).items():
+        if key in settings:
+            default = settings[key]
+            settings[key] = values[-1] if isinstance(default, str) else int(values[-1])
+    host = (parsed.hostname or "").strip("@")
+    settings["address"] = host or "0.0.0.0"
+    settings["port"] = parsed.port or 5000
+    return settings
+
+
+def build_sdp(settings):
+    """Session description FFmpeg needs to receive a raw RTP stream"""
+    payload = settings["payload"]
+    lines = [
+        "v=0",
+        "o=- 0 0 IN IP4 127.0.0.1",
+        "s=UIU Mariner camera",
+        f"c=IN IP4 {settings['address']}",
+        "t=0 0",
+        f"m=video {settings['port']} RTP/AVP {payload}",
+        f"a=rtpmap:{payload} {settings['encoding']}/{settings['clock_rate']}",
+    ]
+    if settings["encoding"].upper() == "H264":
+        # SPS/PPS arrive in-band (rtph264pay config-interval=1)
+        lines.append(f"a=fmtp:{payload} packetization-mode=1")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def ffmpeg_capture_options(settings, timeout):
+    """
+    FFmpeg demuxer/protocol options for low-latency RTP receive
+    No input buffering, a short probe so the first frame shows quickly, and a
+    jitter buffer bounded by reorder (packets) and jitter_ms.
+    """
+    options = {
+        "protocol_whitelist": "file,udp,rtp",
+        "fflags": "nobuffer",
+        "flags": "low_delay",
+        "probesize": 32768,
+        "analyzeduration": 500000,
+        "reorder_queue_size": settings["reorder"],
+        "max_delay": settings["jitter_ms"] * 1000,
+        "buffer_size": settings["buffer_kb"] * 1024,
+        "timeout": int(timeout * 1000000),
+    }
+    return "|".join(f"{key};{value}" for key, value in options.items())
+
+
+def open_rtp_capture(stream_url, timeout):
+    """
+    Open an RTP stream (rtp:// URL) or an existing .sdp file with FFmpeg
+    A temporary SDP is generated for rtp:// URLs; it is only needed while
+    the capture opens.
+    """
+    if stream_url.lower().endswith(".sdp"):
+        settings = dict(RTP_DEFAULTS)
+        sdp_path, temporary = stream_url, False
+    else:
+        settings = parse_rtp_url(stream_url)
+        with tempfile.NamedTemporaryFile("w", suffix=".sdp", delete=False) as sdp:
+            sdp.write(build_sdp(settings))
+        sdp_path, temporary = sdp.name, True
+
+    params = []
+    timeout_ms = int(timeout * 1000)
+    for prop in ("CAP_PROP_OPEN_TIMEOUT_MSEC", "CAP_PROP_READ_TIMEOUT_MSEC"):
+        if hasattr(cv2, prop):
+            params += [getattr(cv2, prop), timeout_ms]
+    if hasattr(cv2, "CAP_PROP_N_THREADS"):
+        params += [cv2.CAP_PROP_N_THREADS, settings["threads"]]
+
+    try:
+        with _options_lock:
+            previous = os.environ.get("OPENCV_FFMPEG_CAPTURE_OPTIONS")
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = ffmpeg_capture_options(
+                settings, timeout
+            )
+            try:
+                cap = cv2.VideoCapture(sdp_path, cv2.CAP_FFMPEG, params)
+            finally:
+                if previous is None:
+                    del os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"]
+                else:
+                    os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = previous
+    finally:
+        if temporary:
+            os.unlink(sdp_path)
+
+    # The SDP always opens; without packets the stream has no frame size
+    if cap.isOpened() and cap.get(cv2.CAP_PROP_FRAME_WIDTH) <= 0:
+        cap.release()
+    return cap
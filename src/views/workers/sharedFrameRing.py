@@ -0,0 +1,63 @@
+"""
+Shared Frame Ring Module
+Fixed-size frame slots in one multiprocessing.shared_memory block
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_SLOT_BYTES = 1920 * 1080 * 3
+
+
+class SharedFrameRing:
+    """
+    A block of shared memory split into equally sized frame slots.
+
+    The creating process owns the block (close() + unlink()); other processes
+    attach by name with create=False. Slot ownership is not tracked here: the
+    camera process writes only into slots the GUI process has handed back.
+    """
+
+    def __init__(self, slots=4, slot_bytes=DEFAULT_SLOT_BYTES, name=None, create=True):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._owner = create
+        if create:
+            self._shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def fits(self, shape):
+        """True if a uint8 frame of this shape fits in one slot"""
+        return int(np.prod(shape)) <= self.slot_bytes
+
+    def view(self, index, shape):
+        """
+        uint8 array of the given shape over slot index (no copy)
+        The array is only valid until close().
+        """
+        offset = index * self.slot_bytes
+        return np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+
+    def write(self, index, frame):
+        """Copy frame into slot index; returns its shape"""
+        np.copyto(self.view(index, frame.shape), frame)
+        return frame.shape
+
+    def close(self):
+        """Detach from the block (and free it if this process created it)"""
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            self._shm.close()
+        except BufferError:
+            # A view is still exported; the mapping goes away with the process
+            pass
@@ -0,0 +1,38 @@
+"""
+Snapshot Client Module
+Fetches full-resolution stills from the Pi camera server /snapshot route
+"""
+
+from urllib.parse import urlsplit, urlunsplit
+from urllib.request import urlopen
+
+# Content-Type -> file extension
+SNAPSHOT_EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png"}
+
+
+def snapshot_url_for(stream_url, image_format="png"):
+    """
+    Derive the /snapshot URL from a camera server stream URL
+    Returns:
+        URL, or None for streams without a snapshot route (RTP, local devices)
+    """
+    parts = urlsplit(stream_url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    return urlunsplit((parts.scheme, parts.netloc, "/snapshot", f"format={image_format}", ""))
+
+
+def fetch_snapshot(snapshot_url, timeout=5.0):
+    """
+    Download one still (blocking; call from a worker thread)
+    Returns:
+        (image bytes, file extension)
+    Raises:
+        OSError (including urllib errors) if the server did not deliver an image
+    """
+    with urlopen(snapshot_url, timeout=timeout) as response:
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+        extension = SNAPSHOT_EXTENSIONS.get(content_type)
+        if extension is None:
+            raise OSError(f"unexpected snapshot type {content_type!r}")
+        return response.read(), extension
@@ -0,0 +1,76 @@
+"""
+Stream Connection Module
+Reconnection backoff and time-bounded stream opening for camera feeds
+"""
+
+import random
+import threading
+
+# Connection states reported by camera workers
+CONNECTING = "Connecting"
+CONNECTED = "Connected"
+RECONNECTING = "Reconnecting"
+WAITING = "Waiting"  # Open failed, sleeping until the next attempt
+
+
+class ReconnectBackoff:
+    """
+    Jittered exponential backoff that never gives up.
+
+    Delays grow initial * factor^n up to maximum; each delay is spread by
+    +/- jitter (fraction) so several cameras that dropped together do not
+    retry in lockstep. reset() after a successful connection.
+    """
+
+    def __init__(self, initial=0.5, maximum=15.0, factor=2.0, jitter=0.3):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.attempts = 0
+
+    def next_delay(self):
+        """Delay before the next attempt (counts one failed attempt)"""
+        delay = min(self.maximum, self.initial * self.factor**self.attempts)
+        self.attempts += 1
+        spread = delay * self.jitter
+        return max(0.0, delay + random.uniform(-spread, spread))
+
+    def reset(self):
+        self.attempts = 0
+
+
+def open_with_timeout(open_func, timeout):
+    """
+    Call open_func() with a hard time limit.
+
+    The call runs on a daemon thread. If it has not returned after timeout
+    seconds, None is returned and whatever it eventually opens is released.
+    Returns:
+        The opened capture object, or None on timeout/error
+    """
+    lock = threading.Lock()
+    done = threading.Event()
+    state = {"cap": None, "abandoned": False}
+
+    def target():
+        try:
+            cap = open_func()
+        except Exception as e:
+            print(f"[STREAM] Open failed: {e}")
+            cap = None
+        with lock:
+            if state["abandoned"]:
+                if cap is not None:
+                    cap.release()
+                return
+            state["cap"] = cap
+        done.set()
+
+    threading.Thread(target=target, name="stream-open", daemon=True).start()
+    done.wait(timeout)
+    with lock:
+        if not done.is_set():
+            state["abandoned"] = True
+            return None
+        return state["cap"]
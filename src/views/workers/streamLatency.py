@@ -0,0 +1,89 @@
+"""
+Stream Latency Module
+Rolling latency histograms and Pi-to-ground clock offset estimation
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit
+from urllib.request import urlopen
+
+import numpy as np
+
+
+class RollingHistogram:
+    """
+    Keeps the most recent samples (milliseconds) and reports percentiles.
+    Thread-safe: samples may be added from the reader, processor and GUI threads.
+    """
+
+    def __init__(self, size=512):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def add(self, value_ms):
+        """Record one sample"""
+        with self._lock:
+            self._samples.append(value_ms)
+            self.count += 1
+
+    def percentiles(self):
+        """
+        Get p50/p95/p99 and mean of the retained samples
+        Returns:
+            dict, empty if no samples yet
+        """
+        with self._lock:
+            if not self._samples:
+                return {}
+            data = np.fromiter(self._samples, dtype=np.float64)
+        p50, p95, p99 = np.percentile(data, (50, 95, 99))
+        return {
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "mean": float(data.mean()),
+            "samples": int(data.size),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+def status_url_for(stream_url):
+    """Derive the camera server /status URL from its stream URL"""
+    parts = urlsplit(stream_url)
+    return urlunsplit((parts.scheme, parts.netloc, "/status", "", ""))
+
+
+def estimate_clock_offset(status_url, samples=5, timeout=1.0):
+    """
+    Estimate Pi clock minus ground clock (seconds) NTP-style.
+    Uses the "time" field of the camera server /status response and keeps
+    the sample with the smallest round trip.
+    Returns:
+        (offset, rtt) or (None, None) if the server did not answer
+    """
+    best = (None, None)
+    for _ in range(samples):
+        try:
+            t0 = time.time()
+            with urlopen(status_url, timeout=timeout) as response:
+                payload = json.loads(response.read().decode("utf-8"))
+            t2 = time.time()
+        except Exception:
+            continue
+
+        server_time = payload.get("time")
+        if server_time is None:
+            return None, None
+
+        rtt = t2 - t0
+        offset = float(server_time) - (t0 + t2) / 2.0
+        if best[1] is None or rtt < best[1]:
+            best = (offset, rtt)
+    return best
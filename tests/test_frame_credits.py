@@ -0,0 +1,76 @@
+"""
+FrameCredits tests: lost-ack recovery and late acks for reclaimed credits
+"""
+
+import importlib.util
+import time
+from pathlib import Path
+
+MODULE = Path(__file__).resolve().parent.parent / "src" / "views" / "workers" / "frameCredits.py"
+_spec = importlib.util.spec_from_file_location("frameCredits", MODULE)
+frameCredits = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(frameCredits)
+FrameCredits = frameCredits.FrameCredits
+
+
+def test_lost_ack_is_reclaimed_across_short_polls():
+    # The consumer never acknowledges the first frame; the producer polls
+    # like CameraWorker.run (timeouts shorter than reclaim_after)
+    credits = FrameCredits(credits=1, reclaim_after=1.0)
+    assert credits.acquire(timeout=0.5)
+    start = time.monotonic()
+    while not credits.acquire(timeout=0.5):
+        assert time.monotonic() - start < 1.5, "credit never reclaimed"
+    recovered = time.monotonic() - start
+    assert 0.9 <= recovered < 1.2
+    assert credits.get_stats()["reclaimed"] == 1
+
+
+def test_acknowledged_credits_are_not_reclaimed():
+    credits = FrameCredits(credits=1, reclaim_after=0.2)
+    for _ in range(3):
+        credit = credits.acquire(timeout=0.5)
+        assert credit
+        credits.give_back(credit)
+    assert credits.get_stats()["reclaimed"] == 0
+    assert credits.get_stats()["acks"] == 3
+
+
+def test_late_ack_after_reclaim_is_ignored():
+    credits = FrameCredits(credits=1, reclaim_after=0.1)
+    first = credits.acquire(timeout=0.5)
+    # Reclaimed: the second frame takes the credit back
+    second = credits.acquire(timeout=0.5)
+    assert second and second != first
+    assert credits.available() == 0
+
+    # The first frame's ack arrives late: it must not free the second credit
+    credits.give_back(first)
+    assert credits.available() == 0
+    assert not credits.acquire(timeout=0.05)
+    stats = credits.get_stats()
+    assert stats["late_acks"] == 1
+    assert stats["acks"] == 1
+
+    credits.give_back(second)
+    assert credits.available() == 1
+
+
+def test_never_more_than_max_credits_out():
+    credits = FrameCredits(credits=2, reclaim_after=0.1)
+    taken = [credits.acquire(timeout=0.5) for _ in range(2)]
+    time.sleep(0.15)
+    # Both reclaimed and re-taken
+    taken += [credits.acquire(timeout=0.5) for _ in range(2)]
+    for credit in taken:
+        credits.give_back(credit)
+    assert credits.available() == 2
+    assert credits.get_stats()["late_acks"] == 2
+
+
+def test_reset_forgets_outstanding_credits():
+    credits = FrameCredits(credits=1)
+    credit = credits.acquire(timeout=0.5)
+    credits.reset()
+    credits.give_back(credit)
+    assert credits.available() == 1